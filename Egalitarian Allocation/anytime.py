@@ -0,0 +1,97 @@
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+# חיפוש "בכל רגע" (anytime): החיפוש נעצר אחרי time_limit שניות או max_nodes צמתים,
+# ומחזיר את ההקצאה הטובה ביותר שנמצאה עד אז יחד עם חסם עליון מוכח על האופטימום.
+# החסם הוא המקסימום של גיזום ב על כל המצבים שעוד מחכים בחזית (תור, מחסנית או ערימה):
+# כל הקצאה אחרת או עוברת דרך אחד מהם, או כבר נבדקה, או נגזמה מול פתרון שלא טוב ממה שיש.
+
+# המנועים שבודקים את התקציב בכל צומת
+ANYTIME_ENGINES = ("bfs", "dfs", "best_first")
+
+
+class SearchResult(NamedTuple):
+    # ההקצאה הטובה ביותר שנמצאה (None אם החיפוש נעצר לפני ההקצאה המלאה הראשונה)
+    allocation: Optional[List[List[int]]]
+    # הערך המינימלי שלה
+    value: Optional[float]
+    # חסם עליון מוכח על הערך האופטימלי
+    upper_bound: float
+    # האם הוכח ש-allocation אופטימלית (value == upper_bound)
+    optimal: bool
+
+
+class SearchBudget:
+    """
+    תקציב של ריצה אחת: מונה צמתים, שעון ו-callback להתקדמות.
+    המנוע קורא ל-exhausted() לפני כל צומת שהוא שולף, ל-improved() על כל פתרון טוב יותר,
+    ול-finish() בסוף עם החסם של החזית.
+
+    target הוא חסם עליון מוכח שידוע מראש (למשל מהפתרון הקודם, ראו incremental.py): כשפתרון
+    מגיע אליו אין מה לשפר, והחיפוש נעצר בלי לסמן stopped – התוצאה אופטימלית.
+
+    >>> budget = SearchBudget(max_nodes=2)
+    >>> budget.exhausted(), budget.exhausted(), budget.exhausted(), budget.nodes
+    (False, False, True, 2)
+    >>> budget.finish(lambda: 7)
+    >>> budget.stopped, budget.frontier_bound
+    (True, 7)
+    >>> budget = SearchBudget(target=10)
+    >>> budget.improved(10)
+    >>> budget.exhausted(), budget.stopped, budget.reached
+    (True, False, True)
+    """
+
+    def __init__(self, time_limit: Optional[float] = None, max_nodes: Optional[int] = None,
+                 progress: Optional[Callable[[SearchResult], None]] = None, target=None):
+        if time_limit is not None and time_limit < 0:
+            raise ValueError(f"time_limit must be non-negative, got {time_limit}")
+        if max_nodes is not None and max_nodes < 0:
+            raise ValueError(f"max_nodes must be non-negative, got {max_nodes}")
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.max_nodes = max_nodes
+        self.progress = progress
+        self.target = target
+        self.reached = False
+        self.nodes = 0
+        self.stopped = False
+        self.frontier_bound = float('-inf')
+        # סדר החפצים שהחיפוש רץ עליו (ראו run_search), כדי להחזיר ל-progress אינדקסים מקוריים
+        self.order = None
+
+    def exhausted(self) -> bool:
+        if self.reached:
+            return True
+        if (self.max_nodes is not None and self.nodes >= self.max_nodes or
+                self.deadline is not None and time.perf_counter() >= self.deadline):
+            self.stopped = True
+            return True
+        self.nodes += 1
+        return False
+
+    def improved(self, value):
+        """
+        נקרא על כל פתרון טוב יותר עם הערך המינימלי שלו.
+        """
+        if self.target is not None and value >= self.target:
+            self.reached = True
+
+    def finish(self, frontier_bound: Callable[[], float]):
+        """
+        נקרא בסוף החיפוש. אם הוא נעצר בגלל התקציב, שומר את החסם של החזית שנשארה.
+        """
+        if self.stopped:
+            self.frontier_bound = frontier_bound()
+
+    def report(self, assignment: List[int], sums, frontier_bound: Callable[[], float]):
+        """
+        מודיע ל-progress על פתרון טוב יותר (assignment[item] = player, עם וקטור הסכומים sums).
+        המנועים קוראים לה רק כשיש progress, כדי לא לשחזר הקצאות סתם.
+        """
+        value = min(sums)
+        allocation = [[] for _ in sums]
+        for item, player in enumerate(assignment):
+            allocation[player].append(item if self.order is None else self.order[item])
+        upper_bound = max(value, frontier_bound())
+        self.progress(SearchResult([sorted(items) for items in allocation], value, upper_bound,
+                                   upper_bound <= value))
@@ -0,0 +1,156 @@
+import math
+from typing import List, NamedTuple, Optional
+
+from dominance import DominanceIndex
+
+# מצב קירוב (1-ε): כשהערכים גדולים (למשל עד 2^32) כמעט אין שני מצבים עם אותם סכומים,
+# וכלל גיזום א לא מאחד כלום. כאן מאחדים מצבים שהסכומים שלהם נופלים באותם "דליים"
+# (ε כאן הוא החלק של העיגול מתוך התקציב, ראו split_epsilon):
+# - "linear": דליים ברוחב δ = ε * LB / num_items, כאשר LB הוא ערך של הקצאה ידועה (≤ OPT).
+#   כל איחוד מאבד לכל היותר δ לשחקן, ולאורך num_items שכבות לכל היותר ε * LB ≤ ε * OPT.
+# - "geometric": דליים בחזקות של base = (1-ε)^(-1/num_items). כל איחוד מאבד לכל היותר
+#   פקטור base, ולאורך num_items שכבות לכל היותר פקטור 1/(1-ε).
+# הסכומים נחתכים בחסם העליון בשורש (cap ≥ OPT), ולכן לכל שחקן יש מספר סופי של דליים –
+# פולינומי ב-num_items וב-1/ε – בלי קשר לגודל הערכים.
+# המצב שנשמר הוא הראשון שהגיע לדלי, עם הסכומים האמיתיים שלו – כך הערך המדווח תמיד אמיתי.
+# עם dominance=True גם כלל השליטה עובד על הדליים: מצב נזרק אם מצב אחר באותה שכבה נמצא
+# בדלי גבוה או שווה אצל כל שחקן. היחס הזה טרנזיטיבי, ולכן גם כאן כל שכבה מאבדת לכל היותר דלי אחד –
+# אבל קו הרקיע על הדליים קטן בהרבה ממספר הדליים, וזה מה שנותן את רוב החיסכון בפועל.
+# הדליים משתלמים רק כשיש הרבה מצבים לכל וקטור דליים (הרבה חפצים, מעט שחקנים). אחרת כמעט
+# אין שני מצבים באותם דליים, והמפתח רק עולה זמן ולוקח חצי מהתקציב מגיזום ב – ראו buckets_can_merge.
+
+ROUNDINGS = ("linear", "geometric")
+
+
+class ApproximateResult(NamedTuple):
+    allocation: List[List[int]]
+    # הערך המינימלי האמיתי של allocation
+    value: float
+    # חסם עליון מוכח על הערך האופטימלי: value >= (1 - ε) * upper_bound
+    upper_bound: float
+
+
+class BucketKey:
+    """
+    מפתח מצב לכלל גיזום א שמעגל כל סכום לדלי שלו לפני base_key (למשל exact_state_key
+    או symmetric_state_key). מחלקה ולא closure כדי שאפשר יהיה לשלוח אותה לתהליכים אחרים.
+
+    >>> key = BucketKey(lambda sums, index: tuple(sums) + (index,), "linear", 10, 100)
+    >>> key([5, 17], 2), key([9, 12], 2), key([250, 0], 2)
+    ((0, 1, 2), (0, 1, 2), (10, 0, 2))
+    """
+
+    def __init__(self, base_key, rounding: str, step: float, cap):
+        self.base_key = base_key
+        self.rounding = rounding
+        self.step = step
+        self.cap = cap
+        if rounding == "geometric":
+            self.log_step = math.log(step)
+
+    def bucket(self, value) -> int:
+        value = min(value, self.cap)
+        if self.rounding == "linear":
+            return int(value // self.step)
+        if value <= 0:
+            return -1
+        return math.floor(math.log(value) / self.log_step)
+
+    def __call__(self, sums: List[int], index: int) -> tuple:
+        return self.base_key([self.bucket(value) for value in sums], index)
+
+
+def dominance_index(num_players: int, state_key) -> DominanceIndex:
+    """
+    אינדקס שליטה לחיפוש: במצב קירוב (state_key הוא BucketKey) השליטה נבדקת על הדליים.
+    """
+    return DominanceIndex(num_players, state_key.bucket if isinstance(state_key, BucketKey) else None)
+
+
+def split_epsilon(epsilon: float):
+    """
+    מחלק את תקציב הקירוב בין העיגול לדליים ובין גיזום ב המוגמש, כך שהמכפלה היא בדיוק 1-ε:
+    מחזיר (rounding_epsilon, prune_scale) עם (1 - rounding_epsilon) * prune_scale = 1 - epsilon.
+
+    >>> split_epsilon(0.19)
+    (0.09999999999999998, 0.9)
+    """
+    if not 0 <= epsilon < 1:
+        raise ValueError(f"epsilon must be in [0, 1), got {epsilon}")
+    prune_scale = math.sqrt(1 - epsilon)
+    return 1 - prune_scale, prune_scale
+
+
+def bucket_key(base_key, valuations: List[List[int]], epsilon: float, rounding: str,
+               lower_bound, cap) -> Optional[BucketKey]:
+    """
+    בונה את BucketKey לפי ε, ערך של הקצאה ידועה (lower_bound) וחסם עליון בשורש (cap).
+    מחזיר None כשאין מה לעגל (ε = 0, או lower_bound = 0 בעיגול לינארי) – ואז החיפוש מדויק.
+    """
+    if rounding not in ROUNDINGS:
+        raise ValueError(f"Unknown rounding {rounding!r}, expected one of {ROUNDINGS}")
+    num_items = len(valuations[0])
+    if epsilon == 0 or num_items == 0:
+        return None
+    if rounding == "linear":
+        if lower_bound <= 0:
+            return None
+        return BucketKey(base_key, rounding, epsilon * lower_bound / num_items, cap)
+    return BucketKey(base_key, rounding, (1 - epsilon) ** (-1 / num_items), cap)
+
+
+def buckets_can_merge(key: BucketKey, valuations: List[List[int]]) -> bool:
+    """
+    האם יש פחות וקטורי דליים (דליים לשחקן בחזקת num_players) מהקצאות מלאות
+    (num_players בחזקת num_items). אם לא, כמעט אין שני מצבים באותם דליים.
+
+    >>> key = BucketKey(None, "linear", 10, 1000)
+    >>> buckets_can_merge(key, [[1] * 20, [1] * 20]), buckets_can_merge(key, [[1] * 12] * 3)
+    (True, False)
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+    if key.rounding == "linear":
+        per_player = key.bucket(key.cap) + 1
+    else:
+        smallest = min((value for row in valuations for value in row if value > 0), default=key.cap)
+        # כולל דלי -1 של סכום 0
+        per_player = key.bucket(key.cap) - key.bucket(smallest) + 2
+    return per_player ** num_players < num_players ** num_items
+
+
+def certified_upper_bound(key: Optional[BucketKey], value, num_items: int, cap, prune_scale: float = 1,
+                          epsilon: float = 0):
+    """
+    חסם עליון על OPT מתוך הערך שהושג. המסלול של ההקצאה האופטימלית (עם נציגי הדליים)
+    או מגיע לסוף – ואז הערך שלו לכל היותר value – או נגזם כשהחסם שלו כפול prune_scale
+    קטן מ-value. בנוסף כל אחת מ-num_items השכבות מאבדת לכל היותר דלי אחד.
+
+    בחשבון מדויק החסם לא עולה על value / (1 - epsilon), אבל key.step ** num_items מעוגל
+    ב-float ויכול לצאת מעט מעליו. לכן חותכים ב-value / (1 - epsilon) (החסם המוכח), ואם גם
+    החילוק מעוגל כלפי מעלה מורידים את התוצאה ב-ulp, כך ש-value >= (1 - epsilon) * upper_bound
+    מתקיים בדיוק גם בחשבון float.
+
+    >>> key = BucketKey(None, "linear", 10, 1000)
+    >>> certified_upper_bound(key, 500, 4, 1000), certified_upper_bound(None, 500, 4, 1000, 0.5)
+    (540.0, 1000)
+    >>> key = BucketKey(None, "geometric", 0.8 ** (-1 / 8), 10 ** 10)
+    >>> value = 4777452580
+    >>> value * key.step ** 8 > value / 0.8
+    True
+    >>> upper_bound = certified_upper_bound(key, value, 8, 10 ** 10, epsilon=0.2)
+    >>> upper_bound, value >= (1 - 0.2) * upper_bound
+    (5971815725.0, True)
+    """
+    scaled = value / prune_scale
+    if key is None:
+        upper_bound = min(cap, scaled)
+    elif key.rounding == "linear":
+        upper_bound = min(cap, scaled + num_items * key.step)
+    else:
+        upper_bound = min(cap, scaled * key.step ** num_items)
+    if epsilon:
+        upper_bound = min(upper_bound, value / (1 - epsilon))
+        while (1 - epsilon) * upper_bound > value:
+            upper_bound = math.nextafter(upper_bound, -math.inf)
+    return upper_bound
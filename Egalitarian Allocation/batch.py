@@ -0,0 +1,195 @@
+import shelve
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from typing import Iterable, List, Optional, Tuple
+
+from main5_1 import egalitarian_allocation
+from value_matrix import as_rows
+
+# פתרון של הרבה מטריצות בבת אחת. הרבה מטריצות חוזרות עד כדי סידור אחר של השחקנים או החפצים,
+# ולכן כל מטריצה מובאת לצורה קנונית (canonical_form), והתוצאה נשמרת במטמון LRU לפי הצורה הזאת.
+# ההקצאה שבמטמון היא של המטריצה הקנונית, ולכל מטריצה מחזירים אותה באינדקסים שלה.
+# הערך המינימלי לא תלוי בסידור, ולכן ההקצאה אופטימלית גם למטריצה המקורית
+# (בשוויון היא יכולה להיות שונה ממה ש-egalitarian_allocation מחזירה על המטריצה עצמה).
+
+# מספר הסבבים המקסימלי של מיון שורות ועמודות בצורה הקנונית
+MAX_CANONICAL_ROUNDS = 16
+
+
+def canonical_form(valuations: List[List[int]]) -> Tuple[tuple, List[int], List[int]]:
+    """
+    מחזיר (key, players, items): key היא המטריצה הקנונית (tuple של שורות), ושורה r שלה
+    היא שורה players[r] של valuations בסדר העמודות items: key[r][c] == valuations[players[r]][items[c]].
+
+    קודם ממיינים לפי מה שלא משתנה בסידור מחדש – הערכים הממוינים של כל שורה ושל כל עמודה –
+    ואחר כך לפי התוכן עצמו, לסירוגין בין שורות לעמודות עד שהסדר מתייצב. כשהשורות (והעמודות)
+    נבדלות בערכים הממוינים שלהן הצורה זהה לכל סידור של אותה מטריצה. בשוויון ייתכן ששני
+    סידורים יקבלו מפתחות שונים – זו רק החטאה במטמון: אותו מפתח תמיד אומר אותה מטריצה.
+
+    >>> canonical_form([[1, 5], [3, 2]])
+    (((1, 5), (3, 2)), [0, 1], [0, 1])
+    >>> canonical_form([[2, 3], [5, 1]])[0] == canonical_form([[3, 2], [1, 5]])[0]
+    True
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0]) if valuations else 0
+    row_invariant = [tuple(sorted(row)) for row in valuations]
+    column_invariant = [tuple(sorted(valuations[i][j] for i in range(num_players))) for j in range(num_items)]
+    players = sorted(range(num_players), key=lambda i: row_invariant[i])
+    items = sorted(range(num_items), key=lambda j: column_invariant[j])
+
+    for _ in range(MAX_CANONICAL_ROUNDS):
+        new_players = sorted(players, key=lambda i: (row_invariant[i], [valuations[i][j] for j in items]))
+        new_items = sorted(items, key=lambda j: (column_invariant[j], [valuations[i][j] for i in new_players]))
+        if new_players == players and new_items == items:
+            break
+        players, items = new_players, new_items
+
+    key = tuple(tuple(valuations[i][j] for j in items) for i in players)
+    return key, players, items
+
+
+def remap_allocation(allocation: List[List[int]], players: List[int], items: List[int]) -> List[List[int]]:
+    """
+    מחזיר הקצאה של המטריצה הקנונית לאינדקסים של המטריצה המקורית (ראו canonical_form).
+
+    >>> remap_allocation([[0], [1]], [1, 0], [1, 0])
+    [[0], [1]]
+    """
+    result = [[] for _ in players]
+    for row, bundle in enumerate(allocation):
+        result[players[row]] = sorted(items[column] for column in bundle)
+    return result
+
+
+class ResultCache:
+    """
+    מטמון LRU של הקצאות לפי מפתח (צורה קנונית + אפשרויות הפתרון), עם לכל היותר max_entries רשומות.
+    עם path הרשומות נשמרות גם בקובץ shelve, כך שהן זמינות גם בריצה הבאה; הקובץ מכיל
+    רק את הרשומות שבזיכרון – רשומה שמפונה מהזיכרון נמחקת גם ממנו.
+
+    >>> cache = ResultCache(max_entries=2)
+    >>> cache.put("a", [[0]]); cache.put("b", [[1]])
+    >>> cache.get("a")
+    [[0]]
+    >>> cache.put("c", [[2]])
+    >>> cache.get("b") is None, len(cache)
+    (True, 2)
+    >>> cache.stats()
+    {'capacity': 2, 'size': 2, 'hits': 1, 'misses': 1, 'evictions': 1}
+    """
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shelf = None
+        if path is not None:
+            self.shelf = shelve.open(path)
+            for digest in list(self.shelf):
+                key, allocation = self.shelf[digest]
+                if len(self.entries) < max_entries:
+                    self.entries[key] = allocation
+                else:
+                    del self.shelf[digest]
+
+    @staticmethod
+    def _digest(key) -> str:
+        return blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+    def get(self, key) -> Optional[List[List[int]]]:
+        allocation = self.entries.get(key)
+        if allocation is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return allocation
+
+    def put(self, key, allocation: List[List[int]]):
+        self.entries[key] = allocation
+        self.entries.move_to_end(key)
+        if self.shelf is not None:
+            self.shelf[self._digest(key)] = (key, allocation)
+        while len(self.entries) > self.max_entries:
+            old_key, _ = self.entries.popitem(last=False)
+            self.evictions += 1
+            if self.shelf is not None:
+                del self.shelf[self._digest(old_key)]
+
+    def close(self):
+        """
+        סוגר את קובץ ה-shelve (אם יש).
+        """
+        if self.shelf is not None:
+            self.shelf.close()
+            self.shelf = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self) -> dict:
+        return {
+            'capacity': self.max_entries,
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def solve_batch(matrices: Iterable[List[List[int]]], workers: int = 1, cache: Optional[ResultCache] = None,
+                **options) -> List[List[List[int]]]:
+    """
+    פותר כל מטריצה ב-matrices עם egalitarian_allocation(matrix, **options) ומחזיר את ההקצאות
+    באותו סדר. מטריצות עם אותה צורה קנונית (גם בתוך אותו batch) נפתרות פעם אחת, ותוצאות
+    שכבר במטמון (cache) לא נפתרות בכלל. workers > 1 מריץ את הבעיות החסרות
+    ב-ProcessPoolExecutor – אז options צריכות להיות ניתנות ל-pickle.
+
+    >>> cache = ResultCache()
+    >>> solve_batch([[[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]], [[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]][::-1]],
+    ...             cache=cache, engine="dfs")
+    [[[3, 4], [0, 1, 2]], [[0, 1, 2], [3, 4]]]
+    >>> cache.stats()['size']
+    1
+    """
+    cache = ResultCache() if cache is None else cache
+    option_key = tuple(sorted(options.items()))
+    forms = []
+    cached = {}
+    pending = {}
+    for matrix in matrices:
+        form, players, items = canonical_form(as_rows(matrix))
+        key = (form, option_key)
+        forms.append((key, players, items))
+        if key in cached or key in pending:
+            continue
+        allocation = cache.get(key)
+        if allocation is None:
+            pending[key] = [list(row) for row in form]
+        else:
+            cached[key] = allocation
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {key: executor.submit(egalitarian_allocation, matrix, **options)
+                       for key, matrix in pending.items()}
+            solved = {key: future.result() for key, future in futures.items()}
+    else:
+        solved = {key: egalitarian_allocation(matrix, **options) for key, matrix in pending.items()}
+    for key, allocation in solved.items():
+        # None (חיפוש עם תקציב שנעצר לפני ההקצאה הראשונה) לא נשמר
+        if allocation is not None:
+            cache.put(key, allocation)
+    cached.update(solved)
+
+    results = []
+    for key, players, items in forms:
+        allocation = cached[key]
+        results.append(None if allocation is None else remap_allocation(allocation, players, items))
+    return results
@@ -0,0 +1,338 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from main5_1 import egalitarian_allocation
+
+# מדידות ביצועים בלי חלונות: כל הגרסאות על אותה רשת של שחקנים × חפצים × התפלגות ערכים,
+# עם זמני perf_counter, חזרות, timeout לכל הרצה, בדיקה שכל הגרסאות מגיעות לאותו ערך מינימלי,
+# פלט JSON/CSV, גרפים כקבצי PNG (רק אם מבקשים) ומצב רגרסיה מול קובץ בסיס.
+#
+# python benchmark.py --players 2 3 --items 4 6 8 --json results.json --csv results.csv --plot-dir plots
+# python benchmark.py --baseline baseline.json --threshold 1.25   (קוד יציאה 1 אם משהו האט)
+
+# ================================
+# הגרסאות: שם -> פונקציה valuations -> allocation
+# ================================
+VARIANTS: Dict[str, Callable[[List[List[int]]], List[List[int]]]] = {
+    "original": lambda valuations: egalitarian_allocation(valuations),
+    "sorted_prune": lambda valuations: egalitarian_allocation(valuations, pruning="ABC"),
+    "dfs": lambda valuations: egalitarian_allocation(valuations, engine="dfs"),
+    "best_first": lambda valuations: egalitarian_allocation(valuations, engine="best_first"),
+    "dfs_subset_greedy": lambda valuations: egalitarian_allocation(valuations, engine="dfs", bound="subset",
+                                                                   warm_start="greedy"),
+    "dominance": lambda valuations: egalitarian_allocation(valuations, pruning="ABD", engine="dfs"),
+    "vectorized": lambda valuations: egalitarian_allocation(valuations, engine="vectorized", warm_start="greedy"),
+    "binary_search": lambda valuations: egalitarian_allocation(valuations, engine="binary_search", bound="subset"),
+    "leximin": lambda valuations: egalitarian_allocation(valuations, leximin=True, item_order="max_value"),
+}
+
+
+def register_variant(name: str, solver: Callable[[List[List[int]]], List[List[int]]]):
+    """
+    מוסיף גרסה לרשימה. הגרסאות רצות בתהליך נפרד (fork), כך שגם פונקציות שהוגדרו בזמן ריצה עובדות.
+    """
+    VARIANTS[name] = solver
+
+
+# ================================
+# התפלגויות הערכים
+# ================================
+def adversarial_valuations(num_players, num_items, seed=42):
+    """
+    קלט "עוין" לסדר המקורי: הרבה חפצים זולים קודם, והחפצים שכולם רוצים – בסוף.
+    """
+    rnd = random.Random(seed)
+    valuations = [[rnd.randint(1, 2 ** 16) for _ in range(num_items)] for _ in range(num_players)]
+    for j in range(num_items - max(1, num_items // 4), num_items):
+        for row in valuations:
+            row[j] = rnd.randint(2 ** 31, 2 ** 32)
+    return valuations
+
+
+def _identical_rows(rnd: random.Random, num_players: int, num_items: int) -> List[List[int]]:
+    row = [rnd.randint(1, 2 ** 32) for _ in range(num_items)]
+    return [list(row) for _ in range(num_players)]
+
+
+DISTRIBUTIONS: Dict[str, Callable[[random.Random, int, int], List[List[int]]]] = {
+    "uniform_small": lambda rnd, n, m: [[rnd.randint(1, 10) for _ in range(m)] for _ in range(n)],
+    "uniform_2_32": lambda rnd, n, m: [[rnd.randint(1, 2 ** 32) for _ in range(m)] for _ in range(n)],
+    "identical_rows": _identical_rows,
+    "adversarial": lambda rnd, n, m: adversarial_valuations(n, m, rnd.randrange(2 ** 32)),
+}
+
+
+def make_instance(distribution: str, num_players: int, num_items: int, seed: int = 42) -> List[List[int]]:
+    """
+    קלט דטרמיניסטי לכל תא ברשת: אותו (distribution, num_players, num_items, seed) נותן תמיד אותה מטריצה.
+
+    >>> make_instance("identical_rows", 2, 3) == make_instance("identical_rows", 2, 3)
+    True
+    >>> rows = make_instance("identical_rows", 3, 4)
+    >>> rows[0] == rows[1] == rows[2], len(rows[0])
+    (True, 4)
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {distribution!r}, expected one of {tuple(DISTRIBUTIONS)}")
+    rnd = random.Random(f"{seed}-{distribution}-{num_players}-{num_items}")
+    return DISTRIBUTIONS[distribution](rnd, num_players, num_items)
+
+
+# ================================
+# הרצה ומדידה
+# ================================
+def _run_variant(conn, name: str, valuations: List[List[int]], runs: int):
+    solver = VARIANTS[name]
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            allocation = solver(valuations)
+            elapsed = time.perf_counter() - start
+            value = min(sum(valuations[i][j] for j in items) for i, items in enumerate(allocation))
+            conn.send(("ok", elapsed, value))
+    except Exception as error:
+        conn.send(("error", repr(error), None))
+    conn.close()
+
+
+def measure(name: str, valuations: List[List[int]], warmup: int = 1, repeats: int = 5,
+            timeout: float = 60.0) -> dict:
+    """
+    מריץ גרסה אחת על קלט אחד בתהליך נפרד: warmup הרצות שלא נמדדות ואז repeats הרצות.
+    הרצה שלוקחת יותר מ-timeout שניות עוצרת את התהליך, והסטטוס הוא "timeout".
+
+    >>> row = measure("dfs", [[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]], warmup=0, repeats=2)
+    >>> row["status"], row["min_value"], len(row["times_ms"])
+    ('ok', 15, 2)
+    """
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+    parent, child = context.Pipe(duplex=False)
+    process = context.Process(target=_run_variant, args=(child, name, valuations, warmup + repeats), daemon=True)
+    process.start()
+    child.close()
+    times, value, status, error = [], None, "ok", None
+    for run in range(warmup + repeats):
+        if not parent.poll(timeout):
+            status = "timeout"
+            break
+        kind, payload, run_value = parent.recv()
+        if kind == "error":
+            status, error = "error", payload
+            break
+        value = run_value
+        if run >= warmup:
+            times.append(payload * 1000)
+    if process.is_alive():
+        process.terminate()
+    process.join()
+    return {
+        "status": status,
+        "error": error,
+        "min_value": value,
+        "times_ms": times,
+        "median_ms": statistics.median(times) if times else None,
+        "mean_ms": statistics.mean(times) if times else None,
+        "best_ms": min(times) if times else None,
+    }
+
+
+def run_grid(variants: Iterable[str], players: Iterable[int], items: Iterable[int],
+             distributions: Iterable[str], seed: int = 42, warmup: int = 1, repeats: int = 5,
+             timeout: float = 60.0, log=None) -> List[dict]:
+    """
+    מריץ כל גרסה על כל תא ברשת ומחזיר שורה לכל (גרסה, תא). גרסה שנגמר לה הזמן בתא
+    מסוים לא רצה על תאים גדולים יותר (עם יותר חפצים) באותה התפלגות ומספר שחקנים.
+    """
+    variants = list(variants)
+    unknown = [name for name in variants if name not in VARIANTS]
+    if unknown:
+        raise ValueError(f"Unknown variants {unknown}, expected some of {tuple(VARIANTS)}")
+    rows = []
+    for distribution in distributions:
+        for num_players in players:
+            timed_out = set()
+            for num_items in sorted(items):
+                valuations = make_instance(distribution, num_players, num_items, seed)
+                for name in variants:
+                    cell = {"variant": name, "distribution": distribution, "players": num_players,
+                            "items": num_items, "seed": seed}
+                    if name in timed_out:
+                        cell.update(status="skipped", error=None, min_value=None, times_ms=[],
+                                    median_ms=None, mean_ms=None, best_ms=None)
+                    else:
+                        cell.update(measure(name, valuations, warmup, repeats, timeout))
+                        if cell["status"] == "timeout":
+                            timed_out.add(name)
+                    rows.append(cell)
+                    if log is not None:
+                        median = "-" if cell["median_ms"] is None else f"{cell['median_ms']:.2f} ms"
+                        log(f"{distribution:>14} {num_players}x{num_items:<3} {name:>17}: {cell['status']:>7} {median}")
+    return rows
+
+
+def check_min_values(rows: List[dict]) -> List[dict]:
+    """
+    בודק שבכל תא כל הגרסאות שסיימו מגיעות לאותו ערך מינימלי. מסמן consistent בכל שורה
+    ומחזיר את התאים שיש בהם אי-התאמה.
+
+    >>> rows = [{"variant": "a", "distribution": "d", "players": 2, "items": 3, "status": "ok", "min_value": 5},
+    ...         {"variant": "b", "distribution": "d", "players": 2, "items": 3, "status": "ok", "min_value": 4}]
+    >>> check_min_values(rows)
+    [{'distribution': 'd', 'players': 2, 'items': 3, 'min_values': {'a': 5, 'b': 4}}]
+    """
+    cells = {}
+    for row in rows:
+        if row["status"] == "ok":
+            cells.setdefault((row["distribution"], row["players"], row["items"]), {})[row["variant"]] = row["min_value"]
+    mismatches = []
+    for (distribution, num_players, num_items), values in cells.items():
+        if len(set(values.values())) > 1:
+            mismatches.append({"distribution": distribution, "players": num_players, "items": num_items,
+                               "min_values": values})
+    bad = {(m["distribution"], m["players"], m["items"]) for m in mismatches}
+    for row in rows:
+        row["consistent"] = (row["distribution"], row["players"], row["items"]) not in bad
+    return mismatches
+
+
+# ================================
+# פלט
+# ================================
+CSV_FIELDS = ("variant", "distribution", "players", "items", "seed", "status", "min_value",
+              "median_ms", "mean_ms", "best_ms", "consistent", "error")
+
+
+def write_json(rows: List[dict], path: str):
+    with open(path, "w") as f:
+        json.dump(rows, f, indent=2)
+
+
+def write_csv(rows: List[dict], path: str):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def save_plots(rows: List[dict], directory: str) -> List[str]:
+    """
+    שומר גרף PNG לכל (התפלגות, מספר שחקנים): זמן חציוני מול מספר החפצים לכל גרסה.
+    matplotlib נטען רק כאן, עם backend "Agg" שלא צריך מסך.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    os.makedirs(directory, exist_ok=True)
+    groups = {}
+    for row in rows:
+        if row["median_ms"] is not None:
+            groups.setdefault((row["distribution"], row["players"]), {}).setdefault(row["variant"], []).append(
+                (row["items"], row["median_ms"]))
+    paths = []
+    for (distribution, num_players), series in sorted(groups.items()):
+        fig, ax = plt.subplots()
+        for name, points in sorted(series.items()):
+            points.sort()
+            ax.plot([x for x, _ in points], [y for _, y in points], marker='o', label=name)
+        ax.set_title(f"Median Execution Time - {distribution} - {num_players} Players")
+        ax.set_xlabel("Number of Items")
+        ax.set_ylabel("Execution Time (ms)")
+        ax.set_yscale("log")
+        ax.grid(True)
+        ax.legend()
+        fig.tight_layout()
+        path = os.path.join(directory, f"{distribution}_{num_players}_players.png")
+        fig.savefig(path)
+        plt.close(fig)
+        paths.append(path)
+    return paths
+
+
+# ================================
+# רגרסיה מול קובץ בסיס
+# ================================
+def compare_to_baseline(rows: List[dict], baseline: List[dict], threshold: float = 1.25,
+                        min_ms: float = 1.0) -> List[dict]:
+    """
+    מחזיר את כל התאים שבהם גרסה האטה יותר מפי threshold מהזמן החציוני בקובץ הבסיס,
+    או שבבסיס היא סיימה ועכשיו לא. זמנים מתחת ל-min_ms בבסיס הם רעש ולא נבדקים.
+
+    >>> base = [{"variant": "dfs", "distribution": "d", "players": 2, "items": 3, "status": "ok", "median_ms": 10.0}]
+    >>> now = [dict(base[0], median_ms=12.0)]
+    >>> compare_to_baseline(now, base), len(compare_to_baseline(now, base, threshold=1.1))
+    ([], 1)
+    """
+    def key(row):
+        return row["variant"], row["distribution"], row["players"], row["items"]
+
+    reference = {key(row): row for row in baseline if row["status"] == "ok"}
+    regressions = []
+    for row in rows:
+        old = reference.get(key(row))
+        if old is None or row["status"] == "skipped":
+            continue
+        if row["status"] != "ok":
+            regressions.append({"cell": key(row), "baseline_ms": old["median_ms"], "current_ms": None,
+                                "status": row["status"]})
+        elif old["median_ms"] >= min_ms and row["median_ms"] > threshold * old["median_ms"]:
+            regressions.append({"cell": key(row), "baseline_ms": old["median_ms"], "current_ms": row["median_ms"],
+                                "status": "slower"})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark all egalitarian allocation variants.")
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument("--players", nargs="+", type=int, default=[2, 3, 4])
+    parser.add_argument("--items", nargs="+", type=int, default=[4, 6, 8])
+    parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=list(DISTRIBUTIONS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per run")
+    parser.add_argument("--json", help="write all results to this JSON file")
+    parser.add_argument("--csv", help="write all results to this CSV file")
+    parser.add_argument("--plot-dir", help="save PNG plots to this directory")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25, help="allowed slowdown factor versus the baseline")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore baseline cells faster than this")
+    args = parser.parse_args(argv)
+
+    rows = run_grid(args.variants, args.players, args.items, args.distributions, args.seed,
+                    args.warmup, args.repeats, args.timeout, log=print)
+    mismatches = check_min_values(rows)
+    if args.json:
+        write_json(rows, args.json)
+    if args.csv:
+        write_csv(rows, args.csv)
+    if args.plot_dir:
+        for path in save_plots(rows, args.plot_dir):
+            print(f"Saved {path}")
+
+    failed = False
+    for mismatch in mismatches:
+        failed = True
+        print(f"Min-value mismatch in {mismatch['distribution']} {mismatch['players']}x{mismatch['items']}: "
+              f"{mismatch['min_values']}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for regression in compare_to_baseline(rows, baseline, args.threshold, args.min_ms):
+            failed = True
+            current = "-" if regression["current_ms"] is None else f"{regression['current_ms']:.2f} ms"
+            print(f"Regression in {regression['cell']}: {regression['status']} "
+                  f"(baseline {regression['baseline_ms']:.2f} ms, current {current})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
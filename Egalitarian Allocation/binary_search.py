@@ -0,0 +1,203 @@
+from bisect import bisect_right
+from typing import Callable, List, Optional, Tuple
+
+from dominance import DominanceIndex
+from value_matrix import float_slack
+from warm_start import allocation_values, greedy_to_poorest
+
+# מנוע מדויק חלופי: חיפוש בינארי על הערך האגליטרי T.
+# במקום לחפש את ההקצאה הטובה ביותר, שואלים שוב ושוב "האם כל שחקן יכול לקבל לפחות T?".
+# בשאלה הזאת אפשר לגזום הרבה יותר חזק מאשר בחיפוש האופטימיזציה:
+# - הסכום של כל שחקן נחתך ב-T (מה שמעל T לא משנה), ולכן הרבה יותר מצבים מתאחדים.
+# - שחקן שהגיע ל-T לא מקבל יותר חפצים – החפץ הולך רק לשחקנים שעוד חסר להם.
+# - החיפוש עוצר בהקצאה המספקת הראשונה (witness).
+# ערכים שאינם שלמים מושווים עם float_slack (ראו value_matrix.py): ערך סל ב-bundle_values ובחיפוש
+# מחושב בסדרי חיבור שונים, והשוואה מדויקת הייתה מפספסת את T האופטימלי בביט האחרון.
+
+# עבור ערכים לא שלמים מועמדי T הם כל סכומי תתי-הקבוצות של כל שחקן, כלומר 2^items לשחקן
+MAX_CANDIDATE_ITEMS = 20
+
+
+def _capped_key(capped: List[int], index: int) -> tuple:
+    return tuple(capped) + (index,)
+
+
+def feasible_assignment(valuations: List[List[int]], target, tables: Optional[List[Tuple[tuple, List]]] = None,
+                        state_key: Optional[Callable] = None, dominance: Optional[DominanceIndex] = None,
+                        memo=None) -> Tuple[Optional[List[int]], Optional[float]]:
+    """
+    מחפש הקצאה שבה כל שחקן מקבל לפחות target.
+    מחזיר (assignment, None) עם assignment[item] = player אם נמצאה, אחרת (None, ceiling) –
+    חסם עליון על הערך האגליטרי האופטימלי, שקטן מ-target.
+
+    גיזום – מצב נזרק כשחסם עליון על הערך המינימלי שלו קטן מ-target. החסם הוא של גיזום ב
+    (tables, ראו main5_1.bound_tables; ברירת המחדל – שחקן בודד), אבל רק על קבוצות של שחקנים
+    שעוד לא הגיעו ל-target: החפצים הולכים רק אליהם, ולכן זה החסם ההדוק ביותר. בנוסף נבדקת
+    הקבוצה של כל השחקנים שעוד לא הגיעו ל-target, עם הערך המקסימלי של כל חפץ שנשאר.
+    החיתוך רק מקטין סכומים, ולכן החסמים נשארים חסמים עליונים תקפים.
+    מצב (סכומים חתוכים, אינדקס חפץ) שכבר נכשל לא נבדק שוב: memo (set או TranspositionTable)
+    עם מפתח לפי state_key. dominance שומר את המצבים שנכשלו, וכל מצב שהם שולטים בו נכשל גם הוא.
+
+    ceiling הוא המקסימום של החסמים בכל המצבים שנגזמו: כל הקצאה עם ערך מתחת ל-target
+    עוברת (אחרי שמעבירים חפצים משחקנים שכבר הגיעו ל-target לשחקנים שעוד לא) דרך אחד מהם.
+    חפצים שנשארים אחרי שכולם הגיעו ל-target הולכים לשחקן שמעריך אותם הכי הרבה.
+    לערכים שאינם שלמים שחקן הגיע ל-target כשחסר לו פחות מ-float_slack, מצב נגזם רק כשהחסם
+    קטן מ-target - float_slack, ו-ceiling מוגדל ב-float_slack.
+
+    >>> feasible_assignment([[4, 5, 6], [6, 5, 4]], 6)
+    ([1, 0, 0], None)
+    >>> feasible_assignment([[4, 5, 6], [6, 5, 4]], 9)
+    (None, 8)
+    >>> feasible_assignment([[0.3, 0.7, 0.1, 0], [0, 0, 0, 2]], 1.1)
+    ([0, 0, 0, 1], None)
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+    key = state_key or _capped_key
+    integral = all(isinstance(value, int) for row in valuations for value in row)
+    slack = float_slack(valuations)
+    reached = target - slack
+
+    if tables is None:
+        tables = []
+        for i in range(num_players):
+            suffix = [0] * (num_items + 1)
+            for j in range(num_items - 1, -1, -1):
+                suffix[j] = suffix[j + 1] + valuations[i][j]
+            tables.append(((i,), suffix))
+    groups = [(sum(1 << i for i in group), group, suffix) for group, suffix in tables]
+    max_suffix = [0] * (num_items + 1)
+    for j in range(num_items - 1, -1, -1):
+        max_suffix[j] = max_suffix[j + 1] + max(row[j] for row in valuations)
+
+    assignment = [0] * num_items
+    capped = [0] * num_players
+    ceiling = float('-inf')
+
+    def search(index: int) -> bool:
+        nonlocal ceiling
+        unsatisfied = [i for i in range(num_players) if capped[i] < reached]
+        if not unsatisfied:
+            for j in range(index, num_items):
+                assignment[j] = max(range(num_players), key=lambda i: valuations[i][j])
+            return True
+
+        total = max_suffix[index] + sum(capped[i] for i in unsatisfied)
+        value = total // len(unsatisfied) if integral else total / len(unsatisfied)
+        mask = sum(1 << i for i in unsatisfied)
+        for group_mask, group, suffix in groups:
+            if group_mask & mask != group_mask:
+                continue
+            total = suffix[index]
+            for i in group:
+                total += capped[i]
+            group_value = total // len(group) if integral else total / len(group)
+            if group_value < value:
+                value = group_value
+        if value < reached:
+            ceiling = max(ceiling, value + slack)
+            return False
+
+        state = key(capped, index)
+        if memo is not None and state in memo:
+            return False
+        if dominance is not None and dominance.dominated(capped, index):
+            return False
+
+        # קודם השחקן שמעריך את החפץ הכי הרבה
+        for i in sorted(unsatisfied, key=lambda i: -valuations[i][index] / (target - capped[i])):
+            old = capped[i]
+            capped[i] = min(target, old + valuations[i][index])
+            assignment[index] = i
+            if search(index + 1):
+                return True
+            capped[i] = old
+
+        if memo is not None:
+            memo.add(state)
+        if dominance is not None:
+            dominance.add(capped, index)
+        return False
+
+    if search(0):
+        return list(assignment), None
+    return None, ceiling
+
+
+def bundle_values(valuations: List[List[int]], low, high) -> List:
+    """
+    כל הערכים v עם low < v <= high שיש שחקן שסל כלשהו שווה לו בדיוק v, ממוינים.
+    הערך האגליטרי האופטימלי הוא ערך של סל של שחקן כלשהו, ולכן הוא תמיד ברשימה (או שווה ל-low).
+
+    >>> bundle_values([[0.5, 1.5], [2, 1]], 0.5, 2)
+    [1, 1.5, 2.0]
+    """
+    num_items = len(valuations[0])
+    if num_items > MAX_CANDIDATE_ITEMS:
+        raise ValueError(f"The binary_search engine needs integer valuations "
+                         f"or at most {MAX_CANDIDATE_ITEMS} items, got {num_items}")
+    candidates = set()
+    for row in valuations:
+        sums = {0}
+        for value in row:
+            sums |= {total + value for total in sums}
+        candidates.update(total for total in sums if low < total <= high)
+    return sorted(candidates)
+
+
+def binary_search_assignment(valuations: List[List[int]], tables: List[Tuple[tuple, List]],
+                             state_key: Optional[Callable] = None, incumbent: Optional[List[int]] = None,
+                             dominance: bool = False, memo=None) -> List[int]:
+    """
+    מוצא הקצאה אגליטרית אופטימלית בחיפוש בינארי על T בין ערך של פתרון ידוע
+    (incumbent, או greedy_to_poorest) ובין החסם העליון בשורש לפי tables.
+    כל בדיקה שמצליחה מקפיצה את הגבול התחתון לערך המינימלי האמיתי של ההקצאה שנמצאה,
+    וכל בדיקה שנכשלת מורידה את הגבול העליון ל-ceiling שהיא מחזירה.
+    אחרי בדיקה באמצע הטווח שמצליחה בודקים את הערך הבא מעל הגבול התחתון: ההקצאה שנמצאה
+    היא בדרך כלל האופטימום או קרובה אליו, ובדיקה אחת שנכשלת מוכיחה את זה.
+    עבור ערכים שלמים מחפשים על המספרים השלמים, ואחרת על רשימת ערכי הסלים (bundle_values),
+    כשגם החסם בשורש והגבול התחתון מושווים עם float_slack.
+
+    >>> binary_search_assignment([[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]], [((0,), [30, 26, 21, 15, 8, 0])])
+    [1, 1, 0, 0, 0]
+    """
+    best = list(incumbent) if incumbent is not None else greedy_to_poorest(valuations)
+    low = min(allocation_values(valuations, best))
+    integral = all(isinstance(value, int) for row in valuations for value in row)
+    high = min(suffix[0] // len(group) if integral else suffix[0] / len(group) for group, suffix in tables)
+
+    # probe=True: הבדיקה הבאה היא low + 1 (רק אחרי הצלחה של בדיקה באמצע הטווח)
+    probe = False
+
+    def check(target):
+        if memo is not None:
+            memo.clear()
+        index = DominanceIndex(len(valuations)) if dominance else None
+        return feasible_assignment(valuations, target, tables, state_key, index, memo)
+
+    if integral:
+        while low < high:
+            target = low + 1 if probe else (low + high + 1) // 2
+            witness, ceiling = check(target)
+            probe = witness is not None and not probe
+            if witness is None:
+                high = ceiling
+            else:
+                best = witness
+                low = min(allocation_values(valuations, witness))
+        return best
+
+    slack = float_slack(valuations)
+    candidates = bundle_values(valuations, low + slack, high + slack)
+    left, right = 0, len(candidates)
+    while left < right:
+        middle = left if probe else (left + right) // 2
+        witness, ceiling = check(candidates[middle])
+        probe = witness is not None and not probe
+        if witness is None:
+            right = bisect_right(candidates, ceiling, 0, middle)
+        else:
+            best = witness
+            # הערך האמיתי של witness יכול להיות קטן מהמועמד בביט האחרון – לא בודקים אותו שוב
+            left = max(middle + 1, bisect_right(candidates, min(allocation_values(valuations, witness)) + slack))
+    return best
@@ -1,114 +1,38 @@
 
+import json
 import random
 import time
 import statistics
-from collections import deque
 from typing import List
 
+from benchmark import adversarial_valuations
+from main5_1 import anytime_egalitarian_allocation, approximate_egalitarian_allocation, egalitarian_allocation
+from incremental import IncrementalSolver
+from main_5_3 import egalitarian_allocation_sorted_pruning
+from stats import SearchStats
+
 
 # ================================
-# גרסה 1: האלגוריתם המקורי
+# הגרסאות להשוואה: האלגוריתם המקורי, גיזום לפי סכומים ממוין, חיפוש לעומק, NumPy וחיפוש בינארי
 # ================================
 def egalitarian_allocation_original(valuations: List[List[int]]) -> List[List[int]]:
-    num_players = len(valuations)
-    num_items = len(valuations[0])
-    best_allocation = None
-    best_min_value = float('-inf')
-    best_sums = None
-    initial_state = (0,) * num_players + (0,)
-    queue = deque()
-    queue.append((initial_state, [[] for _ in range(num_players)]))
-    visited = set()
-    visited.add(initial_state)
-
-    while queue:
-        state, allocation = queue.popleft()
-        current_sums = state[:num_players]
-        current_index = state[num_players]
-
-        if current_index == num_items:
-            min_val = min(current_sums)
-            if (min_val > best_min_value or
-                (min_val == best_min_value and (best_sums is None or sorted(current_sums) > sorted(best_sums)))):
-                best_min_value = min_val
-                best_allocation = allocation
-                best_sums = current_sums
-            continue
-
-        pessimistic_bound = best_min_value
-        optimistic_values = [
-            current_sums[i] + sum(valuations[i][j] for j in range(current_index, num_items))
-            for i in range(num_players)
-        ]
-        optimistic_bound = min(optimistic_values)
-        if optimistic_bound < pessimistic_bound:
-            continue
-
-        for i in range(num_players):
-            new_sums = list(current_sums)
-            new_sums[i] += valuations[i][current_index]
-            new_state = tuple(new_sums) + (current_index + 1,)
-            if new_state in visited:
-                continue
-            visited.add(new_state)
-            new_allocation = [list(items) for items in allocation]
-            new_allocation[i].append(current_index)
-            queue.append((new_state, new_allocation))
-
-    return best_allocation
+    return egalitarian_allocation(valuations, engine="bfs")
 
 
-# ================================
-# גרסה 2: עם גיזום לפי סכומים ממוין
-# ================================
 def egalitarian_allocation_sorted(valuations: List[List[int]]) -> List[List[int]]:
-    num_players = len(valuations)
-    num_items = len(valuations[0])
-    best_allocation = None
-    best_min_value = float('-inf')
-    best_sums = None
-    initial_state = (0,) * num_players + (0,)
-    queue = deque()
-    queue.append((initial_state, [[] for _ in range(num_players)]))
-    visited = set()
-    visited.add(tuple(sorted(initial_state[:num_players])) + (0,))
-
-    while queue:
-        state, allocation = queue.popleft()
-        current_sums = state[:num_players]
-        current_index = state[num_players]
-
-        if current_index == num_items:
-            min_val = min(current_sums)
-            if (min_val > best_min_value or
-                (min_val == best_min_value and (best_sums is None or sorted(current_sums) > sorted(best_sums)))):
-                best_min_value = min_val
-                best_allocation = allocation
-                best_sums = current_sums
-            continue
-
-        pessimistic_bound = best_min_value
-        optimistic_values = [
-            current_sums[i] + sum(valuations[i][j] for j in range(current_index, num_items))
-            for i in range(num_players)
-        ]
-        optimistic_bound = min(optimistic_values)
-        if optimistic_bound < pessimistic_bound:
-            continue
-
-        for i in range(num_players):
-            new_sums = list(current_sums)
-            new_sums[i] += valuations[i][current_index]
-            new_state = tuple(new_sums) + (current_index + 1,)
-            visited_key = tuple(sorted(new_sums)) + (current_index + 1,)
-            if visited_key in visited:
-                continue
-            visited.add(visited_key)
-            new_allocation = [list(items) for items in allocation]
-            new_allocation[i].append(current_index)
-            queue.append((new_state, new_allocation))
-
-    return best_allocation
+    return egalitarian_allocation_sorted_pruning(valuations, print_result=False)
+
+
+def egalitarian_allocation_dfs(valuations: List[List[int]]) -> List[List[int]]:
+    return egalitarian_allocation(valuations, engine="dfs")
+
+
+def egalitarian_allocation_vectorized(valuations: List[List[int]]) -> List[List[int]]:
+    return egalitarian_allocation(valuations, engine="vectorized", warm_start="greedy")
+
+
+def egalitarian_allocation_binary_search(valuations: List[List[int]]) -> List[List[int]]:
+    return egalitarian_allocation(valuations, engine="binary_search", bound="subset")
 
 
 # ================================
@@ -117,13 +41,168 @@ def egalitarian_allocation_sorted(valuations: List[List[int]]) -> List[List[int]
 def average_run_time(func, valuations, runs=7):
     times = []
     for _ in range(runs):
-        start = time.time()
+        start = time.perf_counter()
         func(valuations)
-        end = time.time()
+        end = time.perf_counter()
         times.append((end - start) * 1000)
     return statistics.mean(times)
 
 
+# ================================
+# ספירת צמתים שנוצרו בחיפוש (ראו stats.py)
+# ================================
+def count_generated_nodes(valuations, engine="dfs", bound="optimistic", warm_start=None, item_order=None,
+                          dominance=False):
+    stats = SearchStats()
+    egalitarian_allocation(valuations, engine=engine, bound=bound, warm_start=warm_start, item_order=item_order,
+                           dominance=dominance, stats=stats)
+    return stats.children_generated
+
+
+def compare_pruning_stats(valuations, json_path=None):
+    """
+    מוני החיפוש של כל גרסה: כמה צמתים הורחבו וכמה נגזמו בכל כלל (A, B, C, D – ראו README),
+    גודל מקסימלי של החזית ושל visited, וזמן עד הפתרון הראשון. עם json_path נשמר גם קובץ JSON.
+    """
+    versions = {
+        "Original": lambda stats: egalitarian_allocation(valuations, stats=stats),
+        "Sorted Prune": lambda stats: egalitarian_allocation_sorted_pruning(valuations, print_result=False,
+                                                                            stats=stats),
+        "Depth-First": lambda stats: egalitarian_allocation(valuations, engine="dfs", stats=stats),
+        "DFS+subset+greedy": lambda stats: egalitarian_allocation(valuations, engine="dfs", bound="subset",
+                                                                  warm_start="greedy", stats=stats),
+        "Dominance": lambda stats: egalitarian_allocation(valuations, engine="dfs", dominance=True, stats=stats),
+        "Vectorized": lambda stats: egalitarian_allocation(valuations, engine="vectorized", warm_start="greedy",
+                                                           stats=stats),
+    }
+    report = {}
+    print("Search counters (pruned by rule A/B/C/D):")
+    for name, run in versions.items():
+        stats = SearchStats()
+        run(stats)
+        report[name] = stats.as_dict()
+        pruned = "  ".join(f"{rule}={count:>7}" for rule, count in stats.pruned.items())
+        print(f"  {name:>17}: expanded={stats.nodes_expanded:>7}  {pruned}  peak_frontier={stats.peak_frontier:>6}"
+              f"  peak_visited={stats.peak_visited:>7}  first_incumbent={stats.time_to_first_incumbent * 1000:.2f} ms")
+    print()
+    if json_path is not None:
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+def compare_bounds(valuations, engines=("bfs", "dfs")):
+    print("Generated nodes by optimistic bound (Pruning B):")
+    for engine in engines:
+        optimistic_nodes = count_generated_nodes(valuations, engine, "optimistic")
+        subset_nodes = count_generated_nodes(valuations, engine, "subset")
+        reduction = 100 * (1 - subset_nodes / optimistic_nodes)
+        print(f"  {engine:>4}: optimistic={optimistic_nodes:>8}  subset={subset_nodes:>8}  reduction={reduction:.1f}%")
+    print()
+
+
+def compare_warm_starts(valuations, engines=("bfs", "dfs"), warm_starts=("round_robin", "greedy", "local_search")):
+    print("Generated nodes by warm start:")
+    for engine in engines:
+        cold_nodes = count_generated_nodes(valuations, engine)
+        row = [f"none={cold_nodes:>8}"]
+        for warm_start in warm_starts:
+            row.append(f"{warm_start}={count_generated_nodes(valuations, engine, warm_start=warm_start):>8}")
+        print(f"  {engine:>4}: " + "  ".join(row))
+    print()
+
+
+def compare_dominance(valuations, engines=("bfs", "dfs")):
+    print("Generated nodes with dominance pruning (Pruning D):")
+    for engine in engines:
+        plain_nodes = count_generated_nodes(valuations, engine)
+        dominance_nodes = count_generated_nodes(valuations, engine, dominance=True)
+        print(f"  {engine:>4}: visited only={plain_nodes:>8}  with dominance={dominance_nodes:>8}")
+    print()
+
+
+def compare_item_orders(valuations, label, engine="dfs", item_orders=(None, "max_value", "variance", "contention")):
+    row = []
+    for item_order in item_orders:
+        row.append(f"{item_order or 'index'}={count_generated_nodes(valuations, engine, item_order=item_order):>8}")
+    print(f"  {label:>11} ({engine}): " + "  ".join(row))
+
+
+def compare_approximation(num_players=4, num_items=12, epsilons=(0.01, 0.05), seed=42, runs=3):
+    """
+    מצב הקירוב מול החיפוש המדויק: זמן ריצה, הערך שהושג והיחס לחסם העליון המוכח.
+    """
+    rnd = random.Random(seed)
+    valuations = [[rnd.randint(1, 2 ** 32) for _ in range(num_items)] for _ in range(num_players)]
+    print(f"Approximation on {num_players} players x {num_items} items:")
+    exact_avg = average_run_time(
+        lambda v: egalitarian_allocation(v, engine="best_first", bound="subset", warm_start="greedy"), valuations, runs)
+    print(f"  exact:               {exact_avg:>10.2f} ms")
+    for epsilon in epsilons:
+        for rounding in ("linear", "geometric"):
+            avg = average_run_time(lambda v: approximate_egalitarian_allocation(v, epsilon, rounding), valuations, runs)
+            result = approximate_egalitarian_allocation(valuations, epsilon, rounding)
+            print(f"  eps={epsilon:<5} {rounding:>9}: {avg:>10.2f} ms  value={result.value}"
+                  f"  value/upper_bound={result.value / result.upper_bound:.4f}")
+    print()
+
+
+def compare_anytime(num_players=5, num_items=14, time_limits=(0.01, 0.1, 1, 10), seed=42):
+    """
+    חיפוש עם תקציב זמן על קלט שהחיפוש המדויק לוקח עליו דקות: הערך שהושג, החסם העליון
+    המוכח והפער ביניהם לכל מגבלת זמן.
+    """
+    rnd = random.Random(seed)
+    valuations = [[rnd.randint(1, 2 ** 32) for _ in range(num_items)] for _ in range(num_players)]
+    print(f"Anytime search on {num_players} players x {num_items} items:")
+    for time_limit in time_limits:
+        result = anytime_egalitarian_allocation(valuations, time_limit=time_limit)
+        gap = (result.upper_bound - result.value) / result.upper_bound
+        print(f"  time_limit={time_limit:>5}s: value={result.value}  upper_bound={result.upper_bound}"
+              f"  gap={gap:.2%}  optimal={result.optimal}")
+    print()
+
+
+def compare_incremental(num_players=4, num_items=14, num_updates=10, seed=42):
+    """
+    שינויי ערכים קטנים (עד 20%): פתרון מחדש עם IncrementalSolver מול פתרון מאפס אחרי כל שינוי.
+    """
+    rnd = random.Random(seed)
+    valuations = [[rnd.randint(1, 2 ** 32) for _ in range(num_items)] for _ in range(num_players)]
+    solver = IncrementalSolver(valuations)
+    incremental_time = cold_time = 0.0
+    skipped = 0
+    for _ in range(num_updates):
+        i, j = rnd.randrange(num_players), rnd.randrange(num_items)
+        value = max(1, int(solver.valuations[i][j] * rnd.uniform(0.8, 1.2)))
+        start = time.perf_counter()
+        solver.update_valuation(i, j, value)
+        incremental_time += time.perf_counter() - start
+        skipped += not solver.searched
+        start = time.perf_counter()
+        egalitarian_allocation(solver.valuations, engine="dfs", bound="subset", warm_start="greedy")
+        cold_time += time.perf_counter() - start
+    print(f"Incremental re-solve on {num_players} players x {num_items} items, {num_updates} updates:")
+    print(f"  incremental: {incremental_time * 1000:>10.2f} ms  (no search needed: {skipped})")
+    print(f"  cold:        {cold_time * 1000:>10.2f} ms")
+    print()
+
+
+def compare_parallel(num_players=4, num_items=11, worker_counts=(1, 2, 4, 8), seed=42, runs=3):
+    """
+    זמן ריצה ו-speedup של החיפוש המקבילי (workers) מול הרצה בתהליך אחד, על קלט גדול יותר.
+    """
+    rnd = random.Random(seed)
+    valuations = [[rnd.randint(1, 2 ** 32) for _ in range(num_items)] for _ in range(num_players)]
+    print(f"Parallel depth-first search on {num_players} players x {num_items} items:")
+    baseline = None
+    for workers in worker_counts:
+        avg = average_run_time(lambda v: egalitarian_allocation(v, engine="dfs", workers=workers), valuations, runs)
+        baseline = baseline or avg
+        print(f"  workers={workers:>2}: {avg:>10.2f} ms  speedup={baseline / avg:.2f}x")
+    print()
+
+
 # ================================
 # פונקציית השוואה על אותו קלט
 # ================================
@@ -138,13 +217,30 @@ def compare_versions(num_players=3, num_items=8, seed=42):
 
     original_avg = average_run_time(egalitarian_allocation_original, valuations)
     sorted_avg = average_run_time(egalitarian_allocation_sorted, valuations)
+    dfs_avg = average_run_time(egalitarian_allocation_dfs, valuations)
+    vectorized_avg = average_run_time(egalitarian_allocation_vectorized, valuations)
+    binary_search_avg = average_run_time(egalitarian_allocation_binary_search, valuations)
 
     print(f"Average Time (Original):      {original_avg:.2f} ms")
-    print(f"Average Time (Sorted Prune):  {sorted_avg:.2f} ms\n")
+    print(f"Average Time (Sorted Prune):  {sorted_avg:.2f} ms")
+    print(f"Average Time (Depth-First):   {dfs_avg:.2f} ms")
+    print(f"Average Time (Vectorized):    {vectorized_avg:.2f} ms")
+    print(f"Average Time (Binary Search): {binary_search_avg:.2f} ms\n")
+
+    compare_bounds(valuations)
+    compare_warm_starts(valuations)
+
+    compare_dominance(valuations)
+    compare_pruning_stats(valuations)
+    print("Generated nodes by item order:")
+    compare_item_orders(valuations, "random")
+    compare_item_orders(adversarial_valuations(num_players, num_items, seed), "adversarial")
+    print()
 
     # הדפסת פתרונות לוודא זהות
     original_result = egalitarian_allocation_original(valuations)
     sorted_result = egalitarian_allocation_sorted(valuations)
+    dfs_result = egalitarian_allocation_dfs(valuations)
 
     print("Original allocation:")
     for i, items in enumerate(original_result):
@@ -156,9 +252,18 @@ def compare_versions(num_players=3, num_items=8, seed=42):
         value = sum(valuations[i][j] for j in items)
         print(f"Player {i} gets items {items} with value {value}")
 
+    print("\nDepth-first allocation:")
+    for i, items in enumerate(dfs_result):
+        value = sum(valuations[i][j] for j in items)
+        print(f"Player {i} gets items {items} with value {value}")
+
 
 # ================================
 # להרצה
 # ================================
 if __name__ == "__main__":
     compare_versions()
+    compare_approximation()
+    compare_anytime()
+    compare_incremental()
+    compare_parallel()
@@ -1,5 +1,8 @@
 from main5_1 import egalitarian_allocation
+from stats import SearchStats
+from value_matrix import min_player_value
 from typing import List
+import random
 
 def get_min_player_value(allocation: List[List[int]], valuations: List[List[float]]) -> float:
     """
@@ -8,10 +11,7 @@ def get_min_player_value(allocation: List[List[int]], valuations: List[List[floa
     >>> get_min_player_value([[1, 2], [0]], [[1, 2, 3], [3, 2, 1]])
     3
     """
-    return min(
-        sum(valuations[player][item] for item in allocation[player])
-        for player in range(len(allocation))
-    )
+    return min_player_value(allocation, valuations)
 
 def test_egalitarian_allocation():
     """
@@ -53,6 +53,133 @@ def test_egalitarian_allocation():
     """
     pass
 
+def test_search_engines():
+    """
+    כל מנועי החיפוש (לרוחב, לעומק, הטוב ביותר קודם) חייבים להגיע לאותו ערך מינימלי.
+
+    >>> vals = [[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]]
+    >>> [get_min_player_value(egalitarian_allocation(vals, engine=e), vals) for e in ("bfs", "dfs", "best_first")]
+    [15, 15, 15]
+
+    >>> vals = [[1, 2, 3], [3, 2, 1], [2, 2, 2]]
+    >>> [get_min_player_value(egalitarian_allocation(vals, engine=e), vals) for e in ("bfs", "dfs", "best_first")]
+    [2, 2, 2]
+
+    >>> vals = [[0, 0, 10], [0, 10, 0], [10, 0, 0]]
+    >>> [get_min_player_value(egalitarian_allocation(vals, engine=e), vals) for e in ("bfs", "dfs", "best_first")]
+    [10, 10, 10]
+
+    >>> egalitarian_allocation(vals, engine="dijkstra")
+    Traceback (most recent call last):
+    ...
+    ValueError: Unknown engine 'dijkstra', expected one of ('bfs', 'dfs', 'best_first', 'vectorized', 'binary_search')
+    """
+    pass
+
+def test_subset_bound():
+    """
+    החסם "subset" הדוק יותר אבל עדיין מדויק – הערך המינימלי לא משתנה.
+
+    >>> vals = [[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]]
+    >>> get_min_player_value(egalitarian_allocation(vals, engine="dfs", bound="subset"), vals)
+    15
+
+    >>> vals = [[10, 10, 10], [1, 1, 1]]
+    >>> get_min_player_value(egalitarian_allocation(vals, engine="bfs", bound="subset"), vals)
+    2
+
+    >>> random.seed(7)
+    >>> vals = [[random.randint(1, 2**32) for _ in range(7)] for _ in range(3)]
+    >>> exact = get_min_player_value(egalitarian_allocation(vals), vals)
+    >>> get_min_player_value(egalitarian_allocation(vals, engine="dfs", bound="subset"), vals) == exact
+    True
+    """
+    pass
+
+def test_warm_start():
+    """
+    הקצאה התחלתית (warm start) רק מחזקת את גיזום ב – הערך המינימלי לא משתנה.
+
+    >>> vals = [[1, 2, 3], [3, 2, 1], [2, 2, 2]]
+    >>> [get_min_player_value(egalitarian_allocation(vals, warm_start=w), vals) for w in ("round_robin", "greedy", "local_search")]
+    [2, 2, 2]
+
+    אפשר לתת גם פונקציה משלכם שמחזירה assignment[item] = player:
+
+    >>> vals = [[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]]
+    >>> result = egalitarian_allocation(vals, engine="dfs", warm_start=lambda v: [0] * len(v[0]))
+    >>> get_min_player_value(result, vals)
+    15
+
+    >>> random.seed(11)
+    >>> vals = [[random.randint(1, 2**32) for _ in range(7)] for _ in range(3)]
+    >>> exact = get_min_player_value(egalitarian_allocation(vals), vals)
+    >>> get_min_player_value(egalitarian_allocation(vals, engine="dfs", warm_start="local_search"), vals) == exact
+    True
+
+    >>> egalitarian_allocation(vals, warm_start="random")
+    Traceback (most recent call last):
+    ...
+    ValueError: Unknown warm start 'random', expected one of ('round_robin', 'greedy', 'local_search')
+    """
+    pass
+
+def test_item_order():
+    """
+    שינוי סדר ההחלטה על החפצים לא משנה את הערך המינימלי, וההקצאה מוחזרת באינדקסים המקוריים.
+
+    >>> vals = [[0, 0, 10], [0, 10, 0], [10, 0, 0]]
+    >>> egalitarian_allocation(vals, engine="dfs", item_order="max_value")
+    [[2], [1], [0]]
+
+    >>> random.seed(5)
+    >>> vals = [[random.randint(1, 2**32) for _ in range(7)] for _ in range(3)]
+    >>> exact = get_min_player_value(egalitarian_allocation(vals), vals)
+    >>> [get_min_player_value(egalitarian_allocation(vals, engine="dfs", item_order=o), vals) == exact
+    ...  for o in ("max_value", "variance", "contention")]
+    [True, True, True]
+
+    >>> egalitarian_allocation(vals, item_order=lambda v: [0, 0, 1])
+    Traceback (most recent call last):
+    ...
+    ValueError: Item order must be a permutation of range(7), got [0, 0, 1]
+    """
+    pass
+
+def test_search_stats():
+    """
+    מוני החיפוש לא משנים את התוצאה. בחיפוש לרוחב בלי warm start הפתרון הראשון מגיע רק
+    בשכבה האחרונה, ולכן גיזום ב לא עובד בכלל.
+
+    >>> vals = [[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]]
+    >>> stats = SearchStats()
+    >>> egalitarian_allocation(vals, stats=stats) == egalitarian_allocation(vals)
+    True
+    >>> stats.as_dict()["pruned"], stats.nodes_expanded, stats.children_generated, stats.incumbent_improvements
+    ({'A': 5, 'B': 0, 'C': 0, 'D': 0}, 30, 60, 10)
+
+    >>> random.seed(6)
+    >>> vals = [[random.randint(1, 2**32) for _ in range(7)] for _ in range(3)]
+    >>> for engine in ("bfs", "dfs", "best_first", "vectorized"):
+    ...     stats = SearchStats()
+    ...     result = egalitarian_allocation(vals, engine=engine, warm_start="greedy", stats=stats)
+    ...     print(engine, result == egalitarian_allocation(vals, engine=engine, warm_start="greedy"),
+    ...           stats.nodes_expanded > 0, stats.pruned["B"] > 0, stats.time_to_first_incumbent <= stats.elapsed)
+    bfs True True True True
+    dfs True True True True
+    best_first True True True True
+    vectorized True True True True
+
+    >>> import json
+    >>> sorted(json.loads(stats.to_json()))
+    ['children_generated', 'elapsed', 'incumbent_improvements', 'nodes_expanded', 'peak_frontier', 'peak_visited', 'pruned', 'time_to_first_incumbent']
+    >>> egalitarian_allocation(vals, engine="binary_search", stats=SearchStats())
+    Traceback (most recent call last):
+    ...
+    ValueError: stats are supported only with engine in ('bfs', 'dfs', 'best_first', 'vectorized') and workers=1, got engine='binary_search', workers=1
+    """
+    pass
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod(verbose=True)
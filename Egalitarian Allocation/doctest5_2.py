@@ -1,4 +1,8 @@
-from main5_1 import egalitarian_allocation
+from batch import ResultCache, solve_batch
+from incremental import IncrementalSolver
+from main5_1 import anytime_egalitarian_allocation, approximate_egalitarian_allocation, egalitarian_allocation
+from transposition import TranspositionTable
+from value_matrix import min_player_value
 from typing import List
 import random
 
@@ -7,10 +11,7 @@ def get_min_player_value(allocation: List[List[int]], valuations: List[List[int]
     >>> get_min_player_value([[1, 2], [0]], [[1, 2, 3], [3, 2, 1]])
     3
     """
-    return min(
-        sum(valuations[player][item] for item in allocation[player])
-        for player in range(len(allocation))
-    )
+    return min_player_value(allocation, valuations)
 
 def test_egalitarian_random_big_values():
     """
@@ -36,6 +37,302 @@ def test_egalitarian_random_big_values():
     """
     pass
 
+def test_dominance_pruning_big_values():
+    """
+    עם ערכים בטווח 1 עד 2^32 כמעט אין מצבים זהים, אבל גיזום השליטה עדיין חוסך מצבים
+    ושומר על אותו ערך מינימלי.
+
+    >>> random.seed(2025)
+    >>> for num_players, num_items in [(2, 8), (3, 7), (4, 6)]:
+    ...     vals = [[random.randint(1, 2**32) for _ in range(num_items)] for _ in range(num_players)]
+    ...     expected = get_min_player_value(egalitarian_allocation(vals), vals)
+    ...     for engine in ("bfs", "dfs", "best_first"):
+    ...         result = egalitarian_allocation(vals, engine=engine, dominance=True)
+    ...         print(num_players, engine, get_min_player_value(result, vals) == expected)
+    2 bfs True
+    2 dfs True
+    2 best_first True
+    3 bfs True
+    3 dfs True
+    3 best_first True
+    4 bfs True
+    4 dfs True
+    4 best_first True
+    """
+    pass
+def test_bounded_transposition_table():
+    """
+    טבלת מצבים קטנה מדי מפנה רשומות, אבל התוצאה נשארת זהה לזו של קבוצת visited רגילה.
+
+    >>> random.seed(77)
+    >>> vals = [[random.randint(1, 2**32) for _ in range(6)] for _ in range(4)]
+    >>> expected = get_min_player_value(egalitarian_allocation(vals), vals)
+    >>> for policy in ("depth", "lru"):
+    ...     table = TranspositionTable(max_bytes=4096, policy=policy)
+    ...     result = egalitarian_allocation(vals, engine="dfs", transposition_table=table)
+    ...     stats = table.stats()
+    ...     print(policy, get_min_player_value(result, vals) == expected, stats['size'] <= stats['capacity'], stats['evictions'] > 0)
+    depth True True True
+    lru True True True
+    """
+    pass
+
+def test_vectorized_engine():
+    """
+    המנוע הווקטורי (NumPy) מגיע לאותו ערך מינימלי כמו החיפוש לרוחב, עם ובלי warm start.
+
+    >>> random.seed(31)
+    >>> for num_players, num_items in [(2, 9), (3, 7), (4, 6)]:
+    ...     vals = [[random.randint(1, 2**32) for _ in range(num_items)] for _ in range(num_players)]
+    ...     expected = get_min_player_value(egalitarian_allocation(vals), vals)
+    ...     plain = egalitarian_allocation(vals, engine="vectorized")
+    ...     warm = egalitarian_allocation(vals, engine="vectorized", warm_start="greedy", bound="subset")
+    ...     print(num_players, get_min_player_value(plain, vals) == expected, get_min_player_value(warm, vals) == expected)
+    2 True True
+    3 True True
+    4 True True
+
+    ערכי float רצים ב-float64, וערכים שיכולים לגלוש ב-int64 חוזרים לחיפוש לרוחב המדויק.
+    >>> egalitarian_allocation([[1.5, 2], [2, 1]], engine="vectorized")
+    [[1], [0]]
+    >>> egalitarian_allocation([[2 ** 63, 1], [1, 2 ** 63]], engine="vectorized")
+    [[0], [1]]
+    """
+    pass
+
+
+def test_array_input():
+    """
+    מערכי NumPy (int64 ו-float64) נותנים את אותו ערך מינימלי כמו רשימות, בכל המנועים.
+
+    >>> import numpy as np
+    >>> random.seed(48)
+    >>> vals = [[random.randint(1, 2**32) for _ in range(7)] for _ in range(3)]
+    >>> expected = get_min_player_value(egalitarian_allocation(vals), vals)
+    >>> [get_min_player_value(egalitarian_allocation(np.array(vals), engine=engine), vals) == expected
+    ...  for engine in ("bfs", "dfs", "best_first", "vectorized", "binary_search")]
+    [True, True, True, True, True]
+    >>> floats = np.array([[random.random() for _ in range(7)] for _ in range(3)])
+    >>> expected = get_min_player_value(egalitarian_allocation(floats.tolist()), floats)
+    >>> [abs(get_min_player_value(egalitarian_allocation(floats, engine=engine), floats) - expected) < 1e-9
+    ...  for engine in ("dfs", "best_first", "vectorized", "binary_search")]
+    [True, True, True, True]
+
+    עם float כל מנוע מחבר את הסכומים בסדר אחר, וכולם משווים עם אותה סובלנות (value_matrix.float_slack).
+    >>> tenths = [[1.6, 0.5, 2.0, 0.4, 0.1], [0.5, 0.2, 0.6, 0.0, 0.8]]
+    >>> expected = get_min_player_value(egalitarian_allocation(tenths), tenths)
+    >>> [abs(get_min_player_value(egalitarian_allocation(tenths, engine=engine, bound="subset", symmetry=True,
+    ...                                                  dominance=True),
+    ...                           tenths) - expected) < 1e-9
+    ...  for engine in ("dfs", "best_first", "vectorized", "binary_search")]
+    [True, True, True, True]
+    """
+    pass
+
+def test_parallel_search():
+    """
+    חיפוש מקבילי בכמה תהליכים מגיע לאותו ערך מינימלי כמו החיפוש הטורי.
+
+    >>> random.seed(37)
+    >>> for num_players, num_items in [(2, 8), (3, 7)]:
+    ...     vals = [[random.randint(1, 2**32) for _ in range(num_items)] for _ in range(num_players)]
+    ...     expected = get_min_player_value(egalitarian_allocation(vals, engine="dfs"), vals)
+    ...     parallel = egalitarian_allocation(vals, engine="dfs", workers=2, dominance=True)
+    ...     print(num_players, get_min_player_value(parallel, vals) == expected)
+    2 True
+    3 True
+
+    >>> egalitarian_allocation([[1, 2], [2, 1]], engine="bfs", workers=2)
+    Traceback (most recent call last):
+    ...
+    ValueError: workers > 1 is supported only with engine='dfs', got 'bfs'
+
+    >>> from transposition import TranspositionTable
+    >>> egalitarian_allocation([[1, 2], [2, 1]], engine="dfs", workers=2, transposition_table=TranspositionTable())
+    Traceback (most recent call last):
+    ...
+    ValueError: transposition_table is supported only with workers=1, got workers=2
+    """
+    pass
+
+def test_binary_search_engine():
+    """
+    החיפוש הבינארי על הערך המינימלי מגיע לאותו ערך כמו החיפוש לרוחב – גם עם ערכים לא שלמים.
+
+    >>> random.seed(41)
+    >>> for num_players, num_items in [(2, 9), (3, 7), (4, 6)]:
+    ...     vals = [[random.randint(1, 2**32) for _ in range(num_items)] for _ in range(num_players)]
+    ...     expected = get_min_player_value(egalitarian_allocation(vals), vals)
+    ...     plain = egalitarian_allocation(vals, engine="binary_search")
+    ...     subset = egalitarian_allocation(vals, engine="binary_search", bound="subset", symmetry=True)
+    ...     print(num_players, get_min_player_value(plain, vals) == expected, get_min_player_value(subset, vals) == expected)
+    2 True True
+    3 True True
+    4 True True
+
+    >>> vals = [[1.5, 2.25, 0.5, 3], [2, 1, 1.75, 0.25]]
+    >>> get_min_player_value(egalitarian_allocation(vals, engine="binary_search"), vals)
+    3.75
+
+    סכום של סל יכול לצאת שונה בביט האחרון בסדרי חיבור שונים (0.3 + 0.7 + 0.1 < 1.1), ולכן הבדיקה משווה עם float_slack.
+    >>> vals = [[0.2, 1.1, 0.1, 1.1], [0.1, 0.3, 0.7, 0.1]]
+    >>> allocation = egalitarian_allocation(vals, engine="binary_search", bound="subset", warm_start="greedy",
+    ...                                     item_order="max_value")
+    >>> round(get_min_player_value(allocation, vals), 9)
+    1.1
+    """
+    pass
+
+def test_approximation_guarantee():
+    """
+    במצב קירוב הערך המדווח הוא הערך האמיתי של ההקצאה, הוא לפחות (1-ε) מהאופטימום,
+    והחסם העליון המוכח לא קטן מהאופטימום – בשני סוגי הדליים.
+
+    >>> random.seed(43)
+    >>> for num_players, num_items in [(2, 9), (3, 7), (4, 6)]:
+    ...     vals = [[random.randint(1, 2**32) for _ in range(num_items)] for _ in range(num_players)]
+    ...     optimum = get_min_player_value(egalitarian_allocation(vals, engine="dfs"), vals)
+    ...     for rounding in ("linear", "geometric"):
+    ...         result = approximate_egalitarian_allocation(vals, 0.01, rounding)
+    ...         print(num_players, rounding, result.value == get_min_player_value(result.allocation, vals),
+    ...               result.value >= 0.99 * optimum, result.upper_bound >= optimum)
+    2 linear True True True
+    2 geometric True True True
+    3 linear True True True
+    3 geometric True True True
+    4 linear True True True
+    4 geometric True True True
+
+    >>> vals = [[random.randint(1, 2**32) for _ in range(8)] for _ in range(3)]
+    >>> optimum = get_min_player_value(egalitarian_allocation(vals, engine="dfs"), vals)
+    >>> get_min_player_value(egalitarian_allocation(vals, epsilon=0.05, engine="dfs"), vals) >= 0.95 * optimum
+    True
+    >>> result = approximate_egalitarian_allocation(vals, 0.3, "geometric", engine="dfs", dominance=True)
+    >>> result.value >= 0.7 * optimum, result.upper_bound >= optimum
+    (True, True)
+
+    עם הרבה חפצים ושני שחקנים הדליים כן מאחדים מצבים (ראו approximation.buckets_can_merge), והם נשמרים.
+    >>> random.seed(44)
+    >>> vals = [[random.randint(1, 2**32) for _ in range(20)] for _ in range(2)]
+    >>> optimum = get_min_player_value(egalitarian_allocation(vals, engine="dfs", bound="subset"), vals)
+    >>> result = approximate_egalitarian_allocation(vals, 0.1, engine="dfs", bound="optimistic")
+    >>> result.value >= 0.9 * optimum, result.upper_bound >= optimum
+    (True, True)
+    """
+    pass
+
+
+def test_anytime_budget():
+    """
+    חיפוש עם תקציב: גם כשהוא נעצר, ההקצאה שלמה, value הוא הערך האמיתי שלה, והחסם העליון
+    לא קטן מהאופטימום. כל הקצאה ש-progress מקבל טובה לפחות כמו הקודמת.
+    בלי הגבלה התוצאה אופטימלית ו-upper_bound == value.
+
+    >>> random.seed(44)
+    >>> vals = [[random.randint(1, 2**32) for _ in range(9)] for _ in range(3)]
+    >>> optimum = get_min_player_value(egalitarian_allocation(vals, engine="dfs"), vals)
+    >>> for engine in ("bfs", "dfs", "best_first"):
+    ...     improvements = []
+    ...     result = anytime_egalitarian_allocation(vals, max_nodes=50, engine=engine, progress=improvements.append)
+    ...     print(engine, result.value == get_min_player_value(result.allocation, vals),
+    ...           result.value <= optimum <= result.upper_bound, result.optimal,
+    ...           all(a.value <= b.value for a, b in zip(improvements, improvements[1:])))
+    bfs True True False True
+    dfs True True False True
+    best_first True True False True
+
+    >>> result = anytime_egalitarian_allocation(vals, time_limit=60)
+    >>> result.optimal, result.value == result.upper_bound == optimum
+    (True, True)
+    >>> result = anytime_egalitarian_allocation(vals, time_limit=0)
+    >>> result.value == get_min_player_value(result.allocation, vals), result.optimal
+    (True, False)
+    """
+    pass
+
+
+def test_batch_cache():
+    """
+    פתרון batch: עותקים של אותה מטריצה עם שחקנים וחפצים בסדר אחר נפתרים פעם אחת,
+    וכל תוצאה מוחזרת באינדקסים של המטריצה שלה עם אותו ערך מינימלי כמו פתרון ישיר.
+
+    >>> random.seed(45)
+    >>> base = [[random.randint(1, 2**32) for _ in range(7)] for _ in range(3)]
+    >>> matrices = []
+    >>> for _ in range(4):
+    ...     players, items = random.sample(range(3), 3), random.sample(range(7), 7)
+    ...     matrices.append([[base[i][j] for j in items] for i in players])
+    >>> cache = ResultCache(max_entries=8)
+    >>> results = solve_batch(matrices + [base], workers=2, cache=cache, engine="dfs")
+    >>> [get_min_player_value(result, matrix) == get_min_player_value(egalitarian_allocation(matrix), matrix)
+    ...  for result, matrix in zip(results, matrices + [base])]
+    [True, True, True, True, True]
+    >>> cache.stats()
+    {'capacity': 8, 'size': 1, 'hits': 0, 'misses': 1, 'evictions': 0}
+    >>> results == solve_batch(matrices + [base], cache=cache, engine="dfs"), cache.stats()['hits']
+    (True, 1)
+    """
+    pass
+
+
+def test_incremental_solver():
+    """
+    פתרון מחדש אחרי כל שינוי נותן את אותו ערך מינימלי כמו פתרון מאפס.
+
+    >>> random.seed(46)
+    >>> vals = [[random.randint(1, 2**32) for _ in range(8)] for _ in range(3)]
+    >>> solver = IncrementalSolver(vals)
+    >>> checks = []
+    >>> for step in range(6):
+    ...     if step % 3 == 0:
+    ...         result = solver.update_valuation(random.randrange(3), random.randrange(8), random.randint(1, 2**32))
+    ...     elif step % 3 == 1:
+    ...         result = solver.add_item([random.randint(1, 2**32) for _ in range(3)])
+    ...     else:
+    ...         result = solver.remove_item(random.randrange(8))
+    ...     cold = egalitarian_allocation(solver.valuations, engine="dfs")
+    ...     checks.append(result.value == get_min_player_value(result.allocation, solver.valuations)
+    ...                   == get_min_player_value(cold, solver.valuations))
+    >>> checks
+    [True, True, True, True, True, True]
+    """
+    pass
+
+
+def test_leximin():
+    """
+    מצב לקסימין: וקטור הערכים הממוין זהה לזה של חיפוש ממצה, והערך המינימלי זהה לזה של max-min.
+
+    >>> from itertools import product
+    >>> random.seed(47)
+    >>> checks = []
+    >>> for _ in range(20):
+    ...     vals = [[random.randint(0, 5) for _ in range(5)] for _ in range(3)]
+    ...     best = max(sorted(sum(vals[i][j] for j in range(5) if owners[j] == i) for i in range(3))
+    ...                for owners in product(range(3), repeat=5))
+    ...     result = egalitarian_allocation(vals, leximin=True)
+    ...     checks.append(sorted(sum(vals[i][j] for j in items) for i, items in enumerate(result)) == best)
+    >>> all(checks)
+    True
+    >>> vals = [[random.randint(1, 2**32) for _ in range(9)] for _ in range(4)]
+    >>> leximin = egalitarian_allocation(vals, leximin=True, symmetry=True)
+    >>> get_min_player_value(leximin, vals) == get_min_player_value(egalitarian_allocation(vals, engine="dfs"), vals)
+    True
+
+    אפשרויות שלקסימין לא מכבד לא מתעלמים מהן בשקט.
+    >>> egalitarian_allocation([[1, 2], [2, 1]], leximin=True, engine="nonsense")
+    Traceback (most recent call last):
+    ...
+    ValueError: Unknown engine 'nonsense', expected one of ('bfs', 'dfs', 'best_first', 'vectorized', 'binary_search')
+    >>> from stats import SearchStats
+    >>> egalitarian_allocation([[1, 2], [2, 1]], leximin=True, pruning="ABCD", stats=SearchStats())
+    Traceback (most recent call last):
+    ...
+    ValueError: leximin=True supports only symmetry and item_order, got dominance, stats
+    """
+    pass
+
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod(verbose=True)
@@ -1,4 +1,7 @@
+from main5_1 import egalitarian_allocation
 from main_5_3 import egalitarian_allocation_sorted_pruning
+from stats import SearchStats
+from value_matrix import min_player_value
 from typing import List
 import random
 
@@ -9,10 +12,7 @@ def get_min_player_value(allocation: List[List[int]], valuations: List[List[floa
     >>> get_min_player_value([[1, 2], [0]], [[1, 2, 3], [3, 2, 1]])
     3
     """
-    return min(
-        sum(valuations[player][item] for item in allocation[player])
-        for player in range(len(allocation))
-    )
+    return min_player_value(allocation, valuations)
 
 
 def test_sorted_pruning_allocation():
@@ -66,6 +66,53 @@ def test_large_valuations():
     pass
 
 
+def test_symmetry_only_between_identical_players():
+    """
+    הגיזום ממיין סכומים רק בין שחקנים עם שורת ערכים זהה.
+    בקלט הזה מיון כל הווקטור היה מאחד את (3, 0) עם (0, 3) אחרי החפץ הראשון וזורק את האופטימום.
+
+    >>> valuations = [[3, 4, 0], [3, 1, 3]]
+    >>> result = egalitarian_allocation_sorted_pruning(valuations, print_result=False)
+    >>> get_min_player_value(result, valuations)
+    4
+
+    בדיקה אקראית מול האלגוריתם ללא גיזום סימטריה, גם עם שחקנים זהים וגם עם שחקנים שונים:
+
+    >>> random.seed(2024)
+    >>> mismatches = 0
+    >>> for _ in range(200):
+    ...     num_players = random.randint(2, 4)
+    ...     num_items = random.randint(1, 6)
+    ...     rows = [[random.randint(0, 5) for _ in range(num_items)] for _ in range(2)]
+    ...     valuations = [list(random.choice(rows)) for _ in range(num_players)]
+    ...     expected = get_min_player_value(egalitarian_allocation(valuations), valuations)
+    ...     for engine in ("bfs", "dfs"):
+    ...         result = egalitarian_allocation_sorted_pruning(valuations, print_result=False, engine=engine)
+    ...         mismatches += get_min_player_value(result, valuations) != expected
+    ...         result = egalitarian_allocation(valuations, engine=engine, symmetry=True)
+    ...         mismatches += get_min_player_value(result, valuations) != expected
+    >>> mismatches
+    0
+    """
+    pass
+
+
+def test_sorted_pruning_stats():
+    """
+    עם שחקנים זהים, מצבים שהסכומים הממוינים מאחדים נספרים כגיזום ג, והחיפוש מרחיב פחות צמתים.
+
+    >>> vals = [[3, 1, 4, 1, 5, 9], [3, 1, 4, 1, 5, 9], [2, 7, 1, 8, 2, 8]]
+    >>> plain, sorted_sums = SearchStats(), SearchStats()
+    >>> _ = egalitarian_allocation(vals, stats=plain)
+    >>> _ = egalitarian_allocation_sorted_pruning(vals, print_result=False, stats=sorted_sums)
+    >>> plain.pruned, sorted_sums.pruned
+    ({'A': 54, 'B': 0, 'C': 0, 'D': 0}, {'A': 0, 'B': 0, 'C': 38, 'D': 0})
+    >>> plain.nodes_expanded, sorted_sums.nodes_expanded
+    (297, 157)
+    """
+    pass
+
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod(verbose=True)
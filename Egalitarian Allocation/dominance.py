@@ -0,0 +1,178 @@
+from bisect import bisect_left, bisect_right
+from operator import ge
+from typing import Callable, Dict, List, Optional, Sequence
+
+# --- כלל גיזום ד (שליטה):
+# שני מצבים עם אותו אינדקס חפץ יכולים לקבל בדיוק את אותם המשכים. אם במצב B כל שחקן
+# מחזיק לפחות כמו במצב A, כל השלמה של A נותנת ב-B סכומים גדולים או שווים – ולכן A
+# לא יכול לשפר את התוצאה ואפשר לזרוק אותו.
+# לכל שכבה (אינדקס חפץ) שומרים רק את "קו הרקיע" – המצבים שאף מצב אחר לא שולט בהם.
+# במצב קירוב (approximation.py) השליטה נבדקת על הדליים של הסכומים ולא על הסכומים עצמם.
+
+
+class _StaircaseLayer:
+    """
+    קו רקיע לשני שחקנים: ממוין לפי הסכום של שחקן 0 בסדר עולה, ולכן הסכום של שחקן 1
+    יורד. בדיקת שליטה והכנסה עולות O(log n) חיפוש בינארי.
+    """
+
+    def __init__(self):
+        self.first = []
+        self.second = []
+
+    def dominated(self, sums: Sequence[int]) -> bool:
+        a, b = sums[0], sums[1]
+        # המועמד היחיד לשלוט: הנקודה הראשונה עם first >= a, כי אחריה second רק יורד
+        position = bisect_left(self.first, a)
+        return position < len(self.first) and self.second[position] >= b
+
+    def add(self, sums: Sequence[int]) -> bool:
+        if self.dominated(sums):
+            return False
+        a, b = sums[0], sums[1]
+        # הנקודות ש-(a, b) שולט בהן הן רצף שמסתיים ממש לפני נקודת ההכנסה
+        end = bisect_right(self.first, a)
+        start = end
+        while start > 0 and self.second[start - 1] <= b:
+            start -= 1
+        self.first[start:end] = [a]
+        self.second[start:end] = [b]
+        return True
+
+    def __len__(self):
+        return len(self.first)
+
+
+class _KDTreeLayer:
+    """
+    אינדקס לשלושה שחקנים או יותר: עץ k-d על הנקודות שנשמרו. צומת בעומק d מפצל לפי שחקן
+    d % k (בימין – סכום גדול או שווה), וכל צומת שומר גם את המקסימום של כל שחקן בתת-העץ שלו.
+    בבדיקת שליטה מדלגים על כל תת-עץ שבו המקסימום של שחקן כלשהו קטן מהסכום שלו בשאילתה,
+    ולכן בודקים רק חלק קטן מהנקודות ולא סורקים את כל השכבה.
+    נקודה שנשלטת על ידי נקודה חדשה לא נמחקת מהעץ: היא לא משנה את התשובות (מי ששולטת בה
+    שולטת גם בכל מה שהיא שולטת), ומחיקה הייתה עולה עוד שאילתה לכל הכנסה. לכן len סופר את
+    כל הנקודות שנשמרו, ולא רק את קו הרקיע.
+    """
+
+    def __init__(self):
+        self.points = []
+        self.maxima = []
+        self.left = []
+        self.right = []
+
+    def dominated(self, sums: Sequence[int]) -> bool:
+        points = self.points
+        if not points:
+            return False
+        maxima, left, right = self.maxima, self.left, self.right
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if all(map(ge, maxima[node], sums)):
+                if all(map(ge, points[node], sums)):
+                    return True
+                # ימין (סכומים גדולים יותר בציר הפיצול) נשלף ראשון – שם סביר יותר למצוא שולט
+                if left[node] >= 0:
+                    stack.append(left[node])
+                if right[node] >= 0:
+                    stack.append(right[node])
+        return False
+
+    def add(self, sums: Sequence[int]) -> bool:
+        if self.dominated(sums):
+            return False
+        point = tuple(sums)
+        points, maxima = self.points, self.maxima
+        new = len(points)
+        points.append(point)
+        maxima.append(point)
+        self.left.append(-1)
+        self.right.append(-1)
+        node, axis = 0, 0
+        while node != new:
+            maxima[node] = tuple(map(max, maxima[node], point))
+            side = self.right if point[axis] >= points[node][axis] else self.left
+            if side[node] < 0:
+                side[node] = new
+            node = side[node]
+            axis = (axis + 1) % len(point)
+        return True
+
+    def __len__(self):
+        return len(self.points)
+
+
+class DominanceIndex:
+    """
+    אינדקס קווי רקיע לפי שכבה (אינדקס החפץ הבא).
+    זיכרון: שכבה משתחררת (forget_below) רק כשאין יותר מצב פתוח רדוד ממנה. בחיפוש לרוחב
+    זה קורה בסוף כל שכבה. בחיפוש לעומק ו-"best_first" המצבים הפתוחים הרדודים (למשל האחים של
+    הילדים של השורש) נשארים כמעט עד הסוף, ולכן האינדקס יכול להחזיק כל מצב שעבר את גיזום ב
+    בזמן הריצה – אותו סדר גודל כמו visited, ו-TranspositionTable לא מגביל אותו.
+
+    >>> index = DominanceIndex(2)
+    >>> index.add([3, 5], 1)
+    True
+    >>> index.add([2, 5], 1)
+    False
+    >>> index.add([4, 1], 1)
+    True
+    >>> index.add([4, 6], 1)
+    True
+    >>> index.size(1)
+    1
+    >>> index.dominated([4, 5], 1), index.dominated([5, 5], 1)
+    (True, False)
+    >>> index.add([2, 5], 2)
+    True
+
+    >>> index = DominanceIndex(3)
+    >>> index.add([3, 5, 1], 1), index.add([3, 4, 1], 1), index.add([0, 9, 0], 1), index.add([3, 9, 1], 1)
+    (True, False, True, True)
+    >>> index.dominated([3, 5, 1], 1), index.dominated([0, 9, 0], 1), index.dominated([4, 0, 0], 1)
+    (True, True, False)
+    >>> index.size(1)
+    3
+
+    >>> index = DominanceIndex(2, bucket=lambda value: value // 10)
+    >>> index.add([35, 51], 1), index.add([39, 50], 1), index.add([41, 50], 1)
+    (True, False, True)
+    """
+
+    def __init__(self, num_players: int, bucket: Optional[Callable] = None):
+        self.layer_type = _StaircaseLayer if num_players == 2 else _KDTreeLayer
+        self.layers: Dict[int, object] = {}
+        self.bucket = bucket
+
+    def add(self, sums: List[int], index: int) -> bool:
+        """
+        מחזיר False אם מצב קיים באותה שכבה שולט ב-sums (ואז אפשר לגזום),
+        אחרת מוסיף את sums לקו הרקיע ומחזיר True.
+        """
+        if self.bucket is not None:
+            sums = [self.bucket(value) for value in sums]
+        layer = self.layers.get(index)
+        if layer is None:
+            layer = self.layers[index] = self.layer_type()
+        return layer.add(sums)
+
+    def dominated(self, sums: List[int], index: int) -> bool:
+        """
+        בודק בלי להוסיף אם מצב קיים באותה שכבה שולט ב-sums.
+        """
+        if self.bucket is not None:
+            sums = [self.bucket(value) for value in sums]
+        layer = self.layers.get(index)
+        return layer is not None and layer.dominated(sums)
+
+    def forget_below(self, index: int):
+        """
+        משחרר את השכבות שלפני index, כשאין יותר מצב פתוח שיכול ליצור בהן מצבים חדשים.
+        החיפושים קוראים לה עם האינדקס של המצב הפתוח הרדוד ביותר ועוד אחד.
+        """
+        for layer_index in [i for i in self.layers if i < index]:
+            del self.layers[layer_index]
+
+    def size(self, index: int) -> int:
+        layer = self.layers.get(index)
+        return 0 if layer is None else len(layer)
@@ -0,0 +1,141 @@
+from typing import List, Optional
+
+from anytime import ANYTIME_ENGINES, SearchBudget, SearchResult
+from item_order import resolve_item_order
+from main5_1 import exact_state_key, make_bound, run_search, symmetric_state_key
+from value_matrix import as_rows
+from warm_start import allocation_values
+
+# פתרון מחדש אחרי שינוי קטן. האופטימום הקודם OPT נותן חסם עליון על האופטימום החדש:
+# - הקטנת v[i][j]: אף הקצאה לא משתפרת, ולכן OPT' <= OPT.
+# - הגדלת v[i][j] ב-delta: רק הסכום של שחקן i עולה, ולכל היותר ב-delta, ולכן OPT' <= OPT + delta.
+# - הוספת חפץ: מורידים אותו מכל הקצאה חדשה ומקבלים הקצאה ישנה, ולכן OPT' <= OPT + max(column).
+# - הסרת חפץ: מוסיפים אותו לכל הקצאה חדשה ומקבלים הקצאה ישנה, ולכן OPT' <= OPT.
+# ההקצאה הקודמת (אחרי התיקון המתבקש) היא הפתרון ההתחלתי. אם הערך שלה כבר שווה לחסם אין
+# צורך לחפש בכלל, ואחרת החיפוש נעצר ברגע שפתרון מגיע לחסם (SearchBudget.target).
+
+
+class IncrementalSolver:
+    """
+    שומר את ההקצאה האופטימלית האחרונה ופותר מחדש אחרי כל שינוי.
+    options עוברות ל-run_search (dominance, transposition_table); engine חייב להיות אחד
+    מ-ANYTIME_ENGINES. item_order מחושב מחדש לכל פתרון, כי הוא תלוי בערכים.
+
+    >>> solver = IncrementalSolver([[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]])
+    >>> solver.result
+    SearchResult(allocation=[[2, 3, 4], [0, 1]], value=15, upper_bound=15, optimal=True)
+    >>> solver.update_valuation(1, 4, 1).value, solver.searched
+    (15, False)
+    >>> solver.add_item([10, 10]).value, solver.searched
+    (21, True)
+    >>> solver.remove_item(0)
+    SearchResult(allocation=[[3, 4], [0, 1, 2]], value=18, upper_bound=18, optimal=True)
+    """
+
+    def __init__(self, valuations: List[List[int]], engine: str = "dfs", bound: str = "subset",
+                 symmetry: bool = False, item_order=None, **options):
+        if engine not in ANYTIME_ENGINES:
+            raise ValueError(f"Unknown engine {engine!r} for incremental solving, expected one of {ANYTIME_ENGINES}")
+        self.valuations = [list(row) for row in as_rows(valuations)]
+        self.engine = engine
+        self.bound = bound
+        self.symmetry = symmetry
+        self.item_order = item_order
+        self.options = options
+        # האם השינוי האחרון הצריך חיפוש, וכמה צמתים החיפוש שלף
+        self.searched = False
+        self.nodes = 0
+        self.result = self._solve(None, None)
+
+    @property
+    def allocation(self) -> List[List[int]]:
+        return self.result.allocation
+
+    def _assignment(self) -> List[int]:
+        assignment = [0] * len(self.valuations[0])
+        for player, items in enumerate(self.result.allocation):
+            for item in items:
+                assignment[item] = player
+        return assignment
+
+    def _solve(self, incumbent: Optional[List[int]], upper_bound) -> SearchResult:
+        num_players = len(self.valuations)
+        root_bound = make_bound(self.valuations, self.bound)((0,) * num_players, 0)
+        upper_bound = root_bound if upper_bound is None else min(upper_bound, root_bound)
+        if incumbent is not None:
+            value = min(allocation_values(self.valuations, incumbent))
+            if value >= upper_bound:
+                self.searched = False
+                self.nodes = 0
+                return SearchResult(self._allocation_of(incumbent), value, value, True)
+
+        # החיפוש רץ על העמודות בסדר order, ולכן גם הפתרון ההתחלתי צריך להיות בסדר הזה
+        order = None
+        if self.item_order is not None:
+            order = list(resolve_item_order(self.item_order)(self.valuations))
+        if incumbent is None:
+            warm_start = "greedy"
+        elif order is None:
+            warm_start = lambda valuations: incumbent
+        else:
+            warm_start = lambda valuations: [incumbent[j] for j in order]
+
+        budget = SearchBudget(target=upper_bound)
+        state_key = symmetric_state_key(self.valuations) if self.symmetry else exact_state_key
+        allocation = run_search(self.valuations, engine=self.engine, state_key=state_key, bound=self.bound,
+                                warm_start=warm_start, item_order=None if order is None else lambda valuations: order,
+                                budget=budget, **self.options)
+        self.searched = True
+        self.nodes = budget.nodes
+        value = min(sum(self.valuations[i][j] for j in items) for i, items in enumerate(allocation))
+        return SearchResult(allocation, value, value, True)
+
+    def _allocation_of(self, assignment: List[int]) -> List[List[int]]:
+        allocation = [[] for _ in self.valuations]
+        for item, player in enumerate(assignment):
+            allocation[player].append(item)
+        return allocation
+
+    def update_valuation(self, i: int, j: int, v) -> SearchResult:
+        """
+        משנה את הערך ששחקן i נותן לחפץ j ל-v ופותר מחדש.
+        """
+        v = as_rows([[v]])[0][0]
+        delta = v - self.valuations[i][j]
+        self.valuations[i][j] = v
+        upper_bound = self.result.value + max(delta, 0)
+        self.result = self._solve(self._assignment(), upper_bound)
+        return self.result
+
+    def add_item(self, column: List[int]) -> SearchResult:
+        """
+        מוסיף חפץ חדש (column[i] = הערך של שחקן i) בסוף ופותר מחדש. בפתרון ההתחלתי
+        החפץ הולך לשחקן שהכי מעלה את הערך המינימלי.
+        """
+        column = as_rows([column])[0]
+        if len(column) != len(self.valuations):
+            raise ValueError(f"Expected a value for each of the {len(self.valuations)} players, got {len(column)}")
+        assignment = self._assignment()
+        sums = allocation_values(self.valuations, assignment)
+        for row, value in zip(self.valuations, column):
+            row.append(value)
+
+        def gain(player):
+            new_sums = list(sums)
+            new_sums[player] += column[player]
+            return min(new_sums), column[player]
+        assignment.append(max(range(len(column)), key=gain))
+        upper_bound = self.result.value + max(column, default=0)
+        self.result = self._solve(assignment, upper_bound)
+        return self.result
+
+    def remove_item(self, j: int) -> SearchResult:
+        """
+        מסיר את חפץ j (האינדקסים של החפצים שאחריו יורדים באחד) ופותר מחדש.
+        """
+        assignment = self._assignment()
+        del assignment[j]
+        for row in self.valuations:
+            del row[j]
+        self.result = self._solve(assignment, self.result.value)
+        return self.result
@@ -0,0 +1,65 @@
+from typing import Callable, List
+
+# היוריסטיקות לסדר שבו החיפוש מחליט על החפצים.
+# כל היוריסטיקה מקבלת את מטריצת הערכים ומחזירה רשימה של אינדקסי החפצים המקוריים,
+# לפי הסדר שבו יש להחליט עליהם. חפצים "קשים" קודם – כך הגיזום מתחיל לפני שהעץ מתפוצץ.
+
+
+def by_max_value(valuations: List[List[int]]) -> List[int]:
+    """
+    מהחפץ עם הערך המקסימלי הגבוה ביותר (אצל שחקן כלשהו) לנמוך ביותר.
+
+    >>> by_max_value([[1, 9, 3], [2, 1, 5]])
+    [1, 2, 0]
+    """
+    num_items = len(valuations[0])
+    return sorted(range(num_items), key=lambda j: -max(row[j] for row in valuations))
+
+
+def by_variance(valuations: List[List[int]]) -> List[int]:
+    """
+    מהחפץ שהשחקנים הכי חלוקים לגביו (שונות גבוהה של הערכים) לחפץ שכולם מעריכים אותו דבר.
+
+    >>> by_variance([[5, 0, 3], [5, 10, 1]])
+    [1, 2, 0]
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+
+    def variance(j: int) -> float:
+        mean = sum(row[j] for row in valuations) / num_players
+        return sum((row[j] - mean) ** 2 for row in valuations) / num_players
+
+    return sorted(range(num_items), key=lambda j: -variance(j))
+
+
+def by_contention(valuations: List[List[int]]) -> List[int]:
+    """
+    ציון "תחרות": סכום החלקים שהחפץ מהווה מסך הערך של כל שחקן. חפץ שהרבה שחקנים
+    רוצים, וכל אחד מהם רואה בו חלק גדול מהעוגה שלו, מוכרע ראשון.
+
+    >>> by_contention([[1, 1, 8], [1, 8, 1], [2, 2, 6]])
+    [2, 1, 0]
+    """
+    num_items = len(valuations[0])
+    totals = [sum(row) or 1 for row in valuations]
+    return sorted(range(num_items), key=lambda j: -sum(row[j] / total for row, total in zip(valuations, totals)))
+
+
+ITEM_ORDERS = {
+    "max_value": by_max_value,
+    "variance": by_variance,
+    "contention": by_contention,
+}
+
+
+def resolve_item_order(item_order) -> Callable[[List[List[int]]], List[int]]:
+    """
+    מחזיר את פונקציית הסידור לפי שם (מתוך ITEM_ORDERS), או את הפונקציה עצמה
+    אם התקבלה פונקציה.
+    """
+    if callable(item_order):
+        return item_order
+    if item_order not in ITEM_ORDERS:
+        raise ValueError(f"Unknown item order {item_order!r}, expected one of {tuple(ITEM_ORDERS)}")
+    return ITEM_ORDERS[item_order]
@@ -0,0 +1,151 @@
+from typing import List, Optional, Tuple
+
+from item_order import resolve_item_order
+from main5_1 import egalitarian_allocation, exact_state_key, make_bound, symmetric_state_key
+from value_matrix import as_rows
+from warm_start import allocation_values
+
+# לקסימין: ממקסמים את וקטור הערכים הממוין לקסיקוגרפית – קודם את הערך הקטן ביותר, בשוויון
+# את השני הכי קטן, וכן הלאה. שבירת השוויון של egalitarian_allocation (סכומים ממוינים גדולים יותר)
+# משווה רק הקצאות שהחיפוש הגיע אליהן: "binary_search" עוצר בעד הראשון, ומצב הקירוב ומצב התקציב
+# לא מגיעים לכל ההקצאות השוות, ולכן היא לא מבטיחה לקסימין.
+#
+# כאן פותרים בשלבים (max-min חוזר עם רמות קבועות): שלב 0 הוא בעיית ה-max-min הרגילה, ונותן
+# levels[0]. בשלב k ממקסמים את הערך ה-k בגודלו, sorted(sums)[k], בתנאי ש-sorted(sums)[t] >= levels[t]
+# לכל t < k. לכל שלב יש מטרה אחת, ולכן החסמים רגילים ותקפים:
+# - החסם האופטימי: כל שחקן מקבל את כל מה שנשאר; הערך ה-k בגודלו של הווקטור הזה חוסם את
+#   הערך ה-k בכל השלמה (הוא מונוטוני בכל רכיב). אם הוא לא גדול מהפתרון הטוב ביותר – גוזמים.
+# - התנאים: אם בווקטור האופטימי sorted[t] < levels[t] – אין השלמה חוקית. עבור t = 0 משתמשים
+#   גם בחסם "subset" של make_bound, שהוא החסם החזק של בעיית ה-max-min.
+# - הסכומים נחתכים ב-cap, החסם העליון של השלב (הערך ה-k בגודלו של סכומי השורות): כל הרמות
+#   קטנות ממנו או שוות לו, ולכן שחקן שעבר אותו כבר עומד בכל תנאי ולא משנה את המטרה. כך יותר
+#   מצבים מתאחדים בגיזום א.
+# ההקצאה של השלב הקודם עומדת בכל התנאים, ולכן היא הפתרון ההתחלתי של השלב הבא.
+# רוב הזמן הולך על שלב 0; כל שלב נוסף מתחיל מחסם הדוק (levels) ומפתרון טוב, ולכן הוא זול.
+
+
+def leximin_values(valuations: List[List[int]], allocation: List[List[int]]) -> List[int]:
+    """
+    וקטור הערכים הממוין (מהקטן לגדול) של הקצאה – הווקטור שלקסימין ממקסם.
+
+    >>> leximin_values([[1, 2, 3], [3, 2, 1]], [[2], [0, 1]])
+    [3, 5]
+    """
+    return sorted(sum(valuations[i][j] for j in items) for i, items in enumerate(allocation))
+
+
+def leximin_allocation(valuations: List[List[int]], symmetry: bool = False,
+                       item_order="max_value") -> List[List[int]]:
+    """
+    מחזיר הקצאה לקסימין-אופטימלית: אין הקצאה שוקטור הערכים הממוין שלה גדול יותר לקסיקוגרפית.
+    הערך המינימלי שלה שווה לזה של egalitarian_allocation.
+    symmetry=True מאחד מצבים שנבדלים בהחלפת שחקנים עם שורת ערכים זהה (ראו symmetric_state_key),
+    ו-item_order קובע את סדר ההחלטה על החפצים (ראו item_order.py).
+
+    >>> valuations = [[4, 4, 4, 3], [1, 1, 4, 1], [0, 1, 4, 4]]
+    >>> leximin_values(valuations, egalitarian_allocation(valuations, engine="binary_search"))
+    [4, 4, 5]
+    >>> leximin_allocation(valuations)
+    [[0, 1], [2], [3]]
+    >>> leximin_values(valuations, leximin_allocation(valuations))
+    [4, 4, 8]
+    """
+    valuations = as_rows(valuations)
+    num_players = len(valuations)
+    num_items = len(valuations[0]) if valuations else 0
+    if num_items == 0:
+        return [[] for _ in range(num_players)]
+
+    order = list(resolve_item_order(item_order)(valuations)) if item_order is not None else list(range(num_items))
+    ordered = [[row[j] for j in order] for row in valuations]
+    state_key = symmetric_state_key(ordered) if symmetry else exact_state_key
+
+    # שלב 0: בעיית ה-max-min, עם המנוע והחסם החזקים ביותר
+    allocation = egalitarian_allocation(ordered, engine="dfs", bound="subset", warm_start="greedy",
+                                        symmetry=symmetry)
+    assignment = [0] * num_items
+    for player, items in enumerate(allocation):
+        for item in items:
+            assignment[item] = player
+    levels = [min(allocation_values(ordered, assignment))]
+
+    min_bound = make_bound(ordered, "subset")
+    for k in range(1, num_players):
+        assignment, value = _level_search(ordered, k, levels, assignment, state_key, min_bound)
+        levels.append(value)
+
+    result = [[] for _ in range(num_players)]
+    for item, player in enumerate(assignment):
+        result[player].append(order[item])
+    return [sorted(items) for items in result]
+
+
+def _level_search(valuations: List[List[int]], k: int, levels: List[int], incumbent: List[int], state_key,
+                  min_bound) -> Tuple[List[int], int]:
+    """
+    שלב k: חיפוש לעומק שממקסם את sorted(sums)[k] בתנאי sorted(sums)[t] >= levels[t] לכל t < k.
+    incumbent עומד בתנאים. מחזיר (assignment, הערך ה-k בגודלו שלו).
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+    # suffix[i][j] = סכום הערכים של שחקן i לחפצים j..num_items-1
+    suffix = []
+    for row in valuations:
+        table = [0] * (num_items + 1)
+        for j in range(num_items - 1, -1, -1):
+            table[j] = table[j + 1] + row[j]
+        suffix.append(table)
+    cap = sorted(table[0] for table in suffix)[k]
+
+    best_assignment = list(incumbent)
+    best_value = sorted(allocation_values(valuations, incumbent))[k]
+    if best_value >= cap:
+        return best_assignment, best_value
+
+    def feasible(sums: Tuple[int, ...], index: int) -> Optional[int]:
+        # מחזיר את החסם על המטרה, או None אם אין השלמה שעומדת בתנאים או שמשפרת את best_value
+        optimistic = sorted(min(sums[i] + suffix[i][index], cap) for i in range(num_players))
+        if optimistic[k] <= best_value:
+            return None
+        for t in range(k):
+            if optimistic[t] < levels[t]:
+                return None
+        if min_bound(sums, index) < levels[0]:
+            return None
+        return optimistic[k]
+
+    visited = set()
+    assignment = [0] * num_items
+    stack: List[Tuple[Tuple[int, ...], int, int]] = [((0,) * num_players, 0, -1)]
+    while stack:
+        current_sums, current_index, player = stack.pop()
+        if current_index > 0:
+            assignment[current_index - 1] = player
+        if current_index == num_items:
+            # הסכומים נחתכים ב-cap, אבל המטרה לא עולה עליו, ולכן הערך כאן הוא הערך האמיתי
+            value = sorted(current_sums)[k]
+            if value > best_value and feasible(current_sums, current_index) is not None:
+                best_value = value
+                best_assignment = list(assignment)
+                if best_value >= cap:
+                    break
+            continue
+
+        children = []
+        for i in range(num_players):
+            new_sums = list(current_sums)
+            new_sums[i] = min(new_sums[i] + valuations[i][current_index], cap)
+            new_sums = tuple(new_sums)
+            key = state_key(new_sums, current_index + 1)
+            if key in visited:
+                continue
+            visited.add(key)
+            bound = feasible(new_sums, current_index + 1)
+            if bound is not None:
+                children.append((bound, i, new_sums))
+        # הילד עם החסם הגבוה ביותר נשלף ראשון
+        children.sort(key=lambda child: child[0])
+        for _, i, new_sums in children:
+            stack.append((new_sums, current_index + 1, i))
+
+    return best_assignment, best_value
@@ -1,47 +1,659 @@
+import heapq
+from array import array
 from collections import deque
-from typing import List
+from itertools import combinations, count
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
 
-def egalitarian_allocation(valuations: List[List[int]]) -> List[List[int]]:
+from anytime import ANYTIME_ENGINES, SearchBudget, SearchResult
+from approximation import (ApproximateResult, bucket_key, buckets_can_merge, certified_upper_bound, dominance_index,
+                           split_epsilon)
+from binary_search import binary_search_assignment
+from dominance import DominanceIndex
+from item_order import resolve_item_order
+from stats import PRUNING_RULES, STATS_ENGINES, SearchStats
+from value_matrix import as_rows, float_slack, matrix_kind
+from warm_start import allocation_values, resolve_warm_start
+
+# רק לרמזי טיפוס: ככה ייבוא של המודול לא טוען את hashlib
+if TYPE_CHECKING:
+    from transposition import TranspositionTable
+
+ENGINES = ("bfs", "dfs", "best_first", "vectorized", "binary_search")
+BOUNDS = ("optimistic", "subset")
+# מעל מספר שחקנים זה חסם "subset" משתמש רק ביחידים, בזוגות ובקבוצת כל השחקנים
+MAX_SUBSET_PLAYERS = 6
+
+
+def exact_state_key(sums: List[int], index: int) -> Tuple[int, ...]:
+    """
+    מפתח מצב לכלל גיזום א: וקטור הסכומים המדויק + אינדקס החפץ הבא.
+    """
+    return tuple(sums) + (index,)
+
+
+def player_classes(valuations: List[List[int]]) -> List[List[int]]:
+    """
+    מחלק את השחקנים למחלקות שקילות לפי שורת הערכים שלהם – שחקנים באותה מחלקה מעריכים
+    כל חפץ בדיוק באותו ערך.
+
+    >>> player_classes([[1, 2], [3, 4], [1, 2]])
+    [[0, 2], [1]]
+    """
+    classes = {}
+    for player, row in enumerate(valuations):
+        classes.setdefault(tuple(row), []).append(player)
+    return list(classes.values())
+
+
+def symmetric_state_key(valuations: List[List[int]]) -> Callable[[List[int], int], tuple]:
+    """
+    מפתח מצב לגיזום סימטריה: בתוך כל מחלקה של שחקנים זהים (ראו player_classes) הסכומים
+    ממוינים, כך שמצבים שנבדלים רק בהחלפת שחקנים זהים נחשבים אותו מצב.
+    בין שחקנים שונים לא ממיינים – החלפת הסכומים שלהם משנה את המצב.
+    שורות פרופורציונליות לא מאוחדות: החלפת סלים בין v ל-c*v לא שומרת על הסכומים.
+
+    >>> key = symmetric_state_key([[1, 2], [3, 4], [1, 2]])
+    >>> key([5, 0, 1], 2) == key([1, 0, 5], 2)
+    True
+    >>> key([5, 0, 1], 2) == key([0, 5, 1], 2)
+    False
+    """
+    classes = [members for members in player_classes(valuations) if len(members) > 1]
+    if not classes:
+        return exact_state_key
+    return _ClassSortedKey(classes)
+
+
+class _ClassSortedKey:
+    """
+    המפתח של symmetric_state_key. מחלקה (ולא פונקציה פנימית) כדי שאפשר יהיה להעביר
+    אותו לתהליכי עבודה במצב המקבילי.
+    """
+
+    def __init__(self, classes: List[List[int]]):
+        self.classes = classes
+
+    def __call__(self, sums: List[int], index: int) -> Tuple[int, ...]:
+        canonical = list(sums)
+        for members in self.classes:
+            for player, value in zip(members, sorted(sums[i] for i in members)):
+                canonical[player] = value
+        return tuple(canonical) + (index,)
+
+
+def egalitarian_allocation(valuations: List[List[int]], engine: str = "bfs",
+                           bound: str = "optimistic", symmetry: bool = False,
+                           warm_start=None, item_order=None, dominance: bool = False,
+                           transposition_table: Optional["TranspositionTable"] = None,
+                           workers: int = 1, epsilon: Optional[float] = None,
+                           rounding: str = "linear", time_limit: Optional[float] = None,
+                           max_nodes: Optional[int] = None, stats: Optional[SearchStats] = None,
+                           pruning: Optional[str] = None, leximin: bool = False) -> List[List[int]]:
     """
     מחשב הקצאה אגליטרית של חפצים לשחקנים.
     המטרה היא למקסם את הערך המינימלי ששחקן כלשהו מקבל (Egalitarian Allocation).
+    זו נקודת הכניסה לכל הגרסאות: pruning בוחר את כללי הגיזום ו-engine את סדר הסריקה.
+
+    pruning הוא מחרוזת של כללי גיזום לפי השמות ב-README (ראו pruning_flags): "AB" (המקורי),
+    "ABC" (סכומים ממוינים, כמו main_5_3.py), "ABD" (שליטה) או "ABCD". כשהוא נתון הוא קובע
+    את symmetry ואת dominance.
+
+    engine בוחר את סדר הסריקה של עץ ההחלטות:
+    - "bfs": סריקה לרוחב (המקורית).
+    - "dfs": סריקה לעומק – מוצאת הקצאה מלאה כבר אחרי num_items צעדים, כך שגיזום ב
+      פועל כמעט מההתחלה, והמחסנית מחזיקה O(players * items) מצבים בלבד.
+    - "best_first": תמיד מרחיבה את המצב עם החסם האופטימי הגבוה ביותר.
+    - "vectorized": סריקה לרוחב שכבה אחר שכבה עם NumPy – כל החזית היא מערך
+      (n_states, num_players) (ראו vectorized.py). מאחד רק מצבים זהים בדיוק,
+      ולא משתמש ב-symmetry, dominance ו-transposition_table.
+    - "binary_search": חיפוש בינארי על הערך המינימלי T, כשלכל T רק בודקים אם כל שחקן
+      יכול לקבל לפחות T (ראו binary_search.py). symmetry, dominance ו-transposition_table
+      חלים על בדיקת ה-T. בשוויון בערך המינימלי ההקצאה יכולה להיות שונה משל שאר המנועים.
+
+    bound בוחר את החסם של גיזום ב (ראו make_bound):
+    - "optimistic": כל שחקן מקבל את כל מה שנשאר (המקורי).
+    - "subset": חסם הדוק יותר שמתחשב בכך שכל חפץ הולך לשחקן אחד בלבד.
+
+    symmetry=True מאחד מצבים שנבדלים רק בהחלפת שחקנים עם שורת ערכים זהה
+    (ראו symmetric_state_key).
+
+    warm_start מחשב הקצאה התחלתית זולה לפני החיפוש ומשתמש בה כפתרון הטוב ביותר הראשוני,
+    כך שגיזום ב עובד כבר מהצומת הראשון. אפשר לתת שם ("round_robin", "greedy",
+    "local_search" – ראו warm_start.py) או פונקציה valuations -> assignment[item] = player.
+    התוצאה נשארת מדויקת: החיפוש מחליף את ההקצאה ההתחלתית בכל הקצאה טובה יותר.
+
+    item_order קובע באיזה סדר החיפוש מחליט על החפצים: "max_value", "variance",
+    "contention" (ראו item_order.py) או פונקציה valuations -> רשימת אינדקסי חפצים.
+    ההקצאה המוחזרת תמיד משתמשת באינדקסים המקוריים.
+
+    dominance=True מפעיל את כלל גיזום ד: מצב שבאותו אינדקס חפץ כל הסכומים שלו קטנים או
+    שווים לאלה של מצב שכבר נשמר – נזרק (ראו dominance.py). זה הגיזום שעובד גם כשהערכים
+    גדולים וכמעט אין מצבים זהים בדיוק. הוא משתלם כשיש פתרון לגזום מולו (dfs, best_first, או
+    warm_start): ילד שנגזם בחסם לא נכנס לאינדקס. בחיפוש לרוחב בלי warm_start עם 3 שחקנים
+    או יותר אין פתרון עד השכבה האחרונה, והאינדקס עולה יותר ממה שהוא חוסך.
+
+    transposition_table מחליף את קבוצת visited של גיזום א בטבלה עם תקרת זיכרון
+    (ראו transposition.py). אחרי הריצה table.stats() מחזיר מוני פגיעות, החטאות ופינויים.
+
+    workers > 1 (רק עם engine="dfs") מפצל את העץ לפי ההקצאות של החפצים הראשונים לתתי-בעיות
+    שרצות ב-ProcessPoolExecutor. כל התהליכים חולקים את הערך המינימלי הטוב ביותר שנמצא
+    בזיכרון משותף, כך שכל אחד גוזם לפי הפתרון הגלובלי (ראו parallel.py). לכל תת-בעיה יש
+    visited משלה בלי תקרה, ולכן transposition_table לא נתמך עם workers > 1.
+
+    epsilon מפעיל מצב קירוב: הערך המינימלי של ההקצאה המוחזרת הוא לפחות (1-epsilon) מהאופטימום
+    (ראו approximate_egalitarian_allocation, שמחזירה גם את הערך וחסם עליון מוכח).
+    rounding בוחר דליים "linear" או "geometric". הכי מהיר עם engine="dfs", bound="subset"
+    ו-dominance=True (ראו README).
+
+    time_limit (שניות) ו-max_nodes עוצרים את החיפוש ומחזירים את ההקצאה הטובה ביותר שנמצאה עד אז
+    (ראו anytime_egalitarian_allocation, שמחזירה גם חסם עליון מוכח ואם הוכחה אופטימליות).
+    בלי warm_start החיפוש עלול להיעצר לפני ההקצאה המלאה הראשונה, ואז מוחזר None.
+
+    leximin=True מחזירה הקצאה לקסימין-אופטימלית: בשוויון בערך המינימלי ממקסמים את הערך השני
+    הכי קטן, וכן הלאה (ראו leximin.py). רק symmetry ו-item_order חלים עליה: המנוע והחסם נבחרים
+    בתוך leximin.py (engine ו-bound רק נבדקים), וכל אפשרות אחרת זורקת ValueError.
+
+    stats=SearchStats() אוסף מוני חיפוש: צמתים, ילדים, גיזומים לפי כלל, גודל מקסימלי של החזית
+    ושל visited, זמן עד הפתרון הראשון ומספר השיפורים (ראו stats.py). בלי stats אין ספירה בכלל.
+
+    >>> egalitarian_allocation([[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]], engine="dfs")
+    [[2, 3, 4], [0, 1]]
+    >>> egalitarian_allocation([[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]], engine="dfs", item_order="variance")
+    [[3, 4], [0, 1, 2]]
+    >>> egalitarian_allocation([[3, 4, 0], [3, 1, 3]], pruning="ABC", engine="dfs")
+    [[1], [0, 2]]
+    """
+    valuations = as_rows(valuations)
+    if pruning is not None:
+        symmetry, dominance = pruning_flags(pruning)
+    if leximin:
+        _check_leximin_options(engine, bound, warm_start, dominance, transposition_table, workers, epsilon,
+                               time_limit, max_nodes, stats)
+        from leximin import leximin_allocation
+        return leximin_allocation(valuations, symmetry=symmetry, item_order=item_order)
+    if epsilon is not None:
+        return approximate_egalitarian_allocation(valuations, epsilon, rounding, engine=engine, bound=bound,
+                                                  symmetry=symmetry, warm_start=warm_start, item_order=item_order,
+                                                  dominance=dominance, transposition_table=transposition_table,
+                                                  workers=workers, stats=stats).allocation
+    if time_limit is not None or max_nodes is not None:
+        return anytime_egalitarian_allocation(valuations, time_limit, max_nodes, engine=engine, bound=bound,
+                                              symmetry=symmetry, warm_start=warm_start, item_order=item_order,
+                                              dominance=dominance, transposition_table=transposition_table,
+                                              workers=workers, stats=stats).allocation
+    state_key = symmetric_state_key(valuations) if symmetry else exact_state_key
+    return run_search(valuations, engine=engine, state_key=state_key, bound=bound, warm_start=warm_start,
+                      item_order=item_order, dominance=dominance, transposition_table=transposition_table,
+                      workers=workers, stats=stats)
+
+
+def _check_leximin_options(engine: str, bound: str, warm_start, dominance: bool,
+                           transposition_table: Optional["TranspositionTable"], workers: int,
+                           epsilon: Optional[float], time_limit: Optional[float], max_nodes: Optional[int],
+                           stats: Optional[SearchStats]) -> None:
+    """
+    בודק את האפשרויות של egalitarian_allocation עם leximin=True, כמו הבדיקות של run_search.
+
+    >>> _check_leximin_options("dfs", "subset", None, False, None, 1, None, None, None, None)
+    >>> _check_leximin_options("nonsense", "optimistic", None, False, None, 1, None, None, None, None)
+    Traceback (most recent call last):
+    ...
+    ValueError: Unknown engine 'nonsense', expected one of ('bfs', 'dfs', 'best_first', 'vectorized', 'binary_search')
+    >>> _check_leximin_options("bfs", "optimistic", "greedy", True, None, 2, None, 1.0, None, None)
+    Traceback (most recent call last):
+    ...
+    ValueError: leximin=True supports only symmetry and item_order, got warm_start, dominance, workers, time_limit
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+    if bound not in BOUNDS:
+        raise ValueError(f"Unknown bound {bound!r}, expected one of {BOUNDS}")
+    options = (("warm_start", warm_start is not None), ("dominance", dominance),
+               ("transposition_table", transposition_table is not None), ("workers", workers != 1),
+               ("epsilon", epsilon is not None), ("time_limit", time_limit is not None),
+               ("max_nodes", max_nodes is not None), ("stats", stats is not None))
+    unsupported = [name for name, given in options if given]
+    if unsupported:
+        raise ValueError(f"leximin=True supports only symmetry and item_order, got {', '.join(unsupported)}")
+
+
+def pruning_flags(pruning: str) -> Tuple[bool, bool]:
+    """
+    ממיר מחרוזת של כללי גיזום ל-(symmetry, dominance). גיזום א (visited) וגיזום ב (חסם)
+    פועלים בכל המנועים, ולכן הם חייבים להופיע; ג מפעיל symmetry ו-ד מפעיל dominance.
+
+    >>> pruning_flags("AB"), pruning_flags("abcd")
+    ((False, False), (True, True))
+    >>> pruning_flags("AD")
+    Traceback (most recent call last):
+    ...
+    ValueError: Pruning rules A and B are always applied, got 'AD'
+    """
+    rules = set(pruning.upper())
+    unknown = rules - set(PRUNING_RULES)
+    if unknown:
+        raise ValueError(f"Unknown pruning rules {sorted(unknown)}, expected letters from {PRUNING_RULES}")
+    if not {"A", "B"} <= rules:
+        raise ValueError(f"Pruning rules A and B are always applied, got {pruning!r}")
+    return "C" in rules, "D" in rules
+
+
+def approximate_egalitarian_allocation(valuations: List[List[int]], epsilon: float = 0.01, rounding: str = "linear",
+                                       engine: str = "best_first", bound: str = "subset", symmetry: bool = False,
+                                       warm_start=None, item_order=None, dominance: bool = False,
+                                       transposition_table: Optional["TranspositionTable"] = None,
+                                       workers: int = 1, stats: Optional[SearchStats] = None) -> ApproximateResult:
     """
+    מצב קירוב (1-epsilon) לערכים גדולים. התקציב מתחלק לשניים (ראו split_epsilon):
+    - כלל גיזום א מאחד מצבים שהסכומים שלהם באותם דליים, לינאריים ("linear") או
+      גאומטריים ("geometric") – ראו approximation.py. מספר המצבים בכל שכבה פולינומי
+      ב-num_items וב-1/epsilon, בלי קשר לגודל הערכים.
+    - כלל גיזום ב גוזם כל מצב שלא יכול לשפר את הפתרון הטוב ביותר ביותר מפקטור קבוע (scale_bound).
+    עם dominance=True גם כלל השליטה עובד על הדליים – משתלם בעיקר כשיש הרבה שחקנים.
+    כשיש יותר וקטורי דליים מהקצאות מלאות (ראו buckets_can_merge) הדליים כמעט לא מאחדים מצבים,
+    ואז החיפוש לא מעגל בכלל וכל התקציב הולך לגיזום ב (prune_scale = 1-epsilon).
+
+    רוחב הדליים הלינאריים נקבע לפי ערך של הקצאה התחלתית, ולכן warm_start תמיד מופעל
+    (ברירת המחדל "greedy"). גיזום ב המוגמש עובד הכי טוב עם חסם "subset" ומנוע שמשפר את
+    הפתרון תוך כדי ("best_first" או "dfs") – אלה ברירות המחדל כאן.
+
+    מחזיר ApproximateResult(allocation, value, upper_bound): value הוא הערך המינימלי האמיתי
+    של allocation, ו-upper_bound חסם עליון מוכח על האופטימום, עם value >= (1-epsilon) * upper_bound.
+
+    >>> result = approximate_egalitarian_allocation([[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]], 0.1)
+    >>> result.value, round(result.upper_bound, 2)
+    (15, 16.67)
+    >>> vals = [[2 ** 32 - 7 * j for j in range(6)], [2 ** 31 + 5 * j for j in range(6)]]
+    >>> result = approximate_egalitarian_allocation(vals, 0.01, "geometric")
+    >>> result.value >= 0.99 * result.upper_bound
+    True
+    """
+    if engine in ("vectorized", "binary_search"):
+        raise ValueError(f"epsilon is not supported with engine={engine!r}")
+    valuations = as_rows(valuations)
+    warm_start = "greedy" if warm_start is None else warm_start
     num_players = len(valuations)
     num_items = len(valuations[0])
-    best_allocation = None
-    best_min_value = float('-inf')
-    best_sums = None
+    lower_bound = min(allocation_values(valuations, list(resolve_warm_start(warm_start)(valuations))))
+    cap = make_bound(valuations, bound)((0,) * num_players, 0)
+    base_key = symmetric_state_key(valuations) if symmetry else exact_state_key
+    rounding_epsilon, prune_scale = split_epsilon(epsilon)
+    key = bucket_key(base_key, valuations, rounding_epsilon, rounding, lower_bound, cap)
+    if key is not None and not buckets_can_merge(key, valuations):
+        key, prune_scale = None, 1 - epsilon
+
+    allocation = run_search(valuations, engine=engine, state_key=key or base_key, bound=bound,
+                            warm_start=warm_start, item_order=item_order, dominance=dominance,
+                            transposition_table=transposition_table, workers=workers, bound_scale=prune_scale,
+                            stats=stats)
+    value = min(sum(valuations[i][j] for j in items) for i, items in enumerate(allocation))
+    return ApproximateResult(allocation, value,
+                             certified_upper_bound(key, value, num_items, cap, prune_scale, epsilon))
+
+
+def anytime_egalitarian_allocation(valuations: List[List[int]], time_limit: Optional[float] = None,
+                                   max_nodes: Optional[int] = None,
+                                   progress: Optional[Callable[[SearchResult], None]] = None,
+                                   engine: str = "dfs", bound: str = "subset", symmetry: bool = False,
+                                   warm_start="greedy", item_order=None, dominance: bool = False,
+                                   transposition_table: Optional["TranspositionTable"] = None,
+                                   workers: int = 1, stats: Optional[SearchStats] = None) -> SearchResult:
+    """
+    חיפוש עם תקציב: נעצר אחרי time_limit שניות או max_nodes צמתים (מה שבא קודם; None – בלי הגבלה)
+    ומחזיר SearchResult(allocation, value, upper_bound, optimal):
+    - allocation ו-value: ההקצאה הטובה ביותר שנמצאה והערך המינימלי שלה.
+    - upper_bound: חסם עליון מוכח על האופטימום – החסם של גיזום ב על החזית שנשארה (ראו anytime.py).
+    - optimal: האם החיפוש הוכיח ש-value הוא האופטימום.
+    progress(result) נקרא עם SearchResult בכל פעם שנמצאת הקצאה טובה יותר.
+
+    רק המנועים "bfs", "dfs" ו-"best_first" בודקים את התקציב. ברירות המחדל מתאימות לזמן תגובה
+    חסום: warm_start="greedy" נותן הקצאה כבר לפני הצומת הראשון, "dfs" משפר אותה מהר,
+    ו-"subset" נותן חסם עליון הדוק. התקציב נבדק רק בחיפוש הטורי, ולכן workers > 1 זורק ValueError.
+
+    >>> vals = [[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]]
+    >>> anytime_egalitarian_allocation(vals, max_nodes=0)
+    SearchResult(allocation=[[2, 3, 4], [0, 1]], value=15, upper_bound=18, optimal=False)
+    >>> anytime_egalitarian_allocation(vals, max_nodes=100).optimal
+    True
+    >>> anytime_egalitarian_allocation(vals, engine="vectorized", max_nodes=100)
+    Traceback (most recent call last):
+        ...
+    ValueError: time_limit and max_nodes are supported only with engine in ('bfs', 'dfs', 'best_first') and workers=1, got engine='vectorized', workers=1
+    >>> egalitarian_allocation(vals, engine="dfs", workers=4, time_limit=1)
+    Traceback (most recent call last):
+        ...
+    ValueError: time_limit and max_nodes are supported only with engine in ('bfs', 'dfs', 'best_first') and workers=1, got engine='dfs', workers=4
+    """
+    valuations = as_rows(valuations)
+    budget = SearchBudget(time_limit, max_nodes, progress)
+    state_key = symmetric_state_key(valuations) if symmetry else exact_state_key
+    allocation = run_search(valuations, engine=engine, state_key=state_key, bound=bound, warm_start=warm_start,
+                            item_order=item_order, dominance=dominance, transposition_table=transposition_table,
+                            workers=workers, budget=budget, stats=stats)
+    value = None if allocation is None else min(
+        sum(valuations[i][j] for j in items) for i, items in enumerate(allocation))
+    if not budget.stopped:
+        return SearchResult(allocation, value, value, True)
+    upper_bound = budget.frontier_bound if value is None else max(value, budget.frontier_bound)
+    return SearchResult(allocation, value, upper_bound, value is not None and upper_bound <= value)
+
+
+def run_search(valuations: List[List[int]], engine: str = "bfs",
+               state_key: Callable[[List[int], int], tuple] = exact_state_key,
+               bound: str = "optimistic", warm_start=None, item_order=None,
+               dominance: bool = False,
+               transposition_table: Optional["TranspositionTable"] = None,
+               workers: int = 1, bound_scale: float = 1,
+               budget: Optional[SearchBudget] = None,
+               stats: Optional[SearchStats] = None) -> List[List[int]]:
+    """
+    מריץ את מנוע החיפוש שנבחר. state_key קובע אילו מצבים נחשבים זהים לכלל גיזום א.
+    bound_scale < 1 מכפיל את החסם של גיזום ב (ראו scale_bound) – רק במצב קירוב.
+    budget מגביל זמן ומספר צמתים (ראו anytime_egalitarian_allocation).
+    stats מקבל את מוני החיפוש (ראו stats.py). מצבים שנגזמים כי state_key שלהם כבר ב-visited
+    נספרים כגיזום א, או כגיזום ג כשהמפתח הוא של symmetric_state_key.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+    valuations = as_rows(valuations)
+    if workers > 1 and engine != "dfs":
+        raise ValueError(f"workers > 1 is supported only with engine='dfs', got {engine!r}")
+    if workers > 1 and transposition_table is not None:
+        # כל תהליך מחזיק visited משלו, והטבלה (עם תקרת הזיכרון שלה) לא עוברת אליהם
+        raise ValueError(f"transposition_table is supported only with workers=1, got workers={workers}")
+    if budget is not None and (engine not in ANYTIME_ENGINES or workers > 1):
+        raise ValueError(f"time_limit and max_nodes are supported only with engine in {ANYTIME_ENGINES} "
+                         f"and workers=1, got engine={engine!r}, workers={workers}")
+    if stats is not None:
+        if engine not in STATS_ENGINES or workers > 1:
+            raise ValueError(f"stats are supported only with engine in {STATS_ENGINES} "
+                             f"and workers=1, got engine={engine!r}, workers={workers}")
+        stats.start()
+        stats.visited_rule = "C" if isinstance(state_key, _ClassSortedKey) else "A"
+    if item_order is None:
+        allocation = _run_engine(valuations, engine, state_key, bound, warm_start, dominance, transposition_table,
+                                 workers, bound_scale, budget, stats)
+        if stats is not None:
+            stats.finish()
+        return allocation
+
+    num_items = len(valuations[0])
+    order = list(resolve_item_order(item_order)(valuations))
+    if sorted(order) != list(range(num_items)):
+        raise ValueError(f"Item order must be a permutation of range({num_items}), got {order}")
+    # החיפוש רץ על העמודות בסדר החדש: עמודה k במטריצה המסודרת היא החפץ order[k]
+    reordered = [[row[j] for j in order] for row in valuations]
+    if budget is not None:
+        budget.order = order
+    allocation = _run_engine(reordered, engine, state_key, bound, warm_start, dominance, transposition_table,
+                             workers, bound_scale, budget, stats)
+    if stats is not None:
+        stats.finish()
+    if allocation is None:
+        return None
+    return [sorted(order[k] for k in items) for items in allocation]
+
+
+def _run_engine(valuations: List[List[int]], engine: str, state_key, bound: str, warm_start, dominance: bool,
+                transposition_table: Optional["TranspositionTable"], workers: int = 1, bound_scale: float = 1,
+                budget: Optional[SearchBudget] = None, stats: Optional[SearchStats] = None):
+    bound_fn = scale_bound(make_bound(valuations, bound), bound_scale)
+    incumbent = None if warm_start is None else list(resolve_warm_start(warm_start)(valuations))
+    if stats is not None and incumbent is not None:
+        stats.incumbent(improvement=False)
+    if workers > 1:
+        from parallel import parallel_search
+        return parallel_search(valuations, state_key, bound, incumbent, dominance, workers, bound_scale)
+    index = dominance_index(len(valuations), state_key) if dominance else None
+    if transposition_table is None:
+        visited = set()
+    else:
+        transposition_table.clear(num_items=len(valuations[0]))
+        visited = transposition_table
+    if engine == "vectorized" and matrix_kind(valuations) != "exact":
+        return _vectorized_search(valuations, bound, incumbent, stats)
+    if engine == "binary_search":
+        assignment = binary_search_assignment(valuations, bound_tables(valuations, bound), state_key, incumbent,
+                                              dominance, visited)
+        return _rebuild_allocation(assignment, len(valuations))
+    # "vectorized" מגיע לכאן רק כשהערכים לא נכנסים ב-int64/float64 – אותו חיפוש לרוחב, בחשבון מדויק
+    if engine in ("bfs", "vectorized"):
+        return _breadth_first_search(valuations, state_key, bound_fn, incumbent, index, visited, budget, stats)
+    if engine == "dfs":
+        return _depth_first_search(valuations, state_key, bound_fn, incumbent, index, visited, budget=budget,
+                                   stats=stats)
+    return _best_first_search(valuations, state_key, bound_fn, incumbent, index, visited, budget, stats)
+
+
+def make_bound(valuations: List[List[int]], bound: str = "optimistic") -> Callable[[tuple, int], float]:
+    """
+    בונה פעם אחת לכל קריאה את פונקציית החסם העליון bound_fn(current_sums, current_index)
+    על הערך המינימלי שאפשר עוד להשיג מהמצב.
+
+    "optimistic": min_i (sums[i] + suffix[i][k]), כאשר suffix[i][k] הוא סכום הערכים של
+    שחקן i לחפצים k..num_items-1. הטבלה מחושבת מראש, כך שכל בדיקה עולה O(players).
+
+    "subset": לכל קבוצת שחקנים S, המינימום לא גדול מהממוצע שלהם, וכל חפץ שנותר יכול
+    להוסיף לסכום של S לכל היותר את הערך הגבוה ביותר שמישהו ב-S נותן לו:
+        min <= (sum_{i in S} sums[i] + sum_{j >= k} max_{i in S} v[i][j]) / |S|
+    קבוצות של שחקן יחיד נותנות בדיוק את "optimistic", ולכן החסם הזה תמיד הדוק לפחות כמוהו.
+    עבור ערכים שלמים מעגלים כלפי מטה. לערכים שאינם שלמים החסם מוגדל ב-float_slack
+    (ראו value_matrix.py), כדי ששגיאת עיגול לא תגזום את הענף האופטימלי.
+
+    >>> optimistic = make_bound([[5, 5], [5, 5]], "optimistic")
+    >>> optimistic((0, 0), 0)
+    10
+    >>> subset = make_bound([[5, 5], [5, 5]], "subset")
+    >>> subset((0, 0), 0)
+    5
+    """
+    tables = bound_tables(valuations, bound)
+    slack = float_slack(valuations)
+
+    if bound == "optimistic":
+        def optimistic_bound(current_sums, current_index: int):
+            return min(current_sums[group[0]] + suffix[current_index] for group, suffix in tables)
+        return _with_slack(optimistic_bound, slack)
+
+    integral = all(isinstance(value, int) for row in valuations for value in row)
+
+    def subset_bound(current_sums, current_index: int):
+        best = None
+        for group, suffix in tables:
+            total = suffix[current_index]
+            for i in group:
+                total += current_sums[i]
+            value = total // len(group) if integral else total / len(group)
+            if best is None or value < best:
+                best = value
+        return best
+    return _with_slack(subset_bound, slack)
+
+
+def _with_slack(bound_fn: Callable[[tuple, int], float], slack: float) -> Callable[[tuple, int], float]:
+    """
+    מוסיף slack לחסם (ראו value_matrix.float_slack). בלי slack מחזיר את החסם עצמו, בלי עלות.
+    """
+    if not slack:
+        return bound_fn
+
+    def slack_bound(current_sums, current_index: int):
+        return bound_fn(current_sums, current_index) + slack
+    return slack_bound
+
+
+def scale_bound(bound_fn: Callable[[tuple, int], float], scale: float = 1) -> Callable[[tuple, int], float]:
+    """
+    מכפיל את החסם ב-scale. עם scale = 1-ε מצב נגזם כשגם שיפור של פקטור 1/(1-ε) על
+    הפתרון הטוב ביותר לא אפשרי ממנו – גיזום ב של קירוב, לא מדויק.
+
+    >>> scale_bound(lambda sums, index: 10, 0.5)((0, 0), 0)
+    5.0
+    """
+    if scale == 1:
+        return bound_fn
+
+    def scaled_bound(current_sums, current_index: int):
+        return bound_fn(current_sums, current_index) * scale
+    return scaled_bound
+
+
+def bound_tables(valuations: List[List[int]], bound: str = "optimistic") -> List[Tuple[tuple, List[int]]]:
+    """
+    מחזיר את קבוצות השחקנים של החסם ולכל קבוצה את טבלת הסכומים מהסוף
+    suffix[k] = sum_{j >= k} max_{i in group} v[i][j].
+
+    >>> bound_tables([[1, 2], [3, 0]], "subset")
+    [((0,), [3, 2, 0]), ((1,), [3, 0, 0]), ((0, 1), [5, 2, 0])]
+    """
+    if bound not in BOUNDS:
+        raise ValueError(f"Unknown bound {bound!r}, expected one of {BOUNDS}")
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+
+    if bound == "optimistic":
+        groups = [(i,) for i in range(num_players)]
+    elif num_players <= MAX_SUBSET_PLAYERS:
+        groups = [group for size in range(1, num_players + 1) for group in combinations(range(num_players), size)]
+    else:
+        groups = [(i,) for i in range(num_players)] + list(combinations(range(num_players), 2))
+        groups.append(tuple(range(num_players)))
+
+    # suffix[k] = sum_{j >= k} max_{i in group} v[i][j]
+    tables = []
+    for group in groups:
+        suffix = [0] * (num_items + 1)
+        for j in range(num_items - 1, -1, -1):
+            suffix[j] = suffix[j + 1] + max(valuations[i][j] for i in group)
+        tables.append((group, suffix))
+    return tables
+
+
+def _seed_incumbent(valuations: List[List[int]], incumbent: Optional[List[int]]):
+    """
+    מחזיר (best_min_value, best_sums) התחלתיים: מההקצאה ההתחלתית אם יש, אחרת מינוס אינסוף.
+    """
+    if incumbent is None:
+        return float('-inf'), None
+    sums = tuple(allocation_values(valuations, incumbent))
+    return min(sums), sums
+
+
+def _is_better(current_sums, best_min_value, best_sums) -> bool:
+    min_val = min(current_sums)
+    return (min_val > best_min_value or
+            (min_val == best_min_value and (best_sums is None or sorted(current_sums) > sorted(best_sums))))
+
+
+def _rebuild_allocation(assignment: List[int], num_players: int) -> List[List[int]]:
+    """
+    בונה את ההקצאה (רשימת חפצים לכל שחקן) מתוך assignment[item] = player.
+    """
+    allocation = [[] for _ in range(num_players)]
+    for item, player in enumerate(assignment):
+        allocation[player].append(item)
+    return allocation
+
+
+def _assignment_from_pointers(parents: array, choices: array, node_id: int, num_items: int) -> List[int]:
+    """
+    משחזר את assignment[item] = player של צומת מתוך מצביעי ההורים:
+    parents[node] הוא מזהה ההורה, ו-choices[node] הוא השחקן שקיבל את החפץ שהוביל לצומת.
+    צומת השורש (מזהה 0) לא מייצג אף בחירה.
+
+    >>> _assignment_from_pointers(array('i', [0, 0, 1, 2]), array('i', [0, 1, 0, 1]), 3, 3)
+    [1, 0, 1]
+    """
+    assignment = [0] * num_items
+    item = num_items
+    while node_id != 0:
+        item -= 1
+        assignment[item] = choices[node_id]
+        node_id = parents[node_id]
+    return assignment
+
+
+def _vectorized_search(valuations: List[List[int]], bound: str, incumbent: Optional[List[int]],
+                       stats: Optional[SearchStats] = None):
+    # NumPy נטען רק כשמבקשים את המנוע הזה
+    from vectorized import vectorized_search
+
+    num_players = len(valuations)
+    best_min_value, best_sums = _seed_incumbent(valuations, incumbent)
+    found = vectorized_search(valuations, bound_tables(valuations, bound), best_min_value, stats)
+    if found is not None and _is_better(found[1], best_min_value, best_sums):
+        if stats is not None:
+            stats.incumbent()
+        return _rebuild_allocation(found[0], num_players)
+    if incumbent is None:
+        return None
+    return _rebuild_allocation(incumbent, num_players)
+
+
+def _breadth_first_search(valuations: List[List[int]], state_key, bound_fn,
+                          incumbent: Optional[List[int]] = None,
+                          dominance: Optional[DominanceIndex] = None, visited=None,
+                          budget: Optional[SearchBudget] = None,
+                          stats: Optional[SearchStats] = None) -> Optional[List[List[int]]]:
+    """
+    חיפוש לרוחב. במקום להעתיק את ההקצאה לכל מצב, כל צומת שומר רק מצביע להורה
+    ואת השחקן שנבחר (במערכים parents/choices), וההקצאה הזוכה משוחזרת פעם אחת בסוף.
+    budget (ראו anytime.py) עוצר את החיפוש כשנגמר הזמן או מספר הצמתים.
+    stats (ראו stats.py) סופר צמתים וגיזומים.
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+    best_node = None
+    best_assignment = incumbent
+    best_min_value, best_sums = _seed_incumbent(valuations, incumbent)
     initial_state = (0,) * num_players + (0,)
+    parents = array('i', [0])
+    choices = array('i', [0])
     queue = deque()
-    queue.append((initial_state, [[] for _ in range(num_players)]))
-    visited = set()
-    visited.add(initial_state)
+    queue.append((initial_state, 0))
+    last_index = 0
+    # visited: קבוצה רגילה, או TranspositionTable עם תקרת זיכרון
+    visited = set() if visited is None else visited
+    visited.add(state_key(initial_state[:num_players], 0))
+
+    def frontier_bound():
+        return max((bound_fn(state[:num_players], state[num_players]) for state, _ in queue), default=float('-inf'))
 
     while queue:
-        state, allocation = queue.popleft()
+        if budget is not None and budget.exhausted():
+            break
+        state, node_id = queue.popleft()
         current_sums = state[:num_players]
         current_index = state[num_players]
+        if dominance is not None and current_index > last_index:
+            # השכבה הקודמת לא תקבל יותר מצבים חדשים
+            dominance.forget_below(current_index + 1)
+            last_index = current_index
 
         if current_index == num_items:
-            min_val = min(current_sums)
-            if (min_val > best_min_value or
-                (min_val == best_min_value and (best_sums is None or sorted(current_sums) > sorted(best_sums)))):
-                best_min_value = min_val
-                best_allocation = allocation
+            if _is_better(current_sums, best_min_value, best_sums):
+                best_min_value = min(current_sums)
+                best_node = node_id
                 best_sums = current_sums
+                if stats is not None:
+                    stats.incumbent()
+                if budget is not None:
+                    budget.improved(best_min_value)
+                    if budget.progress is not None:
+                        budget.report(_assignment_from_pointers(parents, choices, node_id, num_items), current_sums,
+                                      frontier_bound)
             continue
 
         # --- כלל גיזום ב (חסם אופטימי):
         # אם אפילו בתרחיש הכי טוב, הערך המינימלי שנוכל להגיע אליו לא עובר את המקסימום שכבר ראינו – נפסיק.
-        pessimistic_bound = best_min_value
-        optimistic_values = [
-            current_sums[i] + sum(valuations[i][j] for j in range(current_index, num_items))
-            for i in range(num_players)
-        ]
-        optimistic_bound = min(optimistic_values)
-        if optimistic_bound < pessimistic_bound:
+        if bound_fn(current_sums, current_index) < best_min_value:
+            if stats is not None:
+                stats.pruned["B"] += 1
             continue
 
+        if stats is not None:
+            stats.nodes_expanded += 1
+            stats.children_generated += num_players
         for i in range(num_players):
             new_sums = list(current_sums)
             new_sums[i] += valuations[i][current_index]
@@ -49,17 +661,278 @@ def egalitarian_allocation(valuations: List[List[int]]) -> List[List[int]]:
 
             # --- כלל גיזום א (מצבים שכבר ביקרנו בהם):
             # אם כבר ראינו את המצב הזה בדיוק – אין טעם להמשיך איתו שוב.
-            if new_state in visited:
+            key = state_key(new_sums, current_index + 1)
+            if key in visited:
+                if stats is not None:
+                    stats.pruned[stats.visited_rule] += 1
                 continue
-            visited.add(new_state)
+            visited.add(key)
+
+            # --- כלל גיזום ד (שליטה): מצב אחר באותה שכבה טוב לפחות כמו זה לכל שחקן.
+            # קודם בודקים את החסם: ילד שנגזם בגיזום ב לא נכנס לאינדקס. החסם מונוטוני בסכומים,
+            # ולכן כל מצב שהוא היה שולט בו נגזם בחסם בעצמו – ככה האינדקס קטן והבדיקות זולות.
+            if dominance is not None:
+                if bound_fn(new_sums, current_index + 1) < best_min_value:
+                    if stats is not None:
+                        stats.pruned["B"] += 1
+                    continue
+                if not dominance.add(new_sums, current_index + 1):
+                    if stats is not None:
+                        stats.pruned["D"] += 1
+                    continue
 
-            new_allocation = [list(items) for items in allocation]
-            new_allocation[i].append(current_index)
-            queue.append((new_state, new_allocation))
+            parents.append(node_id)
+            choices.append(i)
+            queue.append((new_state, len(parents) - 1))
+        if stats is not None:
+            stats.observe(len(queue), len(visited))
+
+    if budget is not None:
+        budget.finish(frontier_bound)
+    if best_node is not None:
+        best_assignment = _assignment_from_pointers(parents, choices, best_node, num_items)
+    if best_assignment is None:
+        return None
     # # הדפסה
     # for player, items in enumerate(best_allocation):
     #     value = sum(valuations[player][item] for item in items)
     #     print(f"Player {player} gets items {', '.join(map(str, items))} with value {value}")
-    return best_allocation
+    return _rebuild_allocation(best_assignment, num_players)
+
+
+def _depth_first_search(valuations: List[List[int]], state_key, bound_fn,
+                        incumbent: Optional[List[int]] = None,
+                        dominance: Optional[DominanceIndex] = None, visited=None,
+                        prefix: Optional[List[int]] = None, shared=None,
+                        budget: Optional[SearchBudget] = None,
+                        stats: Optional[SearchStats] = None) -> Optional[List[List[int]]]:
+    """
+    חיפוש לעומק עם מחסנית מפורשת.
+    כל רשומה במחסנית שומרת רק את המצב ואת השחקן שקיבל את החפץ האחרון;
+    ההקצאה של המסלול הנוכחי נשמרת במערך assignment יחיד שנדרס תוך כדי הסריקה.
+
+    prefix מגביל את החיפוש לתת-העץ שבו החפצים הראשונים כבר הוקצו (prefix[item] = player).
+    shared הוא הפתרון הטוב ביותר המשותף לכל תהליכי העבודה במצב המקבילי (ראו parallel.py):
+    קוראים ממנו את הסף לגיזום ב ומפרסמים אליו כל שיפור.
+    budget (ראו anytime.py) עוצר את החיפוש כשנגמר הזמן או מספר הצמתים.
+    stats (ראו stats.py) סופר צמתים וגיזומים.
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+    best_assignment = incumbent
+    best_min_value, best_sums = _seed_incumbent(valuations, incumbent)
+    prefix = prefix or []
+    assignment = list(prefix) + [0] * (num_items - len(prefix))
+    initial_sums = allocation_values(valuations, prefix)
+    initial_state = tuple(initial_sums) + (len(prefix),)
+    stack = [(initial_state, -1)]
+    # visited: קבוצה רגילה, או TranspositionTable עם תקרת זיכרון
+    visited = set() if visited is None else visited
+    visited.add(state_key(initial_sums, len(prefix)))
+    freed_index = len(prefix)
+
+    def frontier_bound():
+        return max((bound_fn(state[:num_players], state[num_players]) for state, _ in stack), default=float('-inf'))
+
+    while stack:
+        if budget is not None and budget.exhausted():
+            break
+        state, player = stack.pop()
+        current_sums = state[:num_players]
+        current_index = state[num_players]
+        # כל הצמתים שנסרקו בין הדחיפה לשליפה נמצאים בתת-עצים של אחים, ולכן דרסו רק
+        # את assignment[current_index - 1:] – הקידומת היא עדיין המסלול של ההורה.
+        if player >= 0:
+            assignment[current_index - 1] = player
+        if dominance is not None:
+            # ילדים עמוקים מכל מה שמתחתם במחסנית, ולכן stack[0] הוא המצב הפתוח הרדוד ביותר.
+            # מצבים חדשים נוצרים רק מתחתיו, והשכבות עד אליו כבר לא נגישות.
+            lowest = stack[0][0][num_players] if stack else current_index
+            if lowest > freed_index:
+                dominance.forget_below(lowest + 1)
+                freed_index = lowest
+
+        if current_index == num_items:
+            if _is_better(current_sums, best_min_value, best_sums):
+                best_min_value = min(current_sums)
+                best_assignment = list(assignment)
+                best_sums = current_sums
+                if shared is not None:
+                    shared.publish(best_min_value)
+                if stats is not None:
+                    stats.incumbent()
+                if budget is not None:
+                    budget.improved(best_min_value)
+                    if budget.progress is not None:
+                        budget.report(best_assignment, current_sums, frontier_bound)
+            continue
+
+        # --- כלל גיזום ב (חסם אופטימי)
+        threshold = best_min_value if shared is None else max(best_min_value, shared.value)
+        if bound_fn(current_sums, current_index) < threshold:
+            if stats is not None:
+                stats.pruned["B"] += 1
+            continue
+
+        if stats is not None:
+            stats.nodes_expanded += 1
+            stats.children_generated += num_players
+        children = []
+        for i in range(num_players):
+            new_sums = list(current_sums)
+            new_sums[i] += valuations[i][current_index]
+
+            # --- כלל גיזום א (מצבים שכבר ביקרנו בהם)
+            key = state_key(new_sums, current_index + 1)
+            if key in visited:
+                if stats is not None:
+                    stats.pruned[stats.visited_rule] += 1
+                continue
+            visited.add(key)
+
+            # --- כלל גיזום ד (שליטה), אחרי בדיקת החסם כמו בחיפוש לרוחב
+            if dominance is not None:
+                if bound_fn(new_sums, current_index + 1) < threshold:
+                    if stats is not None:
+                        stats.pruned["B"] += 1
+                    continue
+                if not dominance.add(new_sums, current_index + 1):
+                    if stats is not None:
+                        stats.pruned["D"] += 1
+                    continue
+            children.append((tuple(new_sums) + (current_index + 1,), i))
+
+        # הילד המבטיח ביותר (מינימום גבוה, ואז ערך גבוה לחפץ) נדחף אחרון ולכן נשלף ראשון,
+        # כדי למצוא הקצאה טובה מוקדם ולחזק את גיזום ב.
+        children.sort(key=lambda child: (min(child[0][:num_players]), valuations[child[1]][current_index]))
+        stack.extend(children)
+        if stats is not None:
+            stats.observe(len(stack), len(visited))
+
+    if budget is not None:
+        budget.finish(frontier_bound)
+    if best_assignment is None:
+        return None
+    return _rebuild_allocation(best_assignment, num_players)
+
+
+def _best_first_search(valuations: List[List[int]], state_key, bound_fn,
+                       incumbent: Optional[List[int]] = None,
+                       dominance: Optional[DominanceIndex] = None, visited=None,
+                       budget: Optional[SearchBudget] = None,
+                       stats: Optional[SearchStats] = None) -> Optional[List[List[int]]]:
+    """
+    חיפוש "הטוב ביותר קודם": תור עדיפויות לפי החסם האופטימי.
+    ברגע שהחסם של הראש נמוך מהפתרון הטוב ביותר – אף מצב אחר לא יכול לשפר, ועוצרים.
+    כמו בחיפוש לרוחב, ההקצאה משוחזרת ממצביעי הורים.
+    budget (ראו anytime.py) עוצר את החיפוש כשנגמר הזמן או מספר הצמתים; החסם של ראש
+    הערימה הוא אז החסם העליון של כל החזית.
+    stats (ראו stats.py) סופר צמתים וגיזומים; כשעוצרים, כל מה שנשאר בערימה נספר כגיזום ב.
+    הקצאה מלאה נבדקת מול הפתרון הטוב ביותר כבר כשהיא נוצרת, ולא נכנסת לערימה: עם חסם מוכפל
+    (scale_bound, במצב קירוב) העדיפות שלה בערימה הייתה מוכפלת גם היא, והיא הייתה יוצאת רק אחרי
+    כל המצבים שהחיפוש המדויק מרחיב – והגיזום המוגמש לא היה חוסך כלום.
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+    best_node = None
+    best_assignment = incumbent
+    best_min_value, best_sums = _seed_incumbent(valuations, incumbent)
+    initial_state = (0,) * num_players + (0,)
+    tiebreak = count()
+    parents = array('i', [0])
+    choices = array('i', [0])
+    heap = [(-bound_fn(initial_state[:num_players], 0), next(tiebreak), initial_state, 0)]
+    # visited: קבוצה רגילה, או TranspositionTable עם תקרת זיכרון
+    visited = set() if visited is None else visited
+    visited.add(state_key(initial_state[:num_players], 0))
+    # כמה מצבים פתוחים (בערימה) יש בכל אינדקס חפץ – כדי לשחרר שכבות שאין להן יותר מצבים מעליהן
+    open_states = [0] * (num_items + 1)
+    open_states[0] = 1
+    lowest = freed_index = 0
+
+    def frontier_bound():
+        return -heap[0][0] if heap else float('-inf')
+
+    def improve(sums, node_id: int) -> None:
+        nonlocal best_min_value, best_node, best_sums
+        best_min_value = min(sums)
+        best_node = node_id
+        best_sums = sums
+        if stats is not None:
+            stats.incumbent()
+        if budget is not None:
+            budget.improved(best_min_value)
+            if budget.progress is not None:
+                budget.report(_assignment_from_pointers(parents, choices, node_id, num_items), sums, frontier_bound)
+
+    while heap:
+        if budget is not None and budget.exhausted():
+            break
+        negative_bound, _, state, node_id = heapq.heappop(heap)
+        if -negative_bound < best_min_value:
+            if stats is not None:
+                stats.pruned["B"] += len(heap) + 1
+            break
+        current_sums = state[:num_players]
+        current_index = state[num_players]
+        if dominance is not None:
+            # המצב הפתוח הרדוד ביותר (הנוכחי או אחד בערימה) רק מעמיק, כי כל ילד עמוק מההורה שלו.
+            # מצבים חדשים נוצרים רק מתחתיו, והשכבות עד אליו כבר לא נגישות.
+            open_states[current_index] -= 1
+            while lowest < current_index and not open_states[lowest]:
+                lowest += 1
+            if lowest > freed_index:
+                dominance.forget_below(lowest + 1)
+                freed_index = lowest
+
+        if current_index == num_items:
+            # רק כשאין חפצים בכלל – הקצאות מלאות אחרות לא נכנסות לערימה
+            if _is_better(current_sums, best_min_value, best_sums):
+                improve(current_sums, node_id)
+            continue
+
+        if stats is not None:
+            stats.nodes_expanded += 1
+            stats.children_generated += num_players
+        for i in range(num_players):
+            new_sums = list(current_sums)
+            new_sums[i] += valuations[i][current_index]
+            key = state_key(new_sums, current_index + 1)
+            if key in visited:
+                if stats is not None:
+                    stats.pruned[stats.visited_rule] += 1
+                continue
+            visited.add(key)
+
+            if current_index + 1 == num_items:
+                if _is_better(new_sums, best_min_value, best_sums):
+                    parents.append(node_id)
+                    choices.append(i)
+                    improve(tuple(new_sums), len(parents) - 1)
+                continue
+            bound = bound_fn(new_sums, current_index + 1)
+            if bound < best_min_value:
+                if stats is not None:
+                    stats.pruned["B"] += 1
+                continue
+            # --- כלל גיזום ד (שליטה), אחרי בדיקת החסם כמו בחיפוש לרוחב
+            if dominance is not None and not dominance.add(new_sums, current_index + 1):
+                if stats is not None:
+                    stats.pruned["D"] += 1
+                continue
+            new_state = tuple(new_sums) + (current_index + 1,)
+            parents.append(node_id)
+            choices.append(i)
+            heapq.heappush(heap, (-bound, next(tiebreak), new_state, len(parents) - 1))
+            if dominance is not None:
+                open_states[current_index + 1] += 1
+        if stats is not None:
+            stats.observe(len(heap), len(visited))
 
-egalitarian_allocation([[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]])
+    if budget is not None:
+        budget.finish(frontier_bound)
+    if best_node is not None:
+        best_assignment = _assignment_from_pointers(parents, choices, best_node, num_items)
+    if best_assignment is None:
+        return None
+    return _rebuild_allocation(best_assignment, num_players)
@@ -0,0 +1,124 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import main5_1
+from approximation import dominance_index
+
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+# כמה תתי-בעיות לייצר לכל תהליך, כדי שתהליך שסיים מהר יקבל עוד עבודה
+TASKS_PER_WORKER = 8
+
+
+class SharedIncumbent:
+    """
+    הערך המינימלי הטוב ביותר שנמצא עד כה, בזיכרון משותף בין התהליכים.
+    קריאה בלי נעילה (ערך 64 ביט מיושר), כתיבה תחת נעילה ורק אם הערך משתפר.
+    """
+
+    def __init__(self, value, lock):
+        self._value = value
+        self._lock = lock
+
+    @property
+    def value(self):
+        return self._value.value
+
+    def publish(self, candidate):
+        if candidate <= self._value.value:
+            return
+        with self._lock:
+            if candidate > self._value.value:
+                self._value.value = candidate
+
+
+_shared: Optional[SharedIncumbent] = None
+
+
+def _init_worker(value, lock):
+    global _shared
+    _shared = None if value is None else SharedIncumbent(value, lock)
+
+
+def _solve_subproblem(valuations, prefix, state_key, bound, dominance, bound_scale=1):
+    bound_fn = main5_1.scale_bound(main5_1.make_bound(valuations, bound), bound_scale)
+    index = dominance_index(len(valuations), state_key) if dominance else None
+    return main5_1._depth_first_search(valuations, state_key, bound_fn, dominance=index,
+                                       prefix=prefix, shared=_shared)
+
+
+def split_prefixes(valuations: List[List[int]], state_key, count: int) -> List[List[int]]:
+    """
+    מפרק את העץ לתתי-בעיות: כל ההקצאות של החפצים הראשונים, בעומק הקטן ביותר שנותן
+    לפחות count תתי-בעיות (או עד החפץ האחרון). מצבים זהים לפי state_key מאוחדים.
+
+    >>> split_prefixes([[1, 2, 3], [3, 2, 1]], main5_1.exact_state_key, 4)
+    [[0, 0], [0, 1], [1, 0], [1, 1]]
+    >>> split_prefixes([[1, 1, 1], [1, 1, 1]], main5_1.exact_state_key, 4)
+    [[0, 0, 0], [0, 0, 1], [0, 1, 1], [1, 1, 1]]
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+    layer = [([], (0,) * num_players)]
+    depth = 0
+    while len(layer) < count and depth < num_items:
+        seen = set()
+        next_layer = []
+        for prefix, sums in layer:
+            for i in range(num_players):
+                new_sums = list(sums)
+                new_sums[i] += valuations[i][depth]
+                key = state_key(new_sums, depth + 1)
+                if key in seen:
+                    continue
+                seen.add(key)
+                next_layer.append((prefix + [i], tuple(new_sums)))
+        layer = next_layer
+        depth += 1
+    return [prefix for prefix, _ in layer]
+
+
+def parallel_search(valuations: List[List[int]], state_key, bound: str, incumbent: Optional[List[int]],
+                    dominance: bool, workers: int, bound_scale: float = 1) -> Optional[List[List[int]]]:
+    """
+    מריץ חיפוש לעומק על כל תת-בעיה (ראו split_prefixes) ב-ProcessPoolExecutor.
+    התהליכים חולקים SharedIncumbent, ולכן כל אחד גוזם לפי הפתרון הגלובלי הטוב ביותר.
+    בסוף בוחרים בין התוצאות באותו כלל כמו בחיפוש הטורי: מינימום מקסימלי, ובשוויון – וקטור
+    הסכומים הממוין הגדול ביותר. הערך המינימלי תמיד זהה לזה של החיפוש הטורי.
+    """
+    num_players = len(valuations)
+    best_assignment = incumbent
+    best_min_value, best_sums = main5_1._seed_incumbent(valuations, incumbent)
+
+    values = [value for row in valuations for value in row]
+    if all(isinstance(value, int) for value in values):
+        fits = max((sum(row) for row in valuations), default=0) <= INT64_MAX
+        shared_value = multiprocessing.Value('q', INT64_MIN, lock=False) if fits else None
+    else:
+        shared_value = multiprocessing.Value('d', float('-inf'), lock=False)
+    if shared_value is not None and incumbent is not None:
+        shared_value.value = best_min_value
+
+    prefixes = split_prefixes(valuations, state_key, workers * TASKS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(shared_value, multiprocessing.Lock())) as executor:
+        futures = [executor.submit(_solve_subproblem, valuations, prefix, state_key, bound, dominance, bound_scale)
+                   for prefix in prefixes]
+        results = [future.result() for future in futures]
+
+    for allocation in results:
+        if allocation is None:
+            continue
+        sums = tuple(sum(valuations[player][item] for item in items) for player, items in enumerate(allocation))
+        if main5_1._is_better(sums, best_min_value, best_sums):
+            best_min_value = min(sums)
+            best_sums = sums
+            best_assignment = [0] * len(valuations[0])
+            for player, items in enumerate(allocation):
+                for item in items:
+                    best_assignment[item] = player
+
+    if best_assignment is None:
+        return None
+    return main5_1._rebuild_allocation(best_assignment, num_players)
@@ -0,0 +1,85 @@
+import time
+from typing import Optional
+
+# מונים של ריצת חיפוש אחת, כדי לראות איזה כלל גיזום עושה את העבודה ולא רק כמה זמן לקח.
+# המנועים מעדכנים אותם רק כשמעבירים stats, ולכן בלי stats אין כמעט עלות.
+# כללי הגיזום לפי השמות ב-README:
+# - "A": מצב שכבר ביקרנו בו (מפתח מדויק, או דליים במצב קירוב).
+# - "B": החסם העליון נמוך מהפתרון הטוב ביותר.
+# - "C": מצב שכבר ביקרנו בו לפי מפתח הסכומים הממוינים (symmetry=True, כולל כפילויות מדויקות).
+# - "D": מצב אחר באותה שכבה שולט בו.
+
+# המנועים שסופרים (ב-"binary_search" ובמצב המקבילי אין ספירה)
+STATS_ENGINES = ("bfs", "dfs", "best_first", "vectorized")
+PRUNING_RULES = ("A", "B", "C", "D")
+
+
+class SearchStats:
+    """
+    מוני חיפוש: צמתים שהורחבו, ילדים שנוצרו, גיזומים לפי כלל, גודל מקסימלי של החזית ושל
+    קבוצת visited, זמן עד הפתרון הראשון (כולל warm start) ומספר השיפורים שהחיפוש מצא.
+    אותו אובייקט אפשר להעביר לכמה ריצות – כל ריצה מאפסת אותו (start).
+
+    >>> stats = SearchStats()
+    >>> stats.start()
+    >>> stats.nodes_expanded += 3
+    >>> stats.pruned["B"] += 2
+    >>> stats.observe(frontier=5, visited=9)
+    >>> stats.observe(frontier=4, visited=7)
+    >>> stats.incumbent()
+    >>> stats.as_dict()["pruned"], stats.peak_frontier, stats.peak_visited, stats.incumbent_improvements
+    ({'A': 0, 'B': 2, 'C': 0, 'D': 0}, 5, 9, 1)
+    """
+
+    def __init__(self):
+        self.start()
+
+    def start(self):
+        """
+        מאפס את המונים ומתחיל את השעון – נקרא בתחילת כל ריצה.
+        """
+        self.nodes_expanded = 0
+        self.children_generated = 0
+        self.pruned = {rule: 0 for rule in PRUNING_RULES}
+        self.peak_frontier = 0
+        self.peak_visited = 0
+        self.time_to_first_incumbent: Optional[float] = None
+        self.incumbent_improvements = 0
+        self.elapsed: Optional[float] = None
+        # הכלל שנספר כשמפתח המצב כבר ב-visited ("A" או "C", ראו run_search)
+        self.visited_rule = "A"
+        self._start = time.perf_counter()
+
+    def observe(self, frontier: int, visited: int = 0):
+        if frontier > self.peak_frontier:
+            self.peak_frontier = frontier
+        if visited > self.peak_visited:
+            self.peak_visited = visited
+
+    def incumbent(self, improvement: bool = True):
+        """
+        נקרא כשיש פתרון טוב יותר. improvement=False – הפתרון ההתחלתי של warm start.
+        """
+        if self.time_to_first_incumbent is None:
+            self.time_to_first_incumbent = time.perf_counter() - self._start
+        if improvement:
+            self.incumbent_improvements += 1
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self._start
+
+    def as_dict(self) -> dict:
+        return {
+            'nodes_expanded': self.nodes_expanded,
+            'children_generated': self.children_generated,
+            'pruned': dict(self.pruned),
+            'peak_frontier': self.peak_frontier,
+            'peak_visited': self.peak_visited,
+            'time_to_first_incumbent': self.time_to_first_incumbent,
+            'incumbent_improvements': self.incumbent_improvements,
+            'elapsed': self.elapsed,
+        }
+
+    def to_json(self, **kwargs) -> str:
+        import json
+        return json.dumps(self.as_dict(), **kwargs)
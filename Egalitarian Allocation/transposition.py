@@ -0,0 +1,126 @@
+from array import array
+from hashlib import blake2b
+
+# טבלת מצבים (transposition table) חסומה בזיכרון – תחליף לקבוצת visited של כלל גיזום א.
+# במקום לשמור tuple של num_players + 1 מספרים לכל מצב, שומרים טביעת אצבע של 128 ביט
+# (שני מספרים של 64 ביט) במערכים שמוקצים מראש. כשהטבלה מלאה מפנים רשומה לפי מדיניות
+# ההחלפה. פינוי רק גורם לחיפוש לבקר שוב במצב שכבר ראה – התוצאה נשארת נכונה.
+# התנגשות של טביעות אצבע (שני מצבים שונים עם אותם 128 ביט) היא הדרך היחידה לגזום
+# מצב שלא נראה, וההסתברות לה זניחה (בערך n^2 / 2^129 עבור n מצבים).
+
+BUCKET_SIZE = 4
+# hi + lo + stamp (שלושה מספרים של 8 בתים) + depth (4 בתים) לכל תא
+BYTES_PER_SLOT = 8 * 3 + 4
+POLICIES = ("depth", "lru")
+
+
+class TranspositionTable:
+    """
+    תחליף לקבוצה (set) עם תקרת זיכרון: תומך ב-`key in table` וב-`table.add(key)`.
+    מפתח המצב חייב להסתיים באינדקס החפץ הבא (כמו exact_state_key ו-symmetric_state_key),
+    והוא משמש את מדיניות "depth".
+
+    policy:
+    - "depth": בכל דלי מפנים את המצב הכי עמוק (הכי מעט חפצים שנותרו) – הוא חוסך הכי מעט עבודה.
+    - "lru": מפנים את המצב שלא נגעו בו הכי הרבה זמן.
+
+    >>> table = TranspositionTable(max_bytes=BYTES_PER_SLOT * BUCKET_SIZE, num_items=3)
+    >>> (0, 0, 0) in table
+    False
+    >>> table.add((0, 0, 0))
+    >>> (0, 0, 0) in table
+    True
+    >>> for key in [(1, 0, 1), (0, 1, 1), (2, 0, 2), (0, 2, 2)]:
+    ...     table.add(key)
+    >>> (0, 0, 0) in table, (2, 0, 2) in table
+    (True, False)
+    >>> table.stats()
+    {'capacity': 4, 'size': 4, 'hits': 2, 'misses': 2, 'evictions': 1}
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2 ** 20, policy: str = "depth", num_items: int = 0):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replacement policy {policy!r}, expected one of {POLICIES}")
+        self.num_buckets = max(1, max_bytes // (BYTES_PER_SLOT * BUCKET_SIZE))
+        self.capacity = self.num_buckets * BUCKET_SIZE
+        self.policy = policy
+        self.num_items = num_items
+        self.hi = array('Q', bytes(8 * self.capacity))
+        self.lo = array('Q', bytes(8 * self.capacity))
+        self.stamp = array('Q', bytes(8 * self.capacity))
+        self.clear()
+
+    def clear(self, num_items: int = None):
+        """
+        מרוקן את הטבלה ומאפס את המונים לפני ריצה חדשה.
+        """
+        if num_items is not None:
+            self.num_items = num_items
+        # מספר החפצים שנותרו; -1 מסמן תא ריק
+        self.depth = array('i', [-1]) * self.capacity
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.clock = 0
+        self._last_key = None
+        self._last_fingerprint = None
+
+    def _fingerprint(self, key):
+        if key is not self._last_key:
+            digest = blake2b(repr(key).encode(), digest_size=16).digest()
+            self._last_key = key
+            self._last_fingerprint = (int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little'))
+        return self._last_fingerprint
+
+    def _find(self, hi: int, lo: int):
+        start = (hi % self.num_buckets) * BUCKET_SIZE
+        for slot in range(start, start + BUCKET_SIZE):
+            if self.depth[slot] >= 0 and self.hi[slot] == hi and self.lo[slot] == lo:
+                return slot
+        return None
+
+    def __contains__(self, key) -> bool:
+        hi, lo = self._fingerprint(key)
+        slot = self._find(hi, lo)
+        if slot is None:
+            self.misses += 1
+            return False
+        self.hits += 1
+        self.clock += 1
+        self.stamp[slot] = self.clock
+        return True
+
+    def add(self, key):
+        hi, lo = self._fingerprint(key)
+        self.clock += 1
+        if self._find(hi, lo) is not None:
+            return
+        depth = max(0, self.num_items - key[-1])
+        start = (hi % self.num_buckets) * BUCKET_SIZE
+        slots = range(start, start + BUCKET_SIZE)
+        victim = next((slot for slot in slots if self.depth[slot] < 0), None)
+        if victim is None:
+            if self.policy == "depth":
+                victim = min(slots, key=lambda slot: (self.depth[slot], self.stamp[slot]))
+            else:
+                victim = min(slots, key=lambda slot: self.stamp[slot])
+            self.evictions += 1
+        else:
+            self.size += 1
+        self.hi[victim] = hi
+        self.lo[victim] = lo
+        self.stamp[victim] = self.clock
+        self.depth[victim] = depth
+
+    def __len__(self):
+        return self.size
+
+    def stats(self) -> dict:
+        return {
+            'capacity': self.capacity,
+            'size': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,97 @@
+from typing import List
+
+# ייצוג משותף של מטריצת הערכים. הקלט יכול להיות רשימות מקוננות או מערך NumPy.
+# - המנועים של main5_1 עוברים על valuations[i][j] בלולאות Python, ושם int/float של Python הם
+#   המהירים ביותר: כל פעולה על סקלר של NumPy איטית פי כמה, ו-int64 גם יכול לגלוש בשקט.
+#   לכן as_rows ממירה כל קלט פעם אחת לרשימות של מספרים של Python (tolist), והחסם, הרחבת
+#   המצבים ו-min_player_value עובדים כולם על אותן שורות.
+# - המנוע הווקטורי מקבל מ-as_array מערך int64 (או float64) רצוף. לפני כן matrix_kind בודק
+#   שאף סכום לא יכול לגלוש; אם הוא יכול, או שהערכים לא int/float (למשל Fraction),
+#   התוצאה היא "exact" והמנוע חוזר לחיפוש לרוחב המדויק.
+# - ערכים שאינם שלמים מושווים עם סובלנות: הסכומים מחושבים בסדרים שונים בחסם ובחיפוש, ולכן
+#   החסם מוגדל ב-float_slack כדי שעיגול לא יגזום את הענף האופטימלי. binary_search.py משתמש
+#   באותה סובלנות גם כשהוא בודק אם שחקן הגיע לערך המטרה.
+
+INT64_MAX = 2 ** 63 - 1
+# סובלנות יחסית לסכום השורה הגדול ביותר
+FLOAT_RELATIVE_TOLERANCE = 1e-9
+MATRIX_KINDS = ("int64", "float64", "exact")
+
+
+def as_rows(valuations) -> List[List]:
+    """
+    מחזיר את הערכים כרשימה של שורות עם מספרים של Python. רשימות שכבר כאלה מוחזרות כמו שהן.
+
+    >>> import numpy as np
+    >>> rows = as_rows(np.array([[1, 2], [3, 4]], dtype=np.int64))
+    >>> rows, type(rows[0][0])
+    ([[1, 2], [3, 4]], <class 'int'>)
+    >>> as_rows([np.array([0.5, 1.0]), [np.int64(2), 3]])
+    [[0.5, 1.0], [2, 3]]
+    >>> vals = [[1, 2]]
+    >>> as_rows(vals) is vals
+    True
+    """
+    rows = valuations.tolist() if hasattr(valuations, "tolist") else valuations
+    if all(type(row) is list and all(type(value) in (int, float) for value in row) for row in rows):
+        return rows
+    return [[value.item() if hasattr(value, "item") else value for value in row] for row in rows]
+
+
+def matrix_kind(rows: List[List]) -> str:
+    """
+    "int64": כל הערכים שלמים וסכום כל הערכים המוחלטים נכנס ב-int64. כל סכום של שחקן, וגם
+    הסכומים של קבוצות שחקנים בחסם "subset", קטנים ממנו – אין גלישה.
+    "float64": יש ערכים שאינם שלמים (int/float בלבד) – מושווים עם float_slack.
+    "exact": כל השאר (שלמים גדולים מדי, Fraction, Decimal) – רק בחשבון של Python.
+
+    >>> matrix_kind([[1, 2], [3, 4]]), matrix_kind([[0.5, 2]]), matrix_kind([[2 ** 62, 2 ** 62]])
+    ('int64', 'float64', 'exact')
+    """
+    if all(type(value) is int for row in rows for value in row):
+        return "int64" if sum(abs(value) for row in rows for value in row) <= INT64_MAX else "exact"
+    if all(type(value) in (int, float) for row in rows for value in row):
+        return "float64"
+    return "exact"
+
+
+def as_array(rows: List[List]):
+    """
+    מחזיר (array, kind): מערך NumPy רצוף מסוג kind, או (None, "exact") כשאין ייצוג בטוח.
+    NumPy נטען רק כאן.
+
+    >>> array, kind = as_array([[1, 2], [3, 4]])
+    >>> array.dtype, array.flags['C_CONTIGUOUS'], kind
+    (dtype('int64'), True, 'int64')
+    >>> as_array([[2 ** 63, 0]])
+    (None, 'exact')
+    """
+    kind = matrix_kind(rows)
+    if kind == "exact":
+        return None, kind
+    import numpy as np
+    return np.ascontiguousarray(rows, dtype=np.int64 if kind == "int64" else np.float64), kind
+
+
+def float_slack(rows: List[List]) -> float:
+    """
+    כמה להגדיל את החסם העליון כדי ששגיאות עיגול לא יגזמו את האופטימום.
+    0 כשאין ערכי float (שלמים, Fraction וכו' מחושבים בדיוק).
+
+    >>> float_slack([[1, 2]]), float_slack([[0.5, 1.5]])
+    (0, 2e-09)
+    """
+    if not any(type(value) is float for row in rows for value in row):
+        return 0
+    return FLOAT_RELATIVE_TOLERANCE * max((sum(abs(value) for value in row) for row in rows), default=0)
+
+
+def min_player_value(allocation: List[List[int]], valuations) -> float:
+    """
+    הערך המינימלי ששחקן כלשהו מקבל בהקצאה.
+
+    >>> min_player_value([[1, 2], [0]], [[1, 2, 3], [3, 2, 1]])
+    3
+    """
+    rows = as_rows(valuations)
+    return min(sum(rows[player][item] for item in items) for player, items in enumerate(allocation))
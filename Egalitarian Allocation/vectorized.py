@@ -0,0 +1,95 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from value_matrix import as_array, float_slack
+
+
+def vectorized_search(valuations: List[List[int]], tables, best_min_value=float('-inf'), stats=None
+                      ) -> Optional[Tuple[List[int], Tuple[int, ...]]]:
+    """
+    חיפוש לרוחב שכבה אחר שכבה, כשכל החזית מוחזקת כמערך int64 (או float64) בגודל (n_states, num_players).
+    סוג המערך נקבע ב-value_matrix.as_array; ערכים שיכולים לגלוש ב-int64 נדחים (ValueError).
+
+    בכל שכבה k:
+    1. כל הילדים של החפץ k נוצרים בחיבור משודר (broadcast) אחד.
+    2. גיזום ב מופעל כמסכה וקטורית מול טבלאות הסכומים מהסוף (tables, ראו main5_1.bound_tables).
+    3. מצבים כפולים מאוחדים עם np.unique על השורות (כלל גיזום א).
+    לכל שכבה נשמרים מערכי parent/choice, ומהם משחזרים את ההקצאה בסוף.
+
+    best_min_value הוא ערך של פתרון ידוע (למשל מ-warm start) – מצבים שהחסם שלהם נמוך ממנו נגזמים.
+    מחזיר (assignment, sums) של ההקצאה הטובה ביותר שנמצאה, או None אם כל המצבים נגזמו.
+    stats (ראו stats.py) נספר לפי שכבה: כל מצב בחזית מורחב, ואין קבוצת visited מעבר לשכבה.
+
+    >>> tables = [((0,), [15, 11, 6, 0]), ((1,), [15, 14, 9, 0])]
+    >>> vectorized_search([[4, 5, 6], [1, 5, 9]], tables)
+    ([0, 0, 1], (9, 9))
+    """
+    values, kind = as_array(valuations)
+    if values is None:
+        raise ValueError("The vectorized engine needs int or float valuations whose total fits in int64")
+    integral = kind == "int64"
+    slack = float_slack(valuations)
+    num_players, num_items = values.shape
+
+    groups = [np.array(group) for group, _ in tables]
+    sizes = [len(group) for group, _ in tables]
+    suffixes = [np.array(suffix, dtype=values.dtype) for _, suffix in tables]
+
+    def upper_bound(states: np.ndarray, index: int) -> np.ndarray:
+        bound = None
+        for group, size, suffix in zip(groups, sizes, suffixes):
+            total = states[:, group].sum(axis=1) + suffix[index]
+            group_bound = total // size if integral else total / size
+            bound = group_bound if bound is None else np.minimum(bound, group_bound)
+        return bound
+
+    frontier = np.zeros((1, num_players), dtype=values.dtype)
+    parents = []
+    choices = []
+    # diagonal[i] = וקטור שבו רק שחקן i מקבל את ערך החפץ
+    players = np.arange(num_players)
+    for k in range(num_items):
+        diagonal = np.zeros((num_players, num_players), dtype=values.dtype)
+        diagonal[players, players] = values[:, k]
+        children = (frontier[:, None, :] + diagonal[None, :, :]).reshape(-1, num_players)
+        parent = np.repeat(np.arange(len(frontier)), num_players)
+        choice = np.tile(players, len(frontier))
+        if stats is not None:
+            stats.nodes_expanded += len(frontier)
+            stats.children_generated += len(children)
+
+        # --- כלל גיזום ב (חסם אופטימי), כמסכה על כל השכבה
+        if best_min_value != float('-inf'):
+            keep = upper_bound(children, k + 1) + slack >= best_min_value
+            children, parent, choice = children[keep], parent[keep], choice[keep]
+            if stats is not None:
+                stats.pruned["B"] += int(len(keep) - len(children))
+
+        # --- כלל גיזום א: שומרים את ההופעה הראשונה של כל וקטור סכומים, כמו בחיפוש לרוחב
+        # כל שורה נצפית כבלוק בתים אחד (void), כך ש-np.unique ממיין מערך חד-ממדי
+        rows = np.ascontiguousarray(children).view(np.dtype((np.void, children.dtype.itemsize * num_players)))
+        _, first = np.unique(rows.ravel(), return_index=True)
+        first.sort()
+        frontier = children[first]
+        if stats is not None:
+            stats.pruned["A"] += len(children) - len(first)
+            stats.observe(len(frontier))
+        parents.append(parent[first])
+        choices.append(choice[first].astype(np.int16 if num_players < 2 ** 15 else np.int64))
+        if len(frontier) == 0:
+            return None
+
+    # הקצאה מלאה: ערך מינימלי מקסימלי, ובשוויון – וקטור הסכומים הממוין הגדול ביותר לקסיקוגרפית
+    mins = frontier.min(axis=1)
+    candidates = np.flatnonzero(mins == mins.max())
+    ranked = np.sort(frontier[candidates], axis=1)
+    order = np.lexsort(ranked.T[::-1])
+    best = int(candidates[order[-1]])
+
+    assignment = [0] * num_items
+    node = best
+    for k in range(num_items - 1, -1, -1):
+        assignment[k] = int(choices[k][node])
+        node = int(parents[k][node])
+    return assignment, tuple(frontier[best].tolist())
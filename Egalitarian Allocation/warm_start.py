@@ -0,0 +1,121 @@
+from typing import Callable, List
+
+# היוריסטיקות זולות שמחזירות הקצאה חוקית (לא בהכרח אופטימלית) לפני החיפוש המדויק.
+# כל היוריסטיקה מקבלת את מטריצת הערכים ומחזירה assignment[item] = player.
+
+
+def allocation_values(valuations: List[List[int]], assignment: List[int]) -> List[int]:
+    """
+    מחשב את הסכום שכל שחקן מקבל לפי assignment[item] = player.
+
+    >>> allocation_values([[1, 2, 3], [3, 2, 1]], [1, 0, 0])
+    [5, 3]
+    """
+    sums = [0] * len(valuations)
+    for item, player in enumerate(assignment):
+        sums[player] += valuations[player][item]
+    return sums
+
+
+def round_robin(valuations: List[List[int]]) -> List[int]:
+    """
+    סבב בחירות: בכל תור השחקן הבא בוחר את החפץ שהוא הכי מעריך מבין מה שנשאר.
+
+    >>> round_robin([[1, 2, 3], [3, 2, 1]])
+    [1, 0, 0]
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+    assignment = [0] * num_items
+    remaining = set(range(num_items))
+    turn = 0
+    while remaining:
+        player = turn % num_players
+        item = max(remaining, key=lambda j: (valuations[player][j], -j))
+        assignment[item] = player
+        remaining.remove(item)
+        turn += 1
+    return assignment
+
+
+def greedy_to_poorest(valuations: List[List[int]]) -> List[int]:
+    """
+    עובר על החפצים מהיקר לזול (לפי הערך המקסימלי) ונותן כל חפץ לשחקן העני ביותר
+    מבין אלה שמעריכים אותו בערך חיובי.
+
+    >>> greedy_to_poorest([[4, 5, 6, 7, 8], [8, 7, 6, 5, 4]])
+    [1, 1, 0, 0, 0]
+    """
+    num_players = len(valuations)
+    num_items = len(valuations[0])
+    assignment = [0] * num_items
+    sums = [0] * num_players
+    order = sorted(range(num_items), key=lambda j: -max(valuations[i][j] for i in range(num_players)))
+    for item in order:
+        candidates = [i for i in range(num_players) if valuations[i][item] > 0] or list(range(num_players))
+        player = min(candidates, key=lambda i: (sums[i], -valuations[i][item]))
+        assignment[item] = player
+        sums[player] += valuations[player][item]
+    return assignment
+
+
+def local_search(valuations: List[List[int]], max_rounds: int = 100) -> List[int]:
+    """
+    מתחיל מ-greedy_to_poorest ומשפר בצעדים מקומיים: העברת חפץ לשחקן העני ביותר,
+    או החלפת חפצים בינו לבין שחקן אחר. צעד מתקבל רק אם וקטור הסכומים הממוין משתפר,
+    ולכן החיפוש תמיד נעצר.
+
+    >>> local_search([[1, 2, 3], [3, 2, 1], [2, 2, 2]])
+    [1, 2, 0]
+    """
+    num_players = len(valuations)
+    assignment = greedy_to_poorest(valuations)
+    sums = allocation_values(valuations, assignment)
+
+    for _ in range(max_rounds):
+        poorest = min(range(num_players), key=lambda i: sums[i])
+        current = sorted(sums)
+        best_move = None
+        for item, owner in enumerate(assignment):
+            if owner == poorest:
+                continue
+            # העברת החפץ לשחקן העני ביותר
+            candidate = list(sums)
+            candidate[owner] -= valuations[owner][item]
+            candidate[poorest] += valuations[poorest][item]
+            if sorted(candidate) > current:
+                best_move, current = ((item, poorest),), sorted(candidate)
+            # החלפה עם חפץ של השחקן העני ביותר
+            for other, other_owner in enumerate(assignment):
+                if other_owner != poorest:
+                    continue
+                swapped = list(candidate)
+                swapped[poorest] -= valuations[poorest][other]
+                swapped[owner] += valuations[owner][other]
+                if sorted(swapped) > current:
+                    best_move, current = ((item, poorest), (other, owner)), sorted(swapped)
+        if best_move is None:
+            break
+        for item, player in best_move:
+            assignment[item] = player
+        sums = allocation_values(valuations, assignment)
+    return assignment
+
+
+WARM_STARTS = {
+    "round_robin": round_robin,
+    "greedy": greedy_to_poorest,
+    "local_search": local_search,
+}
+
+
+def resolve_warm_start(warm_start) -> Callable[[List[List[int]]], List[int]]:
+    """
+    מחזיר את פונקציית ההיוריסטיקה לפי שם (מתוך WARM_STARTS), או את הפונקציה עצמה
+    אם התקבלה פונקציה.
+    """
+    if callable(warm_start):
+        return warm_start
+    if warm_start not in WARM_STARTS:
+        raise ValueError(f"Unknown warm start {warm_start!r}, expected one of {tuple(WARM_STARTS)}")
+    return WARM_STARTS[warm_start]
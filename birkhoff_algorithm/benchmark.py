@@ -0,0 +1,152 @@
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from birknhof import MATCHING_ENGINES, SPARSE_ENGINES, birkhoff_algorithm, sparse_birkhoff
+
+# ---------------------------------------------------
+# Term count and runtime of each matching engine
+# ---------------------------------------------------
+# Every engine decomposes the same random lottery matrices (weighted sums of random
+# permutations). The number of terms is what the sampler downstream pays for, so it is
+# reported next to the runtime, and every decomposition is checked by rebuilding the matrix.
+#
+# python benchmark.py --sizes 10 20 30 --permutations 5 10 --seeds 3
+# python benchmark.py --sparse --sizes 200 400 --engines incremental bottleneck
+
+def random_lottery(n, k, seed):
+    """
+    A doubly stochastic n x n matrix: the sum of k random permutation matrices with random
+    weights that add up to 1.
+
+    Examples:
+        >>> m = random_lottery(4, 3, seed=0)
+        >>> bool(np.allclose(m.sum(axis=0), 1)), bool(np.allclose(m.sum(axis=1), 1))
+        (True, True)
+    """
+    rng = np.random.default_rng(seed)
+    weights = rng.random(k)
+    weights /= weights.sum()
+    matrix = np.zeros((n, n))
+    for weight in weights:
+        matrix[np.arange(n), rng.permutation(n)] += weight
+    return matrix
+
+def decompose(matrix, engine, sparse=False):
+    """
+    Runs one engine and returns (permutations, probabilities), with each permutation as an
+    array where row i is matched to column perm[i].
+
+    Examples:
+        >>> m = np.array([[0.2, 0.4, 0.4], [0.4, 0.4, 0.2], [0.4, 0.2, 0.4]])
+        >>> len(decompose(m, "incremental")[1]), len(decompose(m, "bottleneck", sparse=True)[1])
+        (5, 3)
+    """
+    if sparse:
+        from scipy.sparse import csr_matrix
+        return sparse_birkhoff(csr_matrix(matrix), engine=engine)
+    matchings, probabilities, _ = birkhoff_algorithm(matrix, verbose=False, engine=engine)
+    permutations = []
+    for matching in matchings:
+        perm = np.empty(len(matching), dtype=int)
+        for i, j in matching:
+            perm[i] = j
+        permutations.append(perm)
+    return permutations, probabilities
+
+def reconstruction_error(matrix, permutations, probabilities):
+    """
+    Largest absolute difference between the matrix and the sum of its weighted permutations.
+    """
+    rebuilt = np.zeros_like(matrix)
+    rows = np.arange(len(matrix))
+    for perm, probability in zip(permutations, probabilities):
+        rebuilt[rows, perm] += probability
+    return float(np.abs(rebuilt - matrix).max()) if matrix.size else 0.0
+
+def compare_engines(engines, sizes, permutations, seeds, sparse=False, log=None):
+    """
+    Decomposes random_lottery(n, k, seed) with every engine, for every n, k and seed.
+    Returns one row (dict) per run with the number of terms, the time and the reconstruction error.
+
+    Examples:
+        >>> rows = compare_engines(["incremental", "bottleneck"], [6], [4], seeds=2)
+        >>> [(row["engine"], row["seed"]) for row in rows]
+        [('incremental', 0), ('bottleneck', 0), ('incremental', 1), ('bottleneck', 1)]
+        >>> all(row["error"] < 1e-9 for row in rows)
+        True
+    """
+    rows = []
+    for n in sizes:
+        for k in permutations:
+            for seed in range(seeds):
+                matrix = random_lottery(n, k, seed)
+                for engine in engines:
+                    start = time.perf_counter()
+                    perms, probabilities = decompose(matrix, engine, sparse)
+                    seconds = time.perf_counter() - start
+                    row = {
+                        'engine': engine,
+                        'n': n,
+                        'k': k,
+                        'seed': seed,
+                        'terms': len(probabilities),
+                        'seconds': seconds,
+                        'error': reconstruction_error(matrix, perms, probabilities),
+                    }
+                    rows.append(row)
+                    if log is not None:
+                        log(f"{engine:>12} n={n:<5} k={k:<4} seed={seed}: {row['terms']} terms, {seconds:.3f}s")
+    return rows
+
+def summarize(rows):
+    """
+    Mean terms and seconds per (n, k, engine), in the order the rows were produced.
+
+    Examples:
+        >>> summarize([{'engine': 'a', 'n': 2, 'k': 1, 'terms': 3, 'seconds': 1.0},
+        ...            {'engine': 'a', 'n': 2, 'k': 1, 'terms': 5, 'seconds': 3.0}])
+        [{'n': 2, 'k': 1, 'engine': 'a', 'runs': 2, 'mean_terms': 4, 'mean_seconds': 2.0}]
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault((row['n'], row['k'], row['engine']), []).append(row)
+    return [{
+        'n': n,
+        'k': k,
+        'engine': engine,
+        'runs': len(group),
+        'mean_terms': statistics.mean(row['terms'] for row in group),
+        'mean_seconds': statistics.mean(row['seconds'] for row in group),
+    } for (n, k, engine), group in groups.items()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare term counts and runtimes of the Birkhoff matching engines.")
+    parser.add_argument("--sparse", action="store_true", help="run sparse_birkhoff on CSR input")
+    parser.add_argument("--engines", nargs="+", help="engines to compare (default: all of the chosen mode)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 20, 30])
+    parser.add_argument("--permutations", nargs="+", type=int, default=[5, 10],
+                        help="number of random permutations summed into each matrix")
+    parser.add_argument("--seeds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    available = SPARSE_ENGINES if args.sparse else MATCHING_ENGINES
+    engines = args.engines or list(available)
+    for engine in engines:
+        if engine not in available:
+            parser.error(f"Unknown engine {engine!r}, expected one of {available}")
+
+    rows = compare_engines(engines, args.sizes, args.permutations, args.seeds, args.sparse)
+    print(f"{'n':>6} {'k':>4} {'engine':>12} {'terms':>8} {'seconds':>9}")
+    for line in summarize(rows):
+        print(f"{line['n']:>6} {line['k']:>4} {line['engine']:>12} {line['mean_terms']:>8.1f} {line['mean_seconds']:>9.3f}")
+
+    failed = [row for row in rows if row['error'] > 1e-9]
+    for row in failed:
+        print(f"Bad decomposition: {row['engine']} n={row['n']} k={row['k']} seed={row['seed']} error={row['error']:.2e}")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,17 +1,30 @@
+from collections import deque
+
 import networkx as nx
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 
+# Engines for finding the perfect matching of each step:
+# "networkx" rebuilds a graph and runs max_weight_matching every step (the original),
+# "incremental" keeps the matching between steps and repairs it (see SupportMatching),
+# "bottleneck" takes the perfect matching whose minimum weight is largest (see _bottleneck_matching).
+MATCHING_ENGINES = ("networkx", "incremental", "bottleneck")
+# Engines of sparse_birkhoff: "scipy" runs csgraph.maximum_bipartite_matching on the remaining
+# support every step, "incremental" repairs a SupportMatching built from the CSR rows,
+# "bottleneck" is the same max-min matching as above on the CSR matrix.
+SPARSE_ENGINES = ("scipy", "incremental", "bottleneck")
+
 # ------------------------------
 # Check if a matrix is balanced
 # ------------------------------
 def is_balanced(matrix):
     """
     Check if a given matrix is balanced (all row and column sums are equal).
+    All sums are computed and compared in one vectorized pass; NaN entries count as 0.
 
     Args:
-        matrix (pd.DataFrame): A matrix of edge weights.
+        matrix (np.ndarray or pd.DataFrame): A matrix of edge weights.
 
     Returns:
         bool: True if all rows and columns sum to the same value (within tolerance), else False.
@@ -23,97 +36,511 @@ def is_balanced(matrix):
         ... }, index=['Player 1', 'Player 2'])
         >>> is_balanced(m)
         True
+        >>> is_balanced(np.array([[0.5, 0.5], [0.4, 0.6]]))
+        False
     """
-    row_sums = matrix.sum(axis=1)
-    col_sums = matrix.sum(axis=0)
-    target = round(row_sums.iloc[0], 5)
-    return all(abs(val - target) < 1e-5 for val in row_sums) and all(abs(val - target) < 1e-5 for val in col_sums)
+    if hasattr(matrix, "tocsr"):
+        # scipy.sparse: the sums scale with nnz, no dense copy
+        sums = np.concatenate([np.asarray(matrix.sum(axis=1)).ravel(), np.asarray(matrix.sum(axis=0)).ravel()])
+    else:
+        values = np.asarray(matrix, dtype=float)
+        sums = np.concatenate([np.nansum(values, axis=1), np.nansum(values, axis=0)])
+    if sums.size == 0:
+        return True
+    target = round(sums[0], 5)
+    return bool(np.all(np.abs(sums - target) < 1e-5))
+
+# ---------------------------------------------------
+# Perfect matching on the support, repaired between steps
+# ---------------------------------------------------
+class SupportMatching:
+    """
+    A perfect matching on the positive entries of a square matrix, kept between Birkhoff steps.
+
+    Rows and columns are plain integer indices: adj[i] is the set of columns j with a positive
+    weight in row i, and match_row / match_col hold the current matching (-1 = unmatched).
+    After a step only the zeroed edges disappear, so remove_edge() drops them (unmatching
+    their rows), and repair() runs Hopcroft-Karp phases that start from the surviving
+    matching. Only the rows that lost their edge are searched from, so a step costs about
+    the augmenting paths of the removed edges instead of a full matching.
+
+    Args:
+        support (np.ndarray or scipy.sparse matrix): Boolean (n, n) array, True where the weight
+            is positive, or a sparse matrix whose stored entries are the support.
+
+    Examples:
+        >>> m = SupportMatching(np.array([[True, True], [True, False]]))
+        >>> m.repair(), m.pairs()
+        (True, [(0, 1), (1, 0)])
+        >>> m.remove_edge(0, 1)
+        >>> m.repair()
+        False
+    """
+
+    def __init__(self, support):
+        self.n = support.shape[0]
+        if hasattr(support, "tocsr"):
+            csr = support.tocsr()
+            self.adj = [set(csr.indices[csr.indptr[i]:csr.indptr[i + 1]].tolist()) for i in range(self.n)]
+        else:
+            self.adj = [set(np.flatnonzero(row).tolist()) for row in support]
+        self.match_row = [-1] * self.n
+        self.match_col = [-1] * support.shape[1]
+        self.free = set(range(self.n))
+
+    def pairs(self):
+        """
+        The matched (row, column) pairs, ordered by row.
+        """
+        return [(i, j) for i, j in enumerate(self.match_row) if j != -1]
+
+    def remove_edge(self, i, j):
+        """
+        Drops edge (i, j) from the support, unmatching it if it is in the matching.
+        """
+        self.adj[i].discard(j)
+        if self.match_row[i] == j:
+            self.match_row[i] = -1
+            self.match_col[j] = -1
+            self.free.add(i)
+
+    def repair(self):
+        """
+        Grows the current matching with shortest augmenting paths until it is perfect.
+
+        Returns:
+            bool: True if every row is matched, False if the support has no perfect matching.
+        """
+        while self.free:
+            dist = self._layers()
+            if dist is None:
+                return False
+            augmented = False
+            for root in list(self.free):
+                if self._augment(root, dist):
+                    self.free.discard(root)
+                    augmented = True
+            if not augmented:
+                return False
+        return True
+
+    def _layers(self):
+        # BFS from all free rows along alternating paths; None if no free column is reachable
+        dist = [-1] * self.n
+        queue = deque(self.free)
+        for i in self.free:
+            dist[i] = 0
+        limit = None
+        while queue:
+            i = queue.popleft()
+            if limit is not None and dist[i] >= limit:
+                continue
+            for j in self.adj[i]:
+                k = self.match_col[j]
+                if k == -1:
+                    limit = dist[i] + 1 if limit is None else limit
+                elif dist[k] == -1:
+                    dist[k] = dist[i] + 1
+                    queue.append(k)
+        return None if limit is None else dist
+
+    def _augment(self, root, dist):
+        # Iterative DFS along the BFS layers; rows that lead nowhere are closed (dist = -2)
+        stack = [(root, iter(list(self.adj[root])))]
+        path = []
+        while stack:
+            i, edges = stack[-1]
+            for j in edges:
+                k = self.match_col[j]
+                if k == -1:
+                    for (row, _), col in zip(stack, path + [j]):
+                        self.match_row[row] = col
+                        self.match_col[col] = row
+                    return True
+                if dist[k] == dist[i] + 1:
+                    path.append(j)
+                    stack.append((k, iter(list(self.adj[k]))))
+                    break
+            else:
+                dist[i] = -2
+                stack.pop()
+                if path:
+                    path.pop()
+        return False
+
 
 # ---------------------------------------------------
 # Perform Birkhoff decomposition on a balanced matrix
 # ---------------------------------------------------
-def birkhoff_algorithm(weight_matrix, verbose=True):
+def birkhoff_algorithm(weight_matrix, verbose=True, engine="networkx"):
     """
     Perform Birkhoff decomposition on a balanced weight matrix.
 
     Args:
-        weight_matrix (pd.DataFrame): Matrix representing a bipartite graph with edge weights.
+        weight_matrix (np.ndarray or pd.DataFrame): Matrix representing a bipartite graph with edge weights.
+            The decomposition always runs on a float ndarray; a DataFrame is only an adapter
+            whose index and columns are kept on the returned steps.
         verbose (bool): If True, prints steps and shows graphs.
+        engine (str): How each perfect matching is found (see MATCHING_ENGINES).
+            "networkx" builds a graph and runs max_weight_matching every step.
+            "incremental" keeps a SupportMatching on integer indices and repairs the previous
+            matching with augmenting paths after the zeroed edges are removed.
+            "bottleneck" takes the perfect matching that maximizes the minimum weight, so each
+            step removes as much probability as possible, which usually means fewer terms.
 
     Returns:
         list: List of matchings (each matching is a list of tuples (i, j))
         list: List of corresponding probabilities (minimum weight in each matching)
-        list: List of intermediate matrix states (after each iteration)
+        list: List of intermediate matrix states (after each iteration), as ndarrays,
+            or as DataFrames with the input labels when the input is a DataFrame
 
     The algorithm repeatedly finds a perfect matching with positive weights,
     subtracts the minimal weight in that matching, and continues until the graph is empty.
+    Each step reads and updates only the matched cells (fancy indexing), and edges that
+    reach zero are marked as NaN.
 
     If the input matrix is not balanced, the function will return empty results.
+
+    Examples:
+        >>> m = np.array([[0.5, 0.5, 0.0], [0.25, 0.25, 0.5], [0.25, 0.25, 0.5]])
+        >>> matchings, probs, steps = birkhoff_algorithm(m, verbose=False, engine="incremental")
+        >>> probs
+        [0.25, 0.25, 0.25, 0.25]
+        >>> rebuilt = np.zeros((3, 3))
+        >>> for matching, p in zip(matchings, probs):
+        ...     for i, j in matching:
+        ...         rebuilt[i, j] += p
+        >>> bool(np.allclose(rebuilt, m))
+        True
+        >>> b = np.array([[0.2, 0.4, 0.4], [0.4, 0.4, 0.2], [0.4, 0.2, 0.4]])
+        >>> birkhoff_algorithm(b, verbose=False, engine="incremental")[1]
+        [0.2, 0.2, 0.2, 0.2, 0.2]
+        >>> birkhoff_algorithm(b, verbose=False, engine="bottleneck")[1]
+        [0.4, 0.4, 0.2]
+        >>> labeled = pd.DataFrame(m, index=['A', 'B', 'C'], columns=['x', 'y', 'z'])
+        >>> steps = birkhoff_algorithm(labeled, verbose=False)[2]
+        >>> list(steps[-1].index), list(steps[-1].columns), int(steps[-1].isna().sum().sum())
+        (['A', 'B', 'C'], ['x', 'y', 'z'], 8)
     """
+    if engine not in MATCHING_ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {MATCHING_ENGINES}")
+    if hasattr(weight_matrix, "tocsr"):
+        raise TypeError("birkhoff_algorithm needs a dense matrix, use sparse_birkhoff for scipy.sparse input")
     if not is_balanced(weight_matrix):
         if verbose:
             print("Error: Input matrix is not balanced. Birkhoff decomposition is only valid for balanced matrices.")
         return [], [], []
 
+    labels = None
+    if isinstance(weight_matrix, pd.DataFrame):
+        labels = (weight_matrix.index, weight_matrix.columns)
+    matrix = np.array(weight_matrix, dtype=float)
+
     steps = []
-    matrix = weight_matrix.copy()
     matchings = []
     probabilities = []
     step_number = 1
+    if verbose:
+        print(f"\nStep {step_number}:")
 
-    while True:
-        if verbose:
-            print(f"\nStep {step_number}:")
-        G = nx.Graph()
-        rows, cols = matrix.shape
-        for i in range(rows):
-            for j in range(cols):
-                w = matrix.iat[i, j] # Get the weight of the edge in numerical form
-                if pd.notna(w) and w > 0:
-                    G.add_edge(f"Player {i+1}", f"Item {j+1}", weight=w)
-
-        # Find maximum weight matching
-        matching = nx.algorithms.matching.max_weight_matching(G, maxcardinality=True)
-
-        if len(matching) < rows:
-            if verbose:
-                print("\nAlgorithm failed - no more perfect matching found.")
-            break
-
-        # Convert matching to a list of tuples (i, j)
-        current_matching = []
-        for u, v in matching:
-            if "Player" in u:
-                i = int(u.split()[1]) - 1
-                j = int(v.split()[1]) - 1
-            else:
-                i = int(v.split()[1]) - 1
-                j = int(u.split()[1]) - 1
-            current_matching.append((i, j))
-
-        # Calculate the minimum edge weight in the current matching
-        min_weight = min(matrix.iat[i, j] for i, j in current_matching)
+    for rows, cols, min_weight in _dense_terms(matrix, engine):
+        current_matching = list(zip(rows.tolist(), cols.tolist()))
         if verbose:
             print(f"Matching: {[(f'Player {i+1}', f'Item {j+1}') for i, j in current_matching]}")
             print(f"Minimum edge weight: {min_weight}")
 
-        for i, j in current_matching:
-            matrix.iat[i, j] -= min_weight
-            if matrix.iat[i, j] == 0:
-                matrix.iat[i, j] = np.nan
-
         matchings.append(current_matching)
         probabilities.append(float(min_weight))
-        steps.append(matrix.copy())
+        steps.append(_as_input_type(matrix.copy(), labels))
 
         if verbose:
-            display_matrix(matrix, step_number)
+            display_matrix(_as_input_type(matrix, labels), step_number)
             draw_graph(matrix, step_number)
 
         step_number += 1
+        if verbose:
+            print(f"\nStep {step_number}:")
 
+    if verbose:
+        print("\nAlgorithm failed - no more perfect matching found.")
     return matchings, probabilities, steps
 
+def _dense_terms(matrix, engine):
+    """
+    The decomposition loop on a float ndarray, which is updated in place (zeroed edges become NaN).
+    Yields (rows, cols, min_weight) for each matching, after the matrix has been updated,
+    and stops when there is no perfect matching left.
+    """
+    support = SupportMatching(matrix > 0) if engine == "incremental" else None
+
+    while True:
+        if support is not None:
+            current_matching = support.pairs() if support.repair() else None
+        elif engine == "bottleneck":
+            bottleneck = _bottleneck_matching(matrix)
+            current_matching = bottleneck.pairs() if bottleneck is not None else None
+        else:
+            current_matching = _networkx_matching(matrix)
+        if current_matching is None:
+            return
+
+        # Calculate the minimum edge weight in the current matching
+        rows = np.array([i for i, _ in current_matching])
+        cols = np.array([j for _, j in current_matching])
+        weights = matrix[rows, cols]
+        min_weight = weights.min()
+
+        remaining = weights - min_weight
+        zeroed = remaining == 0
+        remaining[zeroed] = np.nan
+        matrix[rows, cols] = remaining
+        if support is not None:
+            for i, j in zip(rows[zeroed].tolist(), cols[zeroed].tolist()):
+                support.remove_edge(i, j)
+
+        yield rows, cols, min_weight
+
+def _as_input_type(matrix, labels):
+    """
+    Wraps an ndarray state in a DataFrame with the input labels (if the input was a DataFrame).
+    """
+    if labels is None:
+        return matrix
+    return pd.DataFrame(matrix, index=labels[0], columns=labels[1])
+
+# ---------------------------------------------------
+# Lazy Birkhoff decomposition
+# ---------------------------------------------------
+def iter_birkhoff(matrix, engine="bottleneck"):
+    """
+    Yield the Birkhoff decomposition of a balanced matrix one term at a time.
+
+    Only the current residual is kept (one float copy of the input, dense or CSR), and each
+    term is yielded as soon as its matching is found, so a consumer can stop early (e.g. once
+    99.9% of the mass is covered) or start sampling before the decomposition completes.
+
+    Args:
+        matrix (np.ndarray, pd.DataFrame or scipy.sparse matrix): A balanced matrix of edge weights.
+            Sparse input runs on CSR like sparse_birkhoff.
+        engine (str): How each perfect matching is found (see MATCHING_ENGINES, or SPARSE_ENGINES
+            for sparse input). The default "bottleneck" removes the largest possible weight in
+            each step, so most of the mass comes in the first terms.
+
+    Yields:
+        tuple: (perm, weight), where perm is an np.ndarray matching row i to column perm[i],
+            and weight is the probability of that permutation.
+
+    If the input matrix is not balanced, nothing is yielded.
+
+    Examples:
+        >>> m = np.array([[0.2, 0.4, 0.4], [0.4, 0.4, 0.2], [0.4, 0.2, 0.4]])
+        >>> terms = iter_birkhoff(m)
+        >>> perm, weight = next(terms)
+        >>> perm.tolist(), weight
+        ([1, 0, 2], 0.4)
+        >>> [weight for _, weight in terms]
+        [0.4, 0.2]
+        >>> covered = 0
+        >>> for perm, weight in iter_birkhoff(m, engine="incremental"):
+        ...     covered += weight
+        ...     if covered >= 0.5:
+        ...         break
+        >>> round(covered, 2)
+        0.6
+    """
+    sparse = hasattr(matrix, "tocsr")
+    engines = SPARSE_ENGINES if sparse else MATCHING_ENGINES
+    if engine not in engines:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {engines}")
+    if not is_balanced(matrix):
+        return iter(())
+    if sparse:
+        return _sparse_terms(matrix, engine)
+    return _iter_dense(np.array(matrix, dtype=float), engine)
+
+def _iter_dense(matrix, engine):
+    """
+    Permutation arrays over _dense_terms.
+    """
+    perm = np.empty(matrix.shape[0], dtype=int)
+    for rows, cols, min_weight in _dense_terms(matrix, engine):
+        perm[rows] = cols
+        yield perm.copy(), float(min_weight)
+
+# ---------------------------------------------------
+# Birkhoff decomposition of a sparse matrix
+# ---------------------------------------------------
+def sparse_birkhoff(matrix, engine="incremental"):
+    """
+    Perform Birkhoff decomposition on a balanced scipy.sparse (CSR or CSC) matrix.
+
+    The remaining support stays a CSR matrix throughout, and each term is a permutation
+    array instead of a list of tuples, so memory and time scale with nnz rather than n^2.
+    There are no intermediate matrix states and no drawing.
+
+    Args:
+        matrix (scipy.sparse matrix): Square matrix with the edge weights as stored entries.
+        engine (str): How each perfect matching is found (see SPARSE_ENGINES).
+            "incremental" repairs a SupportMatching after the zeroed edges are removed.
+            "scipy" runs csgraph.maximum_bipartite_matching on the remaining support.
+            "bottleneck" takes the perfect matching that maximizes the minimum weight.
+
+    Returns:
+        list: List of permutations (np.ndarray perm, where row i is matched to column perm[i])
+        list: List of corresponding probabilities (minimum weight in each matching)
+
+    If the input matrix is not balanced, the function will return empty results.
+
+    Examples:
+        >>> from scipy.sparse import csr_matrix
+        >>> m = csr_matrix(np.array([[0.5, 0.5, 0.0], [0.25, 0.25, 0.5], [0.25, 0.25, 0.5]]))
+        >>> perms, probs = sparse_birkhoff(m)
+        >>> sum(probs)
+        1.0
+        >>> rebuilt = np.zeros((3, 3))
+        >>> for perm, p in zip(perms, probs):
+        ...     rebuilt[np.arange(3), perm] += p
+        >>> bool(np.allclose(rebuilt, m.toarray()))
+        True
+        >>> perms, probs = sparse_birkhoff(m.tocsc(), engine="scipy")
+        >>> len(perms), sum(probs)
+        (4, 1.0)
+        >>> sparse_birkhoff(m, engine="bottleneck")[1]
+        [0.25, 0.25, 0.25, 0.25]
+    """
+    if engine not in SPARSE_ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {SPARSE_ENGINES}")
+    if not is_balanced(matrix):
+        return [], []
+
+    permutations = []
+    probabilities = []
+    for perm, weight in _sparse_terms(matrix, engine):
+        permutations.append(perm)
+        probabilities.append(weight)
+    return permutations, probabilities
+
+def _sparse_terms(matrix, engine):
+    """
+    The decomposition loop of sparse_birkhoff on a CSR copy of the matrix.
+    Yields (perm, weight) for each matching and stops when there is no perfect matching left.
+    """
+    # scipy is only needed here
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import maximum_bipartite_matching
+
+    residual = csr_matrix(matrix, dtype=float, copy=True)
+    residual.sum_duplicates()
+    residual.data[~(residual.data > 0)] = 0
+    residual.eliminate_zeros()
+    residual.sort_indices()
+    n = residual.shape[0]
+    if n == 0:
+        return
+    rows = np.arange(n)
+    support = SupportMatching(residual) if engine == "incremental" else None
+    # key of every stored entry in row-major order, to find the matched entries by searchsorted;
+    # the incremental engine keeps zeroed entries stored, so its keys never change
+    keys = _entry_keys(residual)
+
+    while True:
+        if support is not None:
+            if not support.repair():
+                return
+            perm = np.array(support.match_row)
+        elif engine == "bottleneck":
+            bottleneck = _bottleneck_matching(residual)
+            if bottleneck is None:
+                return
+            perm = np.array(bottleneck.match_row)
+        else:
+            perm = maximum_bipartite_matching(residual, perm_type="column")
+            if (perm < 0).any():
+                return
+
+        positions = np.searchsorted(keys, rows * residual.shape[1] + perm)
+        weights = residual.data[positions]
+        min_weight = weights.min()
+        residual.data[positions] = weights - min_weight
+        zeroed = weights == min_weight
+        if support is not None:
+            for i, j in zip(rows[zeroed].tolist(), perm[zeroed].tolist()):
+                support.remove_edge(i, j)
+        else:
+            residual.eliminate_zeros()
+            keys = _entry_keys(residual)
+
+        yield perm, float(min_weight)
+
+def _entry_keys(csr):
+    """
+    row * n_cols + column for every stored entry of a CSR matrix with sorted indices (increasing).
+    """
+    entry_rows = np.repeat(np.arange(csr.shape[0], dtype=np.int64), np.diff(csr.indptr))
+    return entry_rows * csr.shape[1] + csr.indices
+
+# ---------------------------------------------------
+# Bottleneck (max-min weight) perfect matching
+# ---------------------------------------------------
+def _bottleneck_matching(matrix):
+    """
+    Finds the perfect matching of the positive entries whose minimum weight is largest.
+    Having a perfect matching among the edges of weight >= t is monotone in t, so a binary
+    search over the distinct weights, with a cardinality matching (SupportMatching) per
+    threshold, finds the largest feasible t. The search stops at the smallest row or column
+    maximum, since no matching can do better.
+    Works on an ndarray (NaN = no edge) or a CSR matrix without stored zeros.
+    Returns the SupportMatching of that threshold, or None if there is no perfect matching.
+
+    Examples:
+        >>> m = np.array([[0.2, 0.4, 0.4], [0.4, 0.4, 0.2], [0.4, 0.2, 0.4]])
+        >>> sorted(_bottleneck_matching(m).pairs())
+        [(0, 1), (1, 0), (2, 2)]
+        >>> _bottleneck_matching(np.array([[1.0, 1.0], [0.0, 0.0]])) is None
+        True
+    """
+    if hasattr(matrix, "tocsr"):
+        weights = matrix.data
+        cap = min(matrix.max(axis=1).toarray().min(), matrix.max(axis=0).toarray().min())
+    else:
+        matrix = np.where(matrix > 0, matrix, 0)
+        weights = matrix[matrix > 0]
+        cap = min(matrix.max(axis=1).min(), matrix.max(axis=0).min())
+    thresholds = np.unique(weights[(weights > 0) & (weights <= cap)])
+
+    best = None
+    low, high = 0, len(thresholds) - 1
+    while low <= high:
+        middle = (low + high) // 2
+        support = SupportMatching(matrix >= thresholds[middle])
+        if support.repair():
+            best = support
+            low = middle + 1
+        else:
+            high = middle - 1
+    return best
+
+# ---------------------------------------------------
+# Maximum weight matching with networkx (original engine)
+# ---------------------------------------------------
+def _networkx_matching(matrix):
+    """
+    Finds a maximum weight perfect matching of the positive entries with networkx.
+    Rows are nodes 0..n-1 and columns are nodes n..n+m-1, so no labels are built or parsed.
+    Returns a list of (row, column) tuples, or None if there is no perfect matching.
+    """
+    n = matrix.shape[0]
+    rows, cols = np.nonzero(matrix > 0)
+    G = nx.Graph()
+    G.add_weighted_edges_from(zip(rows.tolist(), (cols + n).tolist(), matrix[rows, cols].tolist()))
+
+    # Find maximum weight matching
+    matching = nx.algorithms.matching.max_weight_matching(G, maxcardinality=True)
+
+    if len(matching) < n:
+        return None
+    return [(u, v - n) if u < n else (v, u - n) for u, v in matching]
+
 # ----------------------------
 # Draw the bipartite graph
 # ----------------------------
@@ -121,12 +548,10 @@ def draw_graph(matrix, step_number):
     """
     Visualizes the current graph without edge weights.
     """
+    values = np.asarray(matrix, dtype=float)
+    rows, cols = values.shape
     G = nx.Graph()
-    rows, cols = matrix.shape
-    for i in range(rows):
-        for j in range(cols):
-            if pd.notna(matrix.iat[i, j]) and matrix.iat[i, j] > 0:
-                G.add_edge(f"Player {i+1}", f"Item {j+1}")
+    G.add_edges_from((f"Player {i+1}", f"Item {j+1}") for i, j in zip(*np.nonzero(values > 0)))
 
     pos = {}
     for i in range(rows):
@@ -148,7 +573,7 @@ def display_matrix(matrix, step_number):
     Prints the weight matrix after each step.
     """
     print(f"\nWeight matrix after step {step_number}:")
-    display_df = matrix.copy()
+    display_df = matrix.copy() if isinstance(matrix, pd.DataFrame) else pd.DataFrame(matrix)
     display_df.index.name = "Players"
     display_df.columns.name = "Items"
     print(display_df.fillna(0).round(2))